@@ -0,0 +1,120 @@
+import os
+import json
+import random
+from multiprocessing import Pool
+from PIL import Image, ImageDraw, ImageFilter
+
+# 生成规则变化时修改版本号，旧的语料库会重新生成
+CORPUS_VERSION = 1
+MANIFEST_NAME = 'corpus.json'
+
+
+def _panel_box(width, height):
+    """剧情对话框的位置，与游戏截图中的弹窗比例相同"""
+    return (int(width * 0.25), int(height * 0.25), int(width * 0.75), int(height * 0.75))
+
+
+def generate_screenshot(index, width=1920, height=1080, seed=0):
+    """生成一张模拟的剧情截图
+
+    背景是模糊的随机色块，中间是浅色对话框，框内有标题栏和若干行深色"文字块"。
+    每张截图的背景和文字行都不同，不会被截图去重合并。
+
+    Args:
+        index (int): 截图序号，与seed一起决定截图内容
+        width (int): 截图宽度
+        height (int): 截图高度
+        seed (int): 随机数种子
+
+    Returns:
+        PIL.Image.Image: RGB截图
+    """
+    rng = random.Random(seed * 1000003 + index)
+
+    # 低分辨率的随机色块放大后接近游戏中虚化的背景
+    base = [rng.randint(60, 200) for _ in range(3)]
+    noise = Image.new('RGB', (16, 9))
+    noise.putdata([tuple(min(255, max(0, c + rng.randint(-50, 50))) for c in base) for _ in range(16 * 9)])
+    image = noise.resize((width, height), Image.BICUBIC).filter(ImageFilter.GaussianBlur(radius=max(1, width // 100)))
+
+    draw = ImageDraw.Draw(image)
+    left, top, right, bottom = _panel_box(width, height)
+    draw.rectangle((left, top, right, bottom), fill=(228, 228, 226))
+    # 标题和分隔线
+    title_height = max(8, height // 40)
+    title_width = (right - left) // 3
+    title_left = (left + right - title_width) // 2
+    draw.rectangle((title_left, top + title_height, title_left + title_width, top + title_height * 2), fill=(40, 40, 40))
+    draw.line((left + 40, top + title_height * 3, right - 40, top + title_height * 3), fill=(150, 150, 150), width=2)
+
+    # 正文: 每行由宽度不一的字块组成，模拟汉字
+    line_height = max(10, height // 36)
+    glyph = max(6, line_height - 6)
+    y = top + title_height * 4
+    for _ in range(rng.randint(3, 6)):
+        x = left + 50
+        line_end = right - 50 - rng.randint(0, (right - left) // 3)
+        while x + glyph < line_end:
+            if rng.random() > 0.08:
+                shade = (220, 130, 20) if rng.random() < 0.1 else (30, 30, 30)
+                draw.rectangle((x, y, x + glyph, y + glyph), fill=shade)
+            x += glyph + 3
+        y += line_height
+
+    # 底部按钮栏
+    bar_top = bottom - (bottom - top) // 6
+    draw.rectangle((left, bar_top, right, bottom), fill=(40, 40, 40))
+    return image
+
+
+def _write_screenshot(args):
+    path, index, width, height, seed = args
+    generate_screenshot(index, width, height, seed).save(path, format='PNG', compress_level=1)
+
+
+def _manifest(count, width, height, seed):
+    return {'version': CORPUS_VERSION, 'count': count, 'width': width, 'height': height, 'seed': seed}
+
+
+def ensure_corpus(corpus_dir, count, width=1920, height=1080, seed=0, processes=None):
+    """确保目录中有指定数量的模拟截图，已生成且参数相同的语料库直接复用
+
+    Args:
+        corpus_dir (str): 语料库目录
+        count (int): 截图数量
+        width (int): 截图宽度
+        height (int): 截图高度
+        seed (int): 随机数种子
+        processes (int): 生成截图的进程数，None表示CPU核心数
+
+    Returns:
+        list: 按文件名排序的截图路径列表
+    """
+    os.makedirs(corpus_dir, exist_ok=True)
+    manifest_path = os.path.join(corpus_dir, MANIFEST_NAME)
+    expected = _manifest(count, width, height, seed)
+    paths = [os.path.join(corpus_dir, f'{index:06d}.png') for index in range(count)]
+
+    try:
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        manifest = None
+    if manifest == expected and all(os.path.exists(path) for path in paths):
+        return paths
+
+    # 参数不同时删除旧的截图，避免多余的图片被一起识别
+    for name in os.listdir(corpus_dir):
+        if name.endswith('.png'):
+            os.remove(os.path.join(corpus_dir, name))
+    if os.path.exists(manifest_path):
+        os.remove(manifest_path)
+
+    tasks = [(path, index, width, height, seed) for index, path in enumerate(paths)]
+    with Pool(processes=processes) as pool:
+        for _ in pool.imap_unordered(_write_screenshot, tasks, chunksize=16):
+            pass
+
+    with open(manifest_path, 'w', encoding='utf-8') as f:
+        json.dump(expected, f)
+    return paths
@@ -0,0 +1,409 @@
+"""端到端的流水线基准测试
+
+用生成的模拟截图驱动完整的处理流程(引导、去重、拼接、编码、并发识别、文本提取和结果写入)，
+OCR接口由本地的百度接口模拟服务器代替，按设定的分布模拟响应时间。
+每个规模在独立的进程中运行，结果以JSON输出，并可以与保存的基线对比:
+
+    python benchmark/run_benchmark.py --sizes 10,1000
+    python benchmark/run_benchmark.py --sizes 10,1000 --save-baseline
+    python benchmark/run_benchmark.py --sizes 10,1000 --baseline benchmark/baseline.json
+
+基准测试在临时目录中复制一份lib运行，不会读取或修改项目中的配置文件和识别缓存。
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import platform
+import subprocess
+import tempfile
+from datetime import datetime
+
+try:
+    import resource
+except ImportError:
+    # Windows没有resource模块，不统计内存峰值
+    resource = None
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_DIR = os.path.dirname(BENCHMARK_DIR)
+LIB_DIR = os.path.join(PROJECT_DIR, 'lib')
+DEFAULT_BASELINE = os.path.join(BENCHMARK_DIR, 'baseline.json')
+RESULTS_DIR = os.path.join(BENCHMARK_DIR, 'results')
+RESULT_VERSION = 1
+
+# 基准测试固定的主配置，关闭识别缓存和续传，保证每次运行都真正请求接口
+BENCHMARK_CONFIG = {
+    'OCR_MODULE': 'baidu',
+    'ENABLE_OCR_CACHE': 'False',
+    'RESUME_MODE': 'off',
+    'WATCH_MODE': 'False'
+}
+
+# 百度模块的配置，接口地址在运行时指向模拟服务器；默认不在客户端限流，由--emulator-qps模拟服务端限流
+# 固定使用不含位置的接口，使结果不受模块默认值变化影响，可以通过--set BAIDU_WORD_LOCATIONS=True测试含位置的接口
+BENCHMARK_MODULE_CONFIG = {
+    'BAIDU_APP_ID': 'benchmark',
+    'BAIDU_API_KEY': 'benchmark',
+    'BAIDU_SECRET_KEY': 'benchmark',
+    'BAIDU_QPS': '0',
+    'BAIDU_WORD_LOCATIONS': 'False'
+}
+
+# 与基线对比的指标: (指标路径, 是否越大越好)
+COMPARED_METRICS = [
+    (('images_per_second',), True),
+    (('group_latency', 'p50'), False),
+    (('group_latency', 'p95'), False),
+    (('group_latency', 'p99'), False),
+    (('peak_rss_mb', 'main'), False),
+    (('peak_rss_mb', 'workers'), False),
+    (('api_calls_per_image',), False)
+]
+
+
+def percentile(values, fraction):
+    """线性插值的百分位数
+
+    Args:
+        values (list): 数值列表
+        fraction (float): 0到1之间的百分位
+
+    Returns:
+        float or None: 百分位数，列表为空时返回None
+    """
+    if not values:
+        return None
+    ordered = sorted(values)
+    position = (len(ordered) - 1) * fraction
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def _peak_rss_mb(who):
+    """进程的内存峰值(MB)，Linux的ru_maxrss单位为KB，macOS为字节"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(who).ru_maxrss
+    if sys.platform == 'darwin':
+        peak /= 1024
+    return round(peak / 1024, 1)
+
+
+def _write_config(path, values):
+    with open(path, 'w', encoding='utf-8') as f:
+        for key, value in values.items():
+            f.write(f"{key} = '{value}'\n")
+
+
+def _parse_assignments(assignments):
+    """把KEY=VALUE列表拆分为主配置和百度模块配置"""
+    config, module_config = {}, {}
+    for assignment in assignments:
+        key, separator, value = assignment.partition('=')
+        if not separator:
+            raise SystemExit(f'invalid --set value (expected KEY=VALUE): {assignment}')
+        key = key.strip().upper()
+        (module_config if key.startswith('BAIDU_') else config)[key] = value.strip()
+    return config, module_config
+
+
+def run_worker(sandbox_dir, process_dir, result_path):
+    """在当前进程中处理一个语料库目录，把计时、内存和每张画布的耗时写入result_path
+
+    由主进程以--worker参数启动，每个规模使用独立的进程，使内存峰值和单例状态互不影响。
+    """
+    sandbox_lib = os.path.join(sandbox_dir, 'lib')
+    sys.path.insert(0, sandbox_lib)
+    from bootstrap import bootstrap
+
+    start_time = time.perf_counter()
+    bootstrap({
+        'process_dir': process_dir,
+        'parent_dir': sandbox_dir,
+        # 沙盒中的文件都已存在，不需要下载
+        'project_download_url': 'http://127.0.0.1:9/'
+    })
+    wall_seconds = time.perf_counter() - start_time
+
+    # 运行日志中每张画布一条记录，elapsed为该画布从拼接到识别完成的耗时
+    latencies, failed = [], 0
+    journal_path = os.path.join(process_dir, f'{os.path.basename(process_dir)}_journal.jsonl')
+    if os.path.exists(journal_path):
+        with open(journal_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                latencies.append(record.get('elapsed', 0.0))
+                if record.get('status') != 'ok':
+                    failed += 1
+
+    result = {
+        'wall_seconds': wall_seconds,
+        'latencies': latencies,
+        'failed_groups': failed,
+        'peak_rss_mb': {
+            'main': _peak_rss_mb(resource.RUSAGE_SELF) if resource else None,
+            # 已退出的拼接工作进程中内存峰值最大的一个
+            'workers': _peak_rss_mb(resource.RUSAGE_CHILDREN) if resource else None
+        }
+    }
+    with open(result_path, 'w', encoding='utf-8') as f:
+        json.dump(result, f)
+
+
+def prepare_sandbox(work_dir):
+    """把lib复制到工作目录，去掉配置文件、缓存和字节码，供基准进程使用
+
+    Returns:
+        str: 沙盒目录，其中的lib与项目中的lib代码相同
+    """
+    sandbox_dir = os.path.join(work_dir, 'sandbox')
+    shutil.rmtree(sandbox_dir, ignore_errors=True)
+    shutil.copytree(LIB_DIR, os.path.join(sandbox_dir, 'lib'),
+                    ignore=shutil.ignore_patterns('__pycache__', 'config.txt', 'cache'))
+    return sandbox_dir
+
+
+def run_size(count, args, sandbox_dir, config, module_config):
+    """生成或复用指定规模的语料库，启动模拟服务器并在子进程中运行一次处理
+
+    Returns:
+        dict: 该规模的测试结果
+    """
+    from corpus import ensure_corpus
+    sys.path.insert(0, LIB_DIR)
+    from ocr_modules.baidu.baidu_emulator import BaiduEmulator, LatencyModel
+
+    width, height = args.resolution
+    corpus_dir = os.path.join(args.work_dir, f'corpus_{count}_{width}x{height}')
+    print(f'[{count}] preparing corpus in {corpus_dir}', flush=True)
+    ensure_corpus(corpus_dir, count, width, height, seed=args.seed)
+
+    emulator = BaiduEmulator(
+        latency=LatencyModel(args.distribution, args.latency, args.jitter, args.seed),
+        qps=args.emulator_qps, error_rate=args.error_rate, seed=args.seed, tile_size=args.resolution
+    ).start()
+    try:
+        _write_config(os.path.join(corpus_dir, 'config.txt'), {**BENCHMARK_CONFIG, **config})
+        _write_config(
+            os.path.join(sandbox_dir, 'lib', 'ocr_modules', 'baidu', 'config.txt'),
+            {**BENCHMARK_MODULE_CONFIG, **module_config, 'BAIDU_API_BASE_URL': emulator.base_url}
+        )
+
+        result_path = os.path.join(args.work_dir, f'result_{count}.json')
+        log_path = os.path.join(args.work_dir, f'log_{count}.txt')
+        print(f'[{count}] running pipeline (log: {log_path})', flush=True)
+        with open(log_path, 'w', encoding='utf-8') as log:
+            completed = subprocess.run(
+                [sys.executable, os.path.abspath(__file__), '--worker', sandbox_dir, corpus_dir, result_path],
+                stdout=None if args.verbose else log, stderr=subprocess.STDOUT
+            )
+        if completed.returncode != 0 or not os.path.exists(result_path):
+            raise SystemExit(f'[{count}] pipeline exited with code {completed.returncode}, see {log_path}')
+        with open(result_path, 'r', encoding='utf-8') as f:
+            worker = json.load(f)
+        os.remove(result_path)
+    finally:
+        emulator.stop()
+
+    stats = emulator.get_stats()
+    latencies = worker['latencies']
+    wall_seconds = worker['wall_seconds']
+    return {
+        'images': count,
+        'groups': len(latencies),
+        'failed_groups': worker['failed_groups'],
+        'wall_seconds': round(wall_seconds, 3),
+        'images_per_second': round(count / wall_seconds, 3) if wall_seconds > 0 else None,
+        'group_latency': {
+            name: round(value, 4) if value is not None else None
+            for name, value in (
+                ('mean', sum(latencies) / len(latencies) if latencies else None),
+                ('p50', percentile(latencies, 0.50)),
+                ('p95', percentile(latencies, 0.95)),
+                ('p99', percentile(latencies, 0.99)),
+                ('max', max(latencies) if latencies else None)
+            )
+        },
+        'peak_rss_mb': worker['peak_rss_mb'],
+        'api_calls': stats['ocr_requests'],
+        'api_calls_per_image': round(stats['ocr_requests'] / count, 4) if count else None,
+        'api_errors': stats['errors'],
+        'token_requests': stats['token_requests'],
+        'upload_mb': round(stats['bytes_received'] / 1024 / 1024, 2),
+        'max_in_flight': stats['max_in_flight']
+    }
+
+
+def _git_revision():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=PROJECT_DIR,
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _metric(run, path):
+    value = run
+    for key in path:
+        if not isinstance(value, dict):
+            return None
+        value = value.get(key)
+    return value
+
+
+def compare(result, baseline, max_regression):
+    """与基线逐项对比并打印变化，相同规模的测试才互相比较
+
+    Args:
+        result (dict): 本次测试结果
+        baseline (dict): 基线测试结果
+        max_regression (float): 允许的最大退化比例，例如0.1表示10%
+
+    Returns:
+        list: 超过允许退化比例的指标描述
+    """
+    regressions = []
+    baseline_runs = {run['images']: run for run in baseline.get('runs', [])}
+    for run in result['runs']:
+        base_run = baseline_runs.get(run['images'])
+        if base_run is None:
+            print(f"[{run['images']}] no baseline run with the same size")
+            continue
+        print(f"[{run['images']}] compared with baseline {baseline.get('revision') or ''}".rstrip())
+        for path, higher_is_better in COMPARED_METRICS:
+            current, previous = _metric(run, path), _metric(base_run, path)
+            if current is None or previous is None:
+                continue
+            name = '.'.join(path)
+            if previous == 0:
+                change = 0.0 if current == 0 else float('inf')
+            else:
+                change = (current - previous) / previous
+            worse = -change if higher_is_better else change
+            flag = ''
+            if worse > max_regression:
+                flag = '  REGRESSION'
+                regressions.append(f"{run['images']} images: {name} {previous} -> {current}")
+            print(f'    {name:<24} {previous:>12} -> {current:<12} {change:+.1%}{flag}')
+    return regressions
+
+
+def print_summary(result):
+    print()
+    print(f"{'images':>8} {'groups':>7} {'img/s':>9} {'p50 s':>8} {'p95 s':>8} {'p99 s':>8} "
+          f"{'rss MB':>8} {'worker MB':>10} {'calls/img':>10}")
+    for run in result['runs']:
+        latency = run['group_latency']
+        rss = run['peak_rss_mb']
+        print(f"{run['images']:>8} {run['groups']:>7} {run['images_per_second'] or 0:>9.2f} "
+              f"{latency['p50'] or 0:>8.3f} {latency['p95'] or 0:>8.3f} {latency['p99'] or 0:>8.3f} "
+              f"{rss['main'] or 0:>8.1f} {rss['workers'] or 0:>10.1f} {run['api_calls_per_image'] or 0:>10.3f}")
+    print()
+
+
+def _parse_resolution(value):
+    try:
+        width, height = (int(part) for part in value.lower().split('x'))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f'invalid resolution: {value} (expected WIDTHxHEIGHT)')
+    return width, height
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='End-to-end pipeline benchmark against the local Baidu OCR emulator')
+    parser.add_argument('--sizes', default='10,1000,10000', help='comma separated corpus sizes (default: 10,1000,10000)')
+    parser.add_argument('--resolution', type=_parse_resolution, default=(1920, 1080), help='screenshot size, e.g. 1920x1080')
+    parser.add_argument('--latency', type=float, default=0.3, help='mean OCR response time in seconds')
+    parser.add_argument('--jitter', type=float, default=0.1, help='OCR response time spread in seconds')
+    parser.add_argument('--distribution', default='lognormal', choices=('fixed', 'uniform', 'normal', 'lognormal'))
+    parser.add_argument('--emulator-qps', type=float, default=0, help='server side QPS limit, 0 for unlimited')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='probability of a server internal error')
+    parser.add_argument('--seed', type=int, default=0, help='seed for the corpus and the latency model')
+    parser.add_argument('--set', action='append', default=[], metavar='KEY=VALUE',
+                        help='override a config item, BAIDU_* keys go to the Baidu module config (repeatable)')
+    parser.add_argument('--work-dir', default=os.path.join(tempfile.gettempdir(), 'railtale_benchmark'),
+                        help='directory for generated corpora, the lib sandbox and logs')
+    parser.add_argument('--output', default=None, help='result JSON path (default: benchmark/results/<time>.json)')
+    parser.add_argument('--baseline', default=None, help=f'baseline JSON to compare with (default: {DEFAULT_BASELINE} if it exists)')
+    parser.add_argument('--save-baseline', action='store_true', help='also write the result as the default baseline')
+    parser.add_argument('--max-regression', type=float, default=0.10,
+                        help='allowed relative regression before exiting with status 1 (default: 0.10)')
+    parser.add_argument('--verbose', action='store_true', help='show the pipeline output instead of writing it to a log')
+    parser.add_argument('--worker', nargs=3, metavar=('SANDBOX', 'PROCESS_DIR', 'RESULT'), help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.worker:
+        run_worker(*args.worker)
+        return 0
+
+    sizes = [int(size) for size in args.sizes.split(',') if size.strip()]
+    config, module_config = _parse_assignments(args.set)
+    args.work_dir = os.path.abspath(args.work_dir)
+    os.makedirs(args.work_dir, exist_ok=True)
+    sandbox_dir = prepare_sandbox(args.work_dir)
+
+    result = {
+        'version': RESULT_VERSION,
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'revision': _git_revision(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'settings': {
+            'resolution': list(args.resolution),
+            'latency': args.latency,
+            'jitter': args.jitter,
+            'distribution': args.distribution,
+            'emulator_qps': args.emulator_qps,
+            'error_rate': args.error_rate,
+            'seed': args.seed,
+            'word_locations': module_config.get('BAIDU_WORD_LOCATIONS', BENCHMARK_MODULE_CONFIG['BAIDU_WORD_LOCATIONS']),
+            'config': config,
+            'module_config': module_config
+        },
+        'runs': []
+    }
+    try:
+        for count in sizes:
+            result['runs'].append(run_size(count, args, sandbox_dir, config, module_config))
+    finally:
+        shutil.rmtree(sandbox_dir, ignore_errors=True)
+
+    output = args.output or os.path.join(RESULTS_DIR, datetime.now().strftime('%Y%m%d-%H%M%S') + '.json')
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(result, f, ensure_ascii=False, indent=2)
+    print_summary(result)
+    print(f'Result written to {output}')
+
+    exit_code = 0
+    baseline_path = args.baseline or (DEFAULT_BASELINE if os.path.exists(DEFAULT_BASELINE) else None)
+    if baseline_path and not args.save_baseline:
+        with open(baseline_path, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        if baseline.get('settings') != result['settings']:
+            print('Warning: baseline was recorded with different settings')
+        regressions = compare(result, baseline, args.max_regression)
+        if regressions:
+            print(f'{len(regressions)} metric(s) regressed by more than {args.max_regression:.0%}:')
+            for regression in regressions:
+                print(f'    {regression}')
+            exit_code = 1
+    if args.save_baseline:
+        with open(DEFAULT_BASELINE, 'w', encoding='utf-8') as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+        print(f'Baseline written to {DEFAULT_BASELINE}')
+    return exit_code
+
+
+if __name__ == '__main__':
+    sys.exit(main())
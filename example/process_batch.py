@@ -0,0 +1,64 @@
+import os
+import sys
+import requests
+
+# 获取必要路径
+process_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+project_download_url = 'https://raw.githubusercontent.com/dalizi2333333/railTale_Extractor/0.1.1/'
+image_extensions = ('.png', '.jpg', '.jpeg', '.bmp', '.gif')
+
+# 创建lib目录（如果不存在）
+lib_dir = os.path.join(parent_dir, 'lib')
+os.makedirs(lib_dir, exist_ok=True)
+
+# 检查bootstrap.py是否存在
+bootstrap_path = os.path.join(lib_dir, 'bootstrap.py')
+if not os.path.exists(bootstrap_path):
+    print('Bootstrap module not found. Downloading...')
+    try:
+        # 下载bootstrap.py
+        response = requests.get(f'{project_download_url}lib/bootstrap.py', timeout=10)
+        response.raise_for_status()
+        with open(bootstrap_path, 'wb') as f:
+            f.write(response.content)
+        print(f'Successfully downloaded bootstrap.py to: {bootstrap_path}')
+    except Exception as e:
+        print(f'Failed to download bootstrap.py: {str(e)}')
+        print('Program will exit.')
+        sys.exit(1)
+
+# 添加lib目录到Python路径
+if lib_dir not in sys.path:
+    sys.path.append(lib_dir)
+
+# 尝试导入bootstrap功能
+try:
+    from bootstrap import bootstrap_batch
+except ImportError:
+    print('Failed to import bootstrap module even though file exists.')
+    print('Program will exit.')
+    sys.exit(1)
+
+# 拼接画布的工作进程会重新导入本脚本，只在直接运行时开始处理
+if __name__ == '__main__':
+    # 待处理的目录：命令行参数中的目录，未指定时为脚本所在目录下所有包含图片的子目录
+    process_dirs = sys.argv[1:]
+    if not process_dirs:
+        process_dirs = sorted(
+            os.path.join(process_dir, name) for name in os.listdir(process_dir)
+            if os.path.isdir(os.path.join(process_dir, name))
+            and any(f.lower().endswith(image_extensions) for f in os.listdir(os.path.join(process_dir, name)))
+        )
+
+    # 创建paths结构，配置文件从脚本所在目录读取，所有目录共用
+    paths = {
+        'process_dir': process_dir,
+        'parent_dir': parent_dir,
+        'project_download_url': project_download_url
+    }
+
+    # 只初始化一次项目，依次处理所有目录
+    bootstrap_batch(process_dirs, paths)
+
+    sys.exit(0)
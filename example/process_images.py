@@ -43,19 +43,21 @@ except ImportError:
     print('Program will exit.')
     sys.exit(1)
 
-# 创建paths结构，仅在需要传递时封包
-paths = {
-    'process_dir': process_dir,
-    'parent_dir': parent_dir,
-    'project_download_url': project_download_url
-}
-
-# 初始化项目，传入paths
-bootstrap(paths)
-
-# process_images.py现在只负责确定paths并初始化项目
-# 所有实际处理逻辑已移至bootstrap中
-print('Image processing initialized through bootstrap.')
-print('Processing will continue in bootstrap module...')
-
-sys.exit(0)
\ No newline at end of file
+# 拼接画布的工作进程会重新导入本脚本，只在直接运行时开始处理
+if __name__ == '__main__':
+    # 创建paths结构，仅在需要传递时封包
+    paths = {
+        'process_dir': process_dir,
+        'parent_dir': parent_dir,
+        'project_download_url': project_download_url
+    }
+
+    # 初始化项目，传入paths
+    bootstrap(paths)
+
+    # process_images.py现在只负责确定paths并初始化项目
+    # 所有实际处理逻辑已移至bootstrap中
+    print('Image processing initialized through bootstrap.')
+    print('Processing will continue in bootstrap module...')
+
+    sys.exit(0)
\ No newline at end of file
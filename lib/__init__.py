@@ -1,4 +1,5 @@
 from lang_manager import LangManager
+from log_manager import LogManager
 from config.config_manager import ConfigManager
 from config.config_ensure import ensure_config
 from config.config_loader import ConfigLoader
@@ -8,6 +9,7 @@ from text_extracting.text_extractor import TextExtractor
 
 __all__ = [
     'LangManager',
+    'LogManager',
     'ConfigManager',
     'ensure_config',
     'ConfigLoader',
@@ -1,11 +1,14 @@
 from ntpath import exists
 import os
 import sys
+import multiprocessing
 import requests
 import json
 from pathlib import Path
 
-# 目录结构配置
+# 缺失文件的下载地址固定在0.1.1版本，files中只列出该版本已发布的文件；
+# 之后新增的文件放在unpublished_files中，只检查是否存在，缺失时提示重新获取完整的项目，不尝试下载
+# 发布新版本时需要同时更新下载地址，并把已发布的文件移回files
 DIRECTORY_STRUCTURE = {
     'lib': {
         'files': [
@@ -15,6 +18,13 @@ DIRECTORY_STRUCTURE = {
                 'supported_fonts.json',
                 'text_processor.py'
             ],
+        'unpublished_files': [
+                'folder_watcher.py',
+                'log_manager.py',
+                'metrics.py',
+                'result_writer.py',
+                'run_journal.py'
+            ],
         'subdirectories': {
             'ocr_core': {
                 'files': [
@@ -22,6 +32,12 @@ DIRECTORY_STRUCTURE = {
                     'ocr_module.py',
                     'ocr_module_interface.py',
                     'ocr_module_bootstraper.py'
+                ],
+                'unpublished_files': [
+                    'ocr_dispatcher.py',
+                    'rate_limiter.py',
+                    'ocr_image.py',
+                    'ocr_cache.py'
                 ]
             },
             'lang': {},
@@ -40,6 +56,22 @@ DIRECTORY_STRUCTURE = {
                     '__init__.py',
                     'font_enhancement_detector.py',
                     'text_extractor.py'
+                ],
+                'unpublished_files': [
+                    'layout_splitter.py',
+                    'marker_matcher.py',
+                    'paragraph_deduper.py'
+                ]
+            },
+            'image_processing': {
+                'unpublished_files': [
+                    '__init__.py',
+                    'duplicate_detector.py',
+                    'region_detector.py',
+                    'stitch_planner.py',
+                    'canvas_pool.py',
+                    'canvas_renderer.py',
+                    'payload_encoder.py'
                 ]
             },
             'ocr_modules': {}
@@ -71,6 +103,7 @@ DEFAULT_LANG_DATA = {
     'file_not_found': '文件不存在: {}',
     'file_found': '文件已找到: {}',
     'critical_file_download_fail': '关键文件下载失败: {}',
+    'file_not_published': '文件不存在且尚未发布到下载地址，请重新获取完整的项目: {}',
     'exit_due_to_download_fail': '由于关键文件下载失败，程序将退出。',
     'check_complete': '检查完成！',
     'ocr_mapping_load_fail': '加载OCR语言映射文件失败: {}'
@@ -178,7 +211,7 @@ def _check_directory_structure(base_path, dir_config, github_prefix, download_ur
 
     Args:
         base_path (str): 当前检查的基础目录路径
-        dir_config (dict): 目录配置字典，包含files和subdirectories等键
+        dir_config (dict): 目录配置字典，包含files、unpublished_files和subdirectories等键
         github_prefix (str): GitHub路径前缀
         download_url (str): 下载基础URL
         lang_data (dict): 语言数据字典，用于获取本地化消息
@@ -211,6 +244,14 @@ def _check_directory_structure(base_path, dir_config, github_prefix, download_ur
                     critical_files_downloaded = False
                     print(lang_data['critical_file_download_fail'].format(github_path))
 
+    # 下载地址中还没有的文件只检查是否存在
+    for file_name in dir_config.get('unpublished_files', []):
+        file_path = os.path.join(base_path, file_name)
+        if os.path.exists(file_path):
+            print(lang_data['file_found'].format(file_path))
+        else:
+            print(lang_data['file_not_published'].format(file_path))
+
     # 递归检查子目录
     if 'subdirectories' in dir_config:
         for subdir_name, subdir_config in dir_config['subdirectories'].items():
@@ -329,19 +370,14 @@ def _check_and_download_files(paths, lang_data):
 
     print(lang_data['check_complete'])
 
-# 引导函数，供外部调用
-def bootstrap(paths=None):
-    """引导函数，初始化项目
+def _initialize(paths=None):
+    """初始化语言管理器、配置管理器和OCR模块
 
     Args:
         paths (dict, optional): 路径配置字典. 如果未提供，将使用默认值
 
     Returns:
-        dict: 包含以下对象的字典:
-            - config_manager: 配置管理器实例
-            - lang_manager: 语言管理器实例
-            - paths: 路径配置字典
-            - text: 提取的文本数据
+        tuple: (路径配置字典, 语言管理器实例, 配置管理器实例, 配置文件是否已存在)
     """
     # 1. 获取路径配置
     paths = _get_paths(paths)
@@ -354,6 +390,7 @@ def bootstrap(paths=None):
 
     # 4. 初始化语言管理器
     from lang_manager import LangManager
+    from log_manager import LogManager
     lang_manager = LangManager.initialize(lang_data)
 
     # 5. 初始化配置管理器
@@ -370,14 +407,39 @@ def bootstrap(paths=None):
     exists_config = ensure_config()
     if exists_config:
         ConfigLoader().load_config()
+    # 加载配置之前的消息按默认的info级别输出
+    LogManager.set_mode(ConfigManager.get('LOG_LEVEL', 'info'))
 
     # 6. 初始化OCR模块
     from ocr_core.ocr_module_bootstraper import OCRModuleBootstraper
     module_bootstraper = OCRModuleBootstraper()
     if not module_bootstraper.bootstrap_module():
-        print(LangManager.get_lang('module_bootstrap_fail').format(ConfigManager.get('OCR_MODULE' , 'baidu')))
+        LogManager.error(LangManager.get_lang('module_bootstrap_fail'), ConfigManager.get('OCR_MODULE' , 'baidu'))
         sys.exit(1)
 
+    return paths, lang_manager, config_manager, exists_config
+
+# 引导函数，供外部调用
+def bootstrap(paths=None):
+    """引导函数，初始化项目
+
+    Args:
+        paths (dict, optional): 路径配置字典. 如果未提供，将使用默认值
+
+    Returns:
+        dict: 包含以下对象的字典:
+            - config_manager: 配置管理器实例
+            - lang_manager: 语言管理器实例
+            - paths: 路径配置字典
+            - text: 提取的文本数据
+    """
+    # 0. 没有__main__保护的旧脚本会在拼接画布的工作进程中重新执行，此时不做任何处理
+    if multiprocessing.parent_process() is not None:
+        return {}
+
+    # 1-6. 初始化语言、配置和OCR模块
+    paths, lang_manager, config_manager, exists_config = _initialize(paths)
+
     # 7. 处理项目
     from text_processor import TextProcessor
     text = TextProcessor().run()
@@ -388,4 +450,68 @@ def bootstrap(paths=None):
         'paths': paths,
         'exists_config': exists_config,
         'text': text
-    }
\ No newline at end of file
+    }
+
+def bootstrap_batch(process_dirs, paths=None):
+    """批量引导函数，只初始化一次项目，依次处理多个目录
+
+    语言、配置和OCR模块只初始化一次，所有目录共用同一个OCR客户端、限流器、结果缓存，
+    以及拼接画布的工作进程和画布池，
+    配置从paths中的process_dir(批量脚本所在目录)读取并用于所有目录。
+    每个目录的结果、调试信息和运行日志仍写入该目录自己的文件中，批量处理时不进入监视模式。
+
+    Args:
+        process_dirs (list): 待处理的目录路径列表
+        paths (dict, optional): 路径配置字典. 如果未提供，将使用默认值
+
+    Returns:
+        dict: 包含以下对象的字典:
+            - config_manager: 配置管理器实例
+            - lang_manager: 语言管理器实例
+            - paths: 路径配置字典
+            - results: 目录路径 -> 该目录提取的文本数据
+    """
+    # 0. 在拼接画布的工作进程中不做任何处理
+    if multiprocessing.parent_process() is not None:
+        return {}
+
+    # 1-6. 初始化语言、配置和OCR模块
+    paths, lang_manager, config_manager, exists_config = _initialize(paths)
+
+    # 7. 依次处理各个目录
+    from lang_manager import LangManager
+    from log_manager import LogManager
+    from config.config_manager import ConfigManager
+    from text_processor import TextProcessor
+    from image_processing.canvas_pool import CanvasPool
+
+    # 工作进程在第一次提交画布时启动，之后所有目录共用
+    canvas_renderer = TextProcessor.create_canvas_renderer()
+    canvas_pool = CanvasPool(max_idle=int(ConfigManager.get('MAX_CONCURRENT_REQUESTS', 4)))
+    results = {}
+    try:
+        for index, process_dir in enumerate(process_dirs, 1):
+            process_dir = os.path.abspath(process_dir)
+            if not os.path.isdir(process_dir):
+                LogManager.warning(LangManager.get_lang('batch_dir_not_found'), process_dir)
+                continue
+            LogManager.progress(LangManager.get_lang('batch_processing_dir'), index, len(process_dirs), process_dir)
+            ConfigManager.set_process_dir(process_dir)
+            processor = TextProcessor(canvas_renderer=canvas_renderer, canvas_pool=canvas_pool)
+            processor.watch_mode = False
+            results[process_dir] = processor.run()
+    finally:
+        ConfigManager.set_process_dir(paths['process_dir'])
+        if canvas_renderer is not None:
+            canvas_renderer.close()
+        canvas_pool.clear()
+
+    LogManager.progress(LangManager.get_lang('batch_complete'), len(results), len(process_dirs))
+    LogManager.flush()
+    return {
+        'config_manager': config_manager,
+        'lang_manager': lang_manager,
+        'paths': paths,
+        'exists_config': exists_config,
+        'results': results
+    }
@@ -2,6 +2,7 @@ import os
 import sys
 import datetime
 from lang_manager import LangManager
+from log_manager import LogManager
 from .config_manager import ConfigManager
 from .default_config import DefaultConfig
 
@@ -32,7 +33,7 @@ class ConfigGenerator:
         # 使用DefaultConfig获取配置定义
         config_definitions = DefaultConfig.get_localized_config_definitions(module)
         if not config_definitions:
-            print(LangManager.get_lang_data()["module_config_not_found"].format(module))
+            LogManager.error(LangManager.get_lang_data()["module_config_not_found"], module)
             raise ValueError(f"无法获取模块 '{module}' 的配置定义")
 
         if module is not None:
@@ -78,12 +79,12 @@ class ConfigGenerator:
                     # 写入配置项
                     f.write(f"{key} = '{value}'\n\n")
 
-            print(LangManager.get_lang('config_generate_success').format(config_path))
+            LogManager.info(LangManager.get_lang('config_generate_success'), config_path)
 
             # 按用户要求，不再自动生成所有模块配置
             # 模块配置需要单独加载
 
         except Exception as e:
             error_msg = LangManager.get_lang('config_generate_fail').format(str(e))
-            print(error_msg)
+            LogManager.error(error_msg)
             raise Exception(error_msg)
\ No newline at end of file
@@ -8,6 +8,7 @@ if library_dir not in sys.path:
 
 # 导入必要的模块
 from lang_manager import LangManager
+from log_manager import LogManager
 from .config_manager import ConfigManager
 
 # 配置管理器通过静态方法使用，无需创建实例
@@ -40,7 +41,7 @@ class ConfigLoader:
         # 使用DefaultConfig获取配置定义
         config_definitions = DefaultConfig.get_config_definitions(module)
         if not config_definitions:
-            print(LangManager.get_lang_data()["module_config_not_found"].format(module))
+            LogManager.error(LangManager.get_lang_data()["module_config_not_found"], module)
             return {}
         if module is None:
             # 主配置
@@ -83,7 +84,7 @@ class ConfigLoader:
                             # 处理不可取默认值类型
                             if prop.get('cannot_use_default', False) and value == prop['default']:
                                 config_valid = 0
-                                print(LangManager.get_lang('config_cannot_use_default').format(key))
+                                LogManager.error(LangManager.get_lang('config_cannot_use_default'), key)
                                 continue
 
                             # 类型和范围验证
@@ -134,33 +135,33 @@ class ConfigLoader:
                             else:
                                 # 使用默认值
                                 config_valid = 1
-                                print(LangManager.get_lang('config_validation_error').format(key, error_msg))
-                                print(LangManager.get_lang('using_default_value').format(key, prop['default']))
+                                LogManager.warning(LangManager.get_lang('config_validation_error'), key, error_msg)
+                                LogManager.warning(LangManager.get_lang('using_default_value'), key, prop['default'])
                         else:
-                            print(LangManager.get_lang('unknown_config_key').format(key))
+                            LogManager.warning(LangManager.get_lang('unknown_config_key'), key)
         except Exception as e:
             error_msg = LangManager.get_lang('config_read_error').format(str(e))
-            print(error_msg)
+            LogManager.error(error_msg)
             raise Exception(error_msg)
 
         # 检查必需的配置项
         for key, prop in config_definitions.items():
             if prop.get('required', False) and key not in config:
-                print(LangManager.get_lang('missing_required_config').format(key))
+                LogManager.warning(LangManager.get_lang('missing_required_config'), key)
                 config[key] = prop['default']
                 ConfigManager.set(key, prop['default'])
-                print(LangManager.get_lang('using_default_value').format(key, prop['default']))
+                LogManager.warning(LangManager.get_lang('using_default_value'), key, prop['default'])
                 config_valid = 1
 
         # 检查配置是否完全不可用
         if config_valid == 0:
             error_msg = LangManager.get_lang('config_cannot_use_default').format('CONFIG_VALID')
-            print(error_msg)
+            LogManager.error(error_msg)
             raise Exception(error_msg)
 
         # 存储配置有效状态
         ConfigManager.set('CONFIG_VALID', config_valid)
         config['CONFIG_VALID'] = config_valid
 
-        print(LangManager.get_lang('config_load_success').format(config_path))
+        LogManager.info(LangManager.get_lang('config_load_success'), config_path)
         return config
@@ -84,6 +84,15 @@ class ConfigManager:
         """
         return cls()._paths.get('process_dir')
 
+    @classmethod
+    def set_process_dir(cls, process_dir):
+        """切换处理目录，批量处理多个目录时使用
+
+        Args:
+            process_dir (str): 新的处理目录路径
+        """
+        cls()._paths['process_dir'] = process_dir
+
     @classmethod
     def get_parent_dir(cls):
         """获取父目录路径
@@ -2,6 +2,7 @@
 import os
 import sys
 from lang_manager import LangManager
+from log_manager import LogManager
 
 # 尝试导入路径
 library_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -19,6 +20,21 @@ class DefaultConfig:
             'description_key': 'config_output_ocr_debug',
             'required': False
         },
+        'OUTPUT_METRICS': {
+            'type': 'boolean',
+            'options': ['True', 'False'],
+            'default': 'False',
+            'description_key': 'config_output_metrics',
+            'required': False
+        },
+        'LOG_LEVEL': {
+            'type': 'string',
+            'subtype': 'option',
+            'options': ['debug', 'info', 'progress', 'quiet'],
+            'default': 'info',
+            'description_key': 'config_log_level',
+            'required': False
+        },
         'START_MARKERS': {
             'type': 'string',
             'subtype': 'non_empty',
@@ -33,6 +49,20 @@ class DefaultConfig:
             'description_key': 'config_stop_markers',
             'required': True
         },
+        'MIDLINE_STOP_MARKERS': {
+            'type': 'string',
+            'default': '',
+            'description_key': 'config_midline_stop_markers',
+            'required': False
+        },
+        'MARKER_MAX_EDITS': {
+            'type': 'integer',
+            'min_value': 0,
+            'max_value': 3,
+            'default': '0',
+            'description_key': 'config_marker_max_edits',
+            'required': False
+        },
         'OCR_MODULE': {
             'type': 'string',
             'subtype': 'option',
@@ -49,6 +79,160 @@ class DefaultConfig:
             'description_key': 'config_max_vertical_images',
             'required': False
         },
+        'STITCH_MODE': {
+            'type': 'string',
+            'subtype': 'option',
+            'options': ['packed', 'vertical'],
+            'default': 'packed',
+            'description_key': 'config_stitch_mode',
+            'required': False
+        },
+        'STITCH_COLOR_MODE': {
+            'type': 'string',
+            'subtype': 'option',
+            'options': ['RGB', 'L', '1'],
+            'default': 'RGB',
+            'description_key': 'config_stitch_color_mode',
+            'required': False
+        },
+        'PAYLOAD_ENCODING': {
+            'type': 'string',
+            'subtype': 'option',
+            'options': ['png', 'auto', 'jpeg', 'webp'],
+            'default': 'png',
+            'description_key': 'config_payload_encoding',
+            'required': False
+        },
+        'PAYLOAD_QUALITY': {
+            'type': 'integer',
+            'min_value': 50,
+            'max_value': 100,
+            'default': '90',
+            'description_key': 'config_payload_quality',
+            'required': False
+        },
+        'PAYLOAD_PNG_COMPRESS_LEVEL': {
+            'type': 'integer',
+            'min_value': 0,
+            'max_value': 9,
+            'default': '6',
+            'description_key': 'config_payload_png_compress_level',
+            'required': False
+        },
+        'CPU_WORKERS': {
+            'type': 'integer',
+            'min_value': 0,
+            'max_value': 64,
+            'default': '2',
+            'description_key': 'config_cpu_workers',
+            'required': False
+        },
+        'MAX_CONCURRENT_REQUESTS': {
+            'type': 'integer',
+            'min_value': 1,
+            'max_value': 256,
+            'default': '4',
+            'description_key': 'config_max_concurrent_requests',
+            'required': False
+        },
+        'DISPATCH_MODE': {
+            'type': 'string',
+            'subtype': 'option',
+            'options': ['thread', 'async'],
+            'default': 'thread',
+            'description_key': 'config_dispatch_mode',
+            'required': False
+        },
+        'DEDUPE_SCREENSHOTS': {
+            'type': 'boolean',
+            'options': ['True', 'False'],
+            'default': 'False',
+            'description_key': 'config_dedupe_screenshots',
+            'required': False
+        },
+        'DEDUPE_HASH_THRESHOLD': {
+            'type': 'integer',
+            'min_value': 0,
+            'max_value': 64,
+            'default': '10',
+            'description_key': 'config_dedupe_hash_threshold',
+            'required': False
+        },
+        'PARAGRAPH_DEDUPE': {
+            'type': 'string',
+            'subtype': 'option',
+            'options': ['off', 'exact', 'fuzzy'],
+            'default': 'off',
+            'description_key': 'config_paragraph_dedupe',
+            'required': False
+        },
+        'PARAGRAPH_SIMILARITY_THRESHOLD': {
+            'type': 'float',
+            'min_value': 0.5,
+            'max_value': 1,
+            'default': '0.8',
+            'description_key': 'config_paragraph_similarity_threshold',
+            'required': False
+        },
+        'ROI_MODE': {
+            'type': 'string',
+            'subtype': 'option',
+            'options': ['off', 'fixed', 'auto'],
+            'default': 'off',
+            'description_key': 'config_roi_mode',
+            'required': False
+        },
+        'ROI_REGION': {
+            'type': 'string',
+            'default': '0.24,0.24,0.76,0.77',
+            'description_key': 'config_roi_region',
+            'required': False
+        },
+        'ENABLE_OCR_CACHE': {
+            'type': 'boolean',
+            'options': ['True', 'False'],
+            'default': 'False',
+            'description_key': 'config_enable_ocr_cache',
+            'required': False
+        },
+        'OCR_CACHE_MAX_MB': {
+            'type': 'integer',
+            'min_value': 0,
+            'max_value': 102400,
+            'default': '256',
+            'description_key': 'config_ocr_cache_max_mb',
+            'required': False
+        },
+        'OCR_CACHE_BYPASS': {
+            'type': 'boolean',
+            'options': ['True', 'False'],
+            'default': 'False',
+            'description_key': 'config_ocr_cache_bypass',
+            'required': False
+        },
+        'RESUME_MODE': {
+            'type': 'string',
+            'subtype': 'option',
+            'options': ['off', 'resume', 'retry_failed'],
+            'default': 'off',
+            'description_key': 'config_resume_mode',
+            'required': False
+        },
+        'WATCH_MODE': {
+            'type': 'boolean',
+            'options': ['True', 'False'],
+            'default': 'False',
+            'description_key': 'config_watch_mode',
+            'required': False
+        },
+        'WATCH_SETTLE_SECONDS': {
+            'type': 'float',
+            'min_value': 0,
+            'max_value': 60,
+            'default': '2',
+            'description_key': 'config_watch_settle_seconds',
+            'required': False
+        },
         'OCR_LANGUAGE': {
             'type': 'string',
             'options': ['zh-cn', 'zh-tw', 'en', 'ja-jp','default'],
@@ -87,7 +271,7 @@ class DefaultConfig:
         """
         if module_name and config_definitions:
             cls.MODULE_CONFIG_REGISTRY[module_name] = config_definitions
-            print(f"Registered config for module: {module_name}")
+            LogManager.debug("Registered config for module: {}", module_name)
 
     @classmethod
     def get_localized_config_definitions(cls, module=None):
@@ -3,6 +3,7 @@ import sys
 import subprocess
 import importlib
 from lang_manager import LangManager
+from log_manager import LogManager
 from config.config_manager import ConfigManager
 
 
@@ -21,6 +22,7 @@ def check_dependencies(required_deps):
     BASE_DEPENDENCIES = {
         'PIL': {'install_name': 'Pillow', 'version': '>=9.0.0'},
         'chardet': {'install_name': 'chardet', 'version': '>=4.0.0'},
+        'numpy': {'install_name': 'numpy', 'version': '>=1.20.0'},
         'requests': {'install_name': 'requests', 'version': '>=2.25.0'}
     }
     
@@ -46,23 +48,23 @@ def check_dependencies(required_deps):
 
     # 如果有缺失的依赖
     if missing_deps:
-        print(LangManager.get_lang('dependency_missing').format(', '.join(missing_deps)))
+        LogManager.error(LangManager.get_lang('dependency_missing'), ', '.join(missing_deps))
 
         # 尝试安装依赖
         success = False
         try:
-            print(LangManager.get_lang('trying_install_deps'))
+            LogManager.info(LangManager.get_lang('trying_install_deps'))
             for cmd in install_commands:
-                print(f"{LangManager.get_lang('executing')}: {cmd}")
+                LogManager.info(f"{LangManager.get_lang('executing')}: {cmd}")
                 result = subprocess.run(cmd, shell=True, capture_output=True, text=True)
                 if result.returncode != 0:
-                    print(f"{LangManager.get_lang('install_failed')}: {cmd}")
-                    print(f"{LangManager.get_lang('error_info')}: {result.stderr}")
+                    LogManager.error(f"{LangManager.get_lang('install_failed')}: {cmd}")
+                    LogManager.error(f"{LangManager.get_lang('error_info')}: {result.stderr}")
                 else:
-                    print(f"{LangManager.get_lang('install_success')}: {cmd}")
+                    LogManager.info(f"{LangManager.get_lang('install_success')}: {cmd}")
             success = True
         except Exception as e:
-            print(f"{LangManager.get_lang('install_exception')}: {str(e)}")
+            LogManager.error(f"{LangManager.get_lang('install_exception')}: {str(e)}")
 
         # 生成依赖安装提示文件
         process_dir = ConfigManager.get_process_dir()
@@ -80,8 +82,8 @@ def check_dependencies(required_deps):
                 f.write(f"{cmd}\n")
             f.write('\n' + LangManager.get_lang('restart_note'))
 
-        print(LangManager.get_lang('guide_file_created').format(guide_file))
-        print(LangManager.get_lang('restart_program'))
+        LogManager.info(LangManager.get_lang('guide_file_created'), guide_file)
+        LogManager.info(LangManager.get_lang('restart_program'))
         return False
 
     # 所有依赖都满足
@@ -0,0 +1,208 @@
+import os
+import sys
+import time
+import select
+import struct
+import ctypes
+import ctypes.util
+from PIL import Image
+
+
+class _PollingBackend:
+    """定期扫描目录的后备实现，适用于所有平台"""
+
+    name = 'polling'
+
+    def __init__(self, directory):
+        self.directory = directory
+
+    def wait(self, timeout):
+        """等待timeout秒，返回None表示需要重新扫描整个目录"""
+        time.sleep(timeout)
+        return None
+
+    def close(self):
+        pass
+
+
+class _InotifyBackend:
+    """基于Linux inotify的实现，通过ctypes调用libc，文件变化时立即唤醒"""
+
+    name = 'inotify'
+
+    IN_MODIFY = 0x00000002
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_Q_OVERFLOW = 0x00004000
+    IN_NONBLOCK = 0o4000
+    IN_CLOEXEC = 0o2000000
+    EVENT_HEADER = struct.Struct('iIII')
+
+    def __init__(self, directory):
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        self._fd = libc.inotify_init1(self.IN_NONBLOCK | self.IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), 'inotify_init1')
+        mask = self.IN_MODIFY | self.IN_CLOSE_WRITE | self.IN_MOVED_TO | self.IN_CREATE
+        if libc.inotify_add_watch(self._fd, os.fsencode(directory), mask) < 0:
+            errno = ctypes.get_errno()
+            os.close(self._fd)
+            raise OSError(errno, 'inotify_add_watch')
+
+    def wait(self, timeout):
+        """等待文件变化
+
+        Returns:
+            set or None: 发生变化的文件名集合，事件队列溢出时返回None表示需要重新扫描整个目录
+        """
+        readable, _, _ = select.select([self._fd], [], [], timeout)
+        if not readable:
+            return set()
+        try:
+            data = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return set()
+
+        names = set()
+        offset = 0
+        while offset + self.EVENT_HEADER.size <= len(data):
+            _, mask, _, length = self.EVENT_HEADER.unpack_from(data, offset)
+            offset += self.EVENT_HEADER.size
+            if mask & self.IN_Q_OVERFLOW:
+                return None
+            name = data[offset:offset + length].rstrip(b'\0')
+            offset += length
+            if name:
+                names.add(os.fsdecode(name))
+        return names
+
+    def close(self):
+        os.close(self._fd)
+
+
+class FolderWatcher:
+    """监视目录中新出现的图片文件
+
+    Linux上使用inotify在文件变化时立即唤醒，其他平台或inotify不可用时每poll_interval秒扫描一次目录。
+    截图工具写入文件需要时间，文件的大小和修改时间连续settle_seconds秒不变、
+    并且可以作为图片完整读取后才视为写入完成，避免识别写了一半的文件。
+    """
+
+    def __init__(self, directory, extensions, settle_seconds=2.0, poll_interval=1.0, clock=time.monotonic):
+        """初始化监视器
+
+        Args:
+            directory (str): 要监视的目录
+            extensions (tuple): 需要关注的文件扩展名(小写，包含点号)
+            settle_seconds (float): 文件保持不变多久后视为写入完成(秒)
+            poll_interval (float): 两次检查之间的最长间隔(秒)，也是轮询方式的扫描间隔
+            clock (callable): 返回当前时间的函数
+        """
+        self.directory = directory
+        self.extensions = tuple(extensions)
+        self.settle_seconds = max(0.0, float(settle_seconds))
+        self.poll_interval = max(0.05, float(poll_interval))
+        self._clock = clock
+        self._backend = None
+        # 已经交给调用方或启动时已存在的文件
+        self._known = set()
+        # 文件名 -> (大小, 修改时间, 开始保持不变的时间)
+        self._candidates = {}
+
+    @property
+    def backend_name(self):
+        """当前使用的监视方式，inotify或polling"""
+        return self._backend.name if self._backend else None
+
+    def start(self, known_files=()):
+        """开始监视
+
+        Args:
+            known_files (iterable): 已经处理过的文件名，这些文件不会再被报告
+        """
+        self._known = set(known_files)
+        self._candidates = {}
+        self._backend = None
+        if sys.platform.startswith('linux'):
+            try:
+                self._backend = _InotifyBackend(self.directory)
+            except (OSError, AttributeError):
+                self._backend = None
+        if self._backend is None:
+            self._backend = _PollingBackend(self.directory)
+        # 启动前已经出现但不在known_files中的文件也需要处理
+        self._scan()
+
+    def _is_image(self, name):
+        return name.lower().endswith(self.extensions)
+
+    def _scan(self):
+        """扫描整个目录，把新出现的图片加入候选"""
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return
+        self._add_candidates(names)
+
+    def _add_candidates(self, names):
+        now = self._clock()
+        for name in names:
+            if name in self._known or name in self._candidates or not self._is_image(name):
+                continue
+            self._candidates[name] = (-1, -1, now)
+
+    def _is_complete(self, path):
+        """文件能否作为完整的图片读取"""
+        try:
+            with Image.open(path) as img:
+                img.verify()
+            return True
+        except Exception:
+            return False
+
+    def poll(self, timeout=None):
+        """等待新的图片写入完成
+
+        Args:
+            timeout (float): 最长等待时间(秒)，None表示等待poll_interval秒
+
+        Returns:
+            list: 写入完成的新图片文件名，没有时返回空列表
+        """
+        wait = self.poll_interval if timeout is None else max(0.0, min(timeout, self.poll_interval))
+        changed = self._backend.wait(wait)
+        if changed is None:
+            self._scan()
+        else:
+            self._add_candidates(changed)
+
+        ready = []
+        now = self._clock()
+        for name, (size, mtime, stable_since) in list(self._candidates.items()):
+            path = os.path.join(self.directory, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                # 文件已被删除或重命名
+                del self._candidates[name]
+                continue
+            if (stat.st_size, stat.st_mtime_ns) != (size, mtime):
+                self._candidates[name] = (stat.st_size, stat.st_mtime_ns, now)
+                continue
+            if stat.st_size == 0 or now - stable_since < self.settle_seconds:
+                continue
+            if not self._is_complete(path):
+                # 大小不变但还不是完整的图片，重新开始计时
+                self._candidates[name] = (stat.st_size, stat.st_mtime_ns, now)
+                continue
+            del self._candidates[name]
+            self._known.add(name)
+            ready.append(name)
+        return ready
+
+    def close(self):
+        """停止监视"""
+        if self._backend is not None:
+            self._backend.close()
+            self._backend = None
@@ -0,0 +1,11 @@
+# 图片预处理模块初始化文件
+
+from .duplicate_detector import DuplicateDetector
+from .region_detector import RegionDetector
+from .stitch_planner import StitchItem, CanvasPlan, StitchPlanner
+from .canvas_pool import CanvasPool
+from .payload_encoder import PayloadEncoder
+from .canvas_renderer import CanvasRenderer, render_canvas
+
+__all__ = ['DuplicateDetector', 'RegionDetector', 'StitchItem', 'CanvasPlan', 'StitchPlanner', 'CanvasPool', 'PayloadEncoder',
+           'CanvasRenderer', 'render_canvas']
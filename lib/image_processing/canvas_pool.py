@@ -0,0 +1,93 @@
+import threading
+from collections import OrderedDict
+from PIL import Image
+
+
+class CanvasPool:
+    """可复用的拼接画布池
+
+    拼接时按(模式, 尺寸)从池中取出空闲画布，编码完成后放回池中供下一张画布使用，
+    避免每张画布都重新分配一块大内存。按STITCH_MODE规划的画布大多尺寸相同，
+    长时间运行时内存占用基本保持不变。
+
+    池中最多保留max_idle张空闲画布，超出时释放最久未使用的画布。
+    所有方法都是线程安全的，并发拼接时每个线程各自持有一张画布。
+    """
+
+    def __init__(self, max_idle=4, background='white'):
+        """初始化画布池
+
+        Args:
+            max_idle (int): 池中最多保留的空闲画布数量，0表示不复用
+            background (str): 画布的背景色
+        """
+        self.max_idle = max(0, int(max_idle))
+        self.background = background
+        self._lock = threading.Lock()
+        # (模式, 尺寸) -> 空闲画布列表，按放回的先后顺序排列
+        self._idle = OrderedDict()
+        self._idle_count = 0
+
+        # 统计信息
+        self.allocations = 0
+        self.reuses = 0
+
+    def acquire(self, mode, size):
+        """取出一张填充为背景色的画布
+
+        Args:
+            mode (str): 画布的颜色模式，如RGB或L
+            size (tuple): 画布尺寸(宽, 高)
+
+        Returns:
+            PIL.Image.Image: 画布，使用完毕后需要调用release放回
+        """
+        key = (mode, tuple(size))
+        with self._lock:
+            canvases = self._idle.get(key)
+            canvas = canvases.pop() if canvases else None
+            if canvas is not None:
+                self._idle_count -= 1
+                if not canvases:
+                    del self._idle[key]
+                self.reuses += 1
+            else:
+                self.allocations += 1
+
+        if canvas is None:
+            return Image.new(mode, key[1], color=self.background)
+        # 复用的画布在原有内存上重新填充背景色
+        canvas.paste(self.background, (0, 0) + canvas.size)
+        return canvas
+
+    def release(self, canvas):
+        """把画布放回池中
+
+        Args:
+            canvas (PIL.Image.Image): acquire取出的画布
+        """
+        if not self.max_idle:
+            canvas.close()
+            return
+        key = (canvas.mode, canvas.size)
+        with self._lock:
+            self._idle.setdefault(key, []).append(canvas)
+            self._idle.move_to_end(key)
+            self._idle_count += 1
+            # 释放最久未使用的尺寸的画布
+            while self._idle_count > self.max_idle:
+                oldest_key = next(iter(self._idle))
+                oldest = self._idle[oldest_key]
+                oldest.pop(0).close()
+                self._idle_count -= 1
+                if not oldest:
+                    del self._idle[oldest_key]
+
+    def clear(self):
+        """释放池中所有空闲画布"""
+        with self._lock:
+            for canvases in self._idle.values():
+                for canvas in canvases:
+                    canvas.close()
+            self._idle.clear()
+            self._idle_count = 0
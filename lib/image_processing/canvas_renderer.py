@@ -0,0 +1,174 @@
+import io
+import time
+import signal
+import multiprocessing
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from PIL import Image
+from .canvas_pool import CanvasPool
+from .payload_encoder import PayloadEncoder
+
+# 工作进程中复用的画布池，由_init_worker创建
+_worker_canvas_pool = None
+
+
+def _init_worker(max_idle):
+    global _worker_canvas_pool
+    # Ctrl+C由主进程处理，工作进程随进程池关闭而退出
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    _worker_canvas_pool = CanvasPool(max_idle=max_idle)
+
+
+def render_canvas(plan, encoder=None, canvas_pool=None):
+    """按布局表解码、裁剪并拼接源图片，再由编码器把画布编码为图片数据
+
+    同一时间只有一张源图片在内存中。单张未裁剪的图片不需要拼接，直接解码后重新编码，
+    原文件也作为候选，重新编码不能变小时使用原文件。该函数只依赖PIL，可以在工作进程中执行。
+    解码、拼接和编码各自的耗时和解码的像素数记录在编码信息的timings和pixels_decoded中，
+    随结果返回主进程后计入PipelineMetrics。
+
+    Args:
+        plan (CanvasPlan): 画布的布局表
+        encoder (PayloadEncoder): 编码器，None时使用PNG编码
+        canvas_pool (CanvasPool): 复用画布内存的画布池，None时在工作进程中使用进程内的画布池，
+            否则每次新建画布
+
+    Returns:
+        tuple: (编码后的图片数据, 画布尺寸(宽, 高), 编码信息字典)
+    """
+    encoder = encoder or PayloadEncoder()
+    # 灰度和二值编码都在灰度画布上拼接
+    mode = 'L' if encoder.color_mode in ('L', '1') else 'RGB'
+    decode_time = stitch_time = 0.0
+    pixels_decoded = 0
+
+    if not plan.needs_render():
+        start_time = time.perf_counter()
+        with open(plan.placements[0].file_path, 'rb') as f:
+            original = f.read()
+        with Image.open(io.BytesIO(original)) as img:
+            img.draft(mode, img.size)
+            img.load()
+            decode_time = time.perf_counter() - start_time
+            start_time += decode_time
+            data, info = encoder.encode(img, original=(original, img.format))
+            info['timings'] = {'decode': decode_time, 'encode': time.perf_counter() - start_time}
+            info['pixels_decoded'] = img.size[0] * img.size[1]
+            return data, img.size, info
+
+    pool = canvas_pool or _worker_canvas_pool
+    size = (plan.width, plan.height)
+    canvas = pool.acquire(mode, size) if pool is not None else Image.new(mode, size, color='white')
+    try:
+        for placement in plan.placements:
+            start_time = time.perf_counter()
+            with Image.open(placement.file_path) as img:
+                # JPEG可以在解码时直接转换为目标模式
+                img.draft(mode, img.size)
+                img.load()
+                pixels_decoded += img.size[0] * img.size[1]
+                decoded_time = time.perf_counter()
+                decode_time += decoded_time - start_time
+                if placement.crop_box is not None:
+                    img = img.crop(placement.crop_box)
+                canvas.paste(img, (placement.x, placement.y))
+                img.close()
+                stitch_time += time.perf_counter() - decoded_time
+
+        start_time = time.perf_counter()
+        data, info = encoder.encode(canvas)
+        info['timings'] = {'decode': decode_time, 'stitch': stitch_time, 'encode': time.perf_counter() - start_time}
+        info['pixels_decoded'] = pixels_decoded
+        return data, canvas.size, info
+    finally:
+        if pool is not None:
+            pool.release(canvas)
+        else:
+            canvas.close()
+
+
+class CanvasRenderer:
+    """在工作进程池中拼接和编码画布
+
+    解码、裁剪、拼接和PNG编码都是CPU密集的操作，放在独立的进程中执行可以利用多个CPU核心，
+    同时主进程中的识别线程继续等待网络请求。每个工作进程有自己的画布池。
+    进程池在第一次提交画布时才创建，只有单张未裁剪图片的目录不会启动工作进程。
+    工作进程在所有平台上都以spawn方式启动：创建进程池时主进程中已有识别线程、输出缓冲的定时器线程
+    和缓存数据库连接，fork出的子进程可能继承被其他线程持有的锁而死锁。
+    """
+
+    def __init__(self, workers=2, encoder=None, max_pending=0):
+        """初始化渲染器
+
+        Args:
+            workers (int): 工作进程数
+            encoder (PayloadEncoder): 画布的编码器，None时使用PNG编码
+            max_pending (int): submit_ordered最多提前提交的画布数量，0表示工作进程数的2倍
+        """
+        self.workers = max(1, int(workers))
+        self.encoder = encoder or PayloadEncoder()
+        self.max_pending = max(1, int(max_pending) or self.workers * 2)
+        self._executor = None
+        # 进程池无法创建时(例如平台不支持)为True，之后不再尝试
+        self.unavailable = False
+
+    def submit(self, plan):
+        """把一张画布提交到工作进程拼接
+
+        Args:
+            plan (CanvasPlan): 画布的布局表
+
+        Returns:
+            concurrent.futures.Future or None: 结果为render_canvas的返回值，进程池不可用时返回None
+        """
+        if self.unavailable:
+            return None
+        try:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers, mp_context=multiprocessing.get_context('spawn'),
+                    initializer=_init_worker, initargs=(1,)
+                )
+            return self._executor.submit(render_canvas, plan, self.encoder)
+        except (OSError, RuntimeError, NotImplementedError, ImportError):
+            # 进程池已损坏或无法创建
+            self.unavailable = True
+            self.close()
+            return None
+
+    def needs_render(self, plan):
+        """画布是否需要在工作进程中处理，单张未裁剪的图片在编码器不需要重新编码时直接上传原文件
+
+        Args:
+            plan (CanvasPlan): 画布的布局表
+
+        Returns:
+            bool: 需要拼接或重新编码时返回True
+        """
+        return plan.needs_render() or self.encoder.needs_encoding(plan.placements[0].file_path)
+
+    def submit_ordered(self, plans):
+        """按顺序提交画布，并按原始顺序逐张产出尚未完成的任务
+
+        最多提前提交max_pending张画布，调用方取走一张后才会提交下一张，
+        因此拼接结果不会在内存中无限堆积。
+
+        Args:
+            plans (iterable): CanvasPlan序列
+
+        Yields:
+            tuple: (CanvasPlan, Future)，不需要处理的画布或进程池不可用时为(CanvasPlan, None)
+        """
+        pending = deque()
+        for plan in plans:
+            pending.append((plan, self.submit(plan) if self.needs_render(plan) else None))
+            if len(pending) >= self.max_pending:
+                yield pending.popleft()
+        while pending:
+            yield pending.popleft()
+
+    def close(self):
+        """关闭进程池，等待已提交的画布完成"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
@@ -0,0 +1,99 @@
+import numpy as np
+from PIL import Image
+
+
+# 0-255每个字节中1的位数，用于向量化计算汉明距离
+_POPCOUNT_TABLE = np.array([bin(value).count('1') for value in range(256)], dtype=np.uint8)
+
+
+class DuplicateDetector:
+    """基于感知哈希的近似重复截图检测器
+
+    对每张截图计算差值哈希(dHash)：缩小为(hash_size+1)×hash_size的灰度图，
+    比较每行相邻像素的明暗得到hash_size×hash_size位的指纹。
+    同一界面的多次截图即使存在压缩噪声或轻微的亮度差异，指纹也只相差很少的位数。
+
+    按文件顺序逐张比较：与已有代表图片的汉明距离不超过threshold时视为重复，
+    否则成为新的代表图片。只和代表图片比较可以避免逐渐变化的截图被链式地合并到一起，
+    并且每组重复截图中保留的总是最早的一张。
+    代表图片在多次调用find_duplicates之间保留，新截图分批到达时也会与之前的截图比较。
+    """
+
+    def __init__(self, hash_size=16, threshold=10):
+        """初始化检测器
+
+        Args:
+            hash_size (int): 哈希边长，指纹共hash_size*hash_size位
+            threshold (int): 判定为重复的最大汉明距离(位)
+        """
+        self.hash_size = max(2, int(hash_size))
+        self.threshold = max(0, int(threshold))
+        self.representative_paths = []
+        self.representative_hashes = []
+
+    def compute_hash(self, image_path):
+        """计算单张图片的差值哈希
+
+        Args:
+            image_path (str): 图片文件路径
+
+        Returns:
+            numpy.ndarray: 按位打包的指纹，长度为hash_size*hash_size/8的uint8数组
+        """
+        with Image.open(image_path) as img:
+            # JPEG可以在解码时直接缩小，减少解码的像素量
+            img.draft('L', (self.hash_size * 4, self.hash_size * 4))
+            small = img.convert('L').resize(
+                (self.hash_size + 1, self.hash_size), Image.BILINEAR, reducing_gap=2.0
+            )
+        pixels = np.asarray(small, dtype=np.int16)
+        return np.packbits(pixels[:, 1:] > pixels[:, :-1])
+
+    @staticmethod
+    def hamming_distances(hashes, reference):
+        """计算一组指纹与参考指纹之间的汉明距离
+
+        Args:
+            hashes (numpy.ndarray): 形状为(n, 字节数)的指纹矩阵
+            reference (numpy.ndarray): 参考指纹
+
+        Returns:
+            numpy.ndarray: 长度为n的距离数组
+        """
+        return _POPCOUNT_TABLE[np.bitwise_xor(hashes, reference)].sum(axis=1, dtype=np.int32)
+
+    def find_duplicates(self, image_paths):
+        """在图片列表中查找近似重复的截图，与之前调用时保留的代表图片重复的截图同样会被找出
+
+        Args:
+            image_paths (list): 按处理顺序排列的图片路径列表
+
+        Returns:
+            tuple: (保留的图片路径列表, 重复图片列表)
+                重复图片列表的元素为(重复图片路径, 保留的代表图片路径, 汉明距离)，
+                无法读取的图片总是保留，交给后续流程报告错误
+        """
+        kept = []
+        duplicates = []
+        representative_paths = self.representative_paths
+        representative_hashes = self.representative_hashes
+
+        for image_path in image_paths:
+            try:
+                image_hash = self.compute_hash(image_path)
+            except Exception:
+                kept.append(image_path)
+                continue
+
+            if representative_hashes:
+                distances = self.hamming_distances(np.stack(representative_hashes), image_hash)
+                nearest = int(np.argmin(distances))
+                if distances[nearest] <= self.threshold:
+                    duplicates.append((image_path, representative_paths[nearest], int(distances[nearest])))
+                    continue
+
+            kept.append(image_path)
+            representative_paths.append(image_path)
+            representative_hashes.append(image_hash)
+
+        return kept, duplicates
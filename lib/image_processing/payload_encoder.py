@@ -0,0 +1,156 @@
+import io
+import os
+from PIL import features
+
+
+class PayloadEncoder:
+    """为OCR请求选择图片的编码方式，在OCR模块的数据量限制内让上传的数据尽量小
+
+    按strategy生成候选编码并选择数据量最小的一个：
+    png只使用无损PNG；auto优先使用无损PNG，PNG超过max_bytes时才尝试OCR模块支持的有损格式(JPEG、WebP)；
+    jpeg和webp同时尝试PNG和指定的有损格式，模块不支持时使用PNG。
+    结果仍超过max_bytes时依次降低有损格式的质量、转换为灰度，直到满足限制或无法再缩小。
+
+    color_mode为1时先把图片二值化，只使用PNG编码，适合纯色背景上的文字。
+    该类只依赖PIL，可以传给工作进程使用。
+    """
+
+    LOSSY_FORMATS = ('JPEG', 'WEBP')
+    STRATEGIES = ('png', 'auto', 'jpeg', 'webp')
+    # 超过数据量限制时每次降低的质量
+    QUALITY_STEP = 10
+    # 二值化的灰度阈值
+    BINARIZE_THRESHOLD = 160
+
+    def __init__(self, strategy='png', formats=('PNG',), max_bytes=0, color_mode='RGB',
+                 quality=90, min_quality=50, png_compress_level=6):
+        """初始化编码器
+
+        Args:
+            strategy (str): 编码策略，png、auto、jpeg或webp
+            formats (iterable): OCR模块支持的图片格式(PIL格式名)
+            max_bytes (int): 编码后的最大数据量(字节)，0表示不限制
+            color_mode (str): 编码的颜色模式，RGB、L或1(二值)
+            quality (int): 有损格式的编码质量
+            min_quality (int): 为满足数据量限制降低质量时的下限
+            png_compress_level (int): PNG的压缩级别，0最快，9最小
+        """
+        self.strategy = strategy if strategy in self.STRATEGIES else 'png'
+        # 当前环境的PIL不支持编码的格式不作为候选
+        self.formats = tuple(
+            f.upper() for f in formats if f.upper() != 'WEBP' or features.check('webp')
+        ) or ('PNG',)
+        self.max_bytes = max(0, int(max_bytes))
+        self.color_mode = color_mode
+        self.quality = min(100, max(1, int(quality)))
+        self.min_quality = min(self.quality, max(1, int(min_quality)))
+        self.png_compress_level = min(9, max(0, int(png_compress_level)))
+
+    def _lossy_formats(self):
+        """当前策略可以使用的有损格式"""
+        if self.color_mode == '1':
+            return []
+        if self.strategy == 'auto':
+            candidates = self.LOSSY_FORMATS
+        elif self.strategy in ('jpeg', 'webp'):
+            candidates = (self.strategy.upper(),)
+        else:
+            candidates = ()
+        return [f for f in candidates if f in self.formats]
+
+    def needs_encoding(self, file_path):
+        """单张未裁剪的图片是否需要重新编码，否则直接上传原文件
+
+        Args:
+            file_path (str): 图片文件路径
+
+        Returns:
+            bool: 策略为jpeg或webp，或者原文件超过数据量限制时返回True
+        """
+        if self.strategy in ('jpeg', 'webp'):
+            return True
+        try:
+            return bool(self.max_bytes) and os.path.getsize(file_path) > self.max_bytes
+        except OSError:
+            return False
+
+    def _save(self, image, format, quality):
+        buffer = io.BytesIO()
+        if format == 'PNG':
+            image.save(buffer, format='PNG', compress_level=self.png_compress_level)
+        elif format == 'WEBP':
+            image.save(buffer, format='WEBP', quality=quality, method=4)
+        else:
+            image.save(buffer, format=format, quality=quality, optimize=True)
+        return buffer.getvalue()
+
+    def _best(self, image, lossy_formats, quality, include_png):
+        """编码所有候选格式，返回数据量最小的(数据, 格式, 质量)"""
+        results = []
+        if include_png or not lossy_formats:
+            results.append((self._save(image, 'PNG', None), 'PNG', None))
+        for format in lossy_formats:
+            results.append((self._save(image, format, quality), format, quality))
+        return min(results, key=lambda result: len(result[0]))
+
+    def _fits(self, data):
+        return not self.max_bytes or len(data) <= self.max_bytes
+
+    def encode(self, image, original=None):
+        """编码图片
+
+        Args:
+            image (PIL.Image.Image): 待编码的图片
+            original (tuple): 单张图片的原文件(编码数据, PIL格式名)，数据量更小且OCR模块支持该格式时直接使用
+
+        Returns:
+            tuple: (编码数据, 编码信息字典)，编码信息包含format、mode、quality和bytes
+        """
+        if self.color_mode == '1':
+            image = image.convert('L').point(lambda v: 255 if v >= self.BINARIZE_THRESHOLD else 0, mode='1')
+        elif self.color_mode == 'L' and image.mode != 'L':
+            image = image.convert('L')
+        elif image.mode not in ('RGB', 'L', '1'):
+            image = image.convert('RGB')
+
+        lossy_formats = self._lossy_formats()
+        # auto优先上传无损PNG，有损压缩可能影响较小文字的识别，只在超过数据量限制时使用
+        lossless_first = self.strategy == 'auto'
+        data, format, quality = self._best(image, [] if lossless_first else lossy_formats, self.quality, include_png=True)
+        if lossless_first and lossy_formats and not self._fits(data):
+            data, format, quality = self._best(image, lossy_formats, self.quality, include_png=False)
+
+        # 超过数据量限制时降低有损格式的质量
+        while not self._fits(data) and lossy_formats and quality is not None and quality > self.min_quality:
+            quality = max(self.min_quality, quality - self.QUALITY_STEP)
+            data, format, quality = self._best(image, lossy_formats, quality, include_png=False)
+        # 仍然超过限制时转换为灰度
+        if not self._fits(data) and image.mode == 'RGB':
+            image = image.convert('L')
+            data, format, quality = self._best(image, lossy_formats, quality or self.min_quality, include_png=True)
+
+        if original is not None:
+            original_data, original_format = original
+            if (original_format and original_format.upper() in self.formats
+                    and len(original_data) <= len(data) and self._fits(original_data)):
+                return original_data, {'format': original_format.upper(), 'mode': 'original',
+                                       'quality': None, 'bytes': len(original_data)}
+
+        return data, {'format': format, 'mode': image.mode, 'quality': quality, 'bytes': len(data)}
+
+    @staticmethod
+    def describe(info):
+        """把编码信息转换为便于阅读的文本
+
+        Args:
+            info (dict): encode返回的编码信息
+
+        Returns:
+            str: 例如JPEG q90 L 512.3KB
+        """
+        parts = [info['format']]
+        if info.get('quality') is not None:
+            parts.append(f"q{info['quality']}")
+        parts.append(info['mode'])
+        parts.append(f"{info['bytes'] / 1024:.1f}KB")
+        return ' '.join(parts)
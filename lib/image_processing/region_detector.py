@@ -0,0 +1,171 @@
+import threading
+import numpy as np
+from PIL import Image
+
+
+class RegionDetector:
+    """剧情梗概面板的区域检测器，在拼接前把截图裁剪到面板区域
+
+    支持两种模式:
+    - fixed: 按ROI_REGION给出的相对坐标(左,上,右,下，0-1之间的比例)裁剪
+    - auto: 自动检测面板位置。游戏弹出面板时会模糊背景，面板的边框、分隔条和按钮
+      是画面中仅有的清晰长边缘，统计每行、每列的强边缘像素数即可找到面板的外框。
+      同一分辨率只检测前LEARN_SAMPLES张截图，取各边的中位数后用于该分辨率的所有截图，
+      检测失败的截图不裁剪。
+
+    裁剪后的图片只包含面板(包括标题、剧情梗概和取消/确认按钮)，上传的数据量更小，
+    同样的最大高度下可以拼接更多截图。
+    """
+
+    # 每种分辨率用于学习面板位置的截图数量
+    LEARN_SAMPLES = 3
+    # 边缘检测前的缩小倍数
+    DETECT_REDUCE = 2
+    # 判定为强边缘的相邻像素灰度差
+    EDGE_THRESHOLD = 24
+    # 面板外框的行/列中强边缘像素至少占图片宽/高的比例
+    EDGE_COVERAGE = 0.2
+    # 忽略图片边界附近的边缘，避免截图边缘的黑边或描边被当作面板外框
+    BORDER_IGNORE = 0.01
+    # 面板至少占图片宽和高的比例，否则视为检测失败
+    MIN_PANEL_FRACTION = 0.2
+
+    def __init__(self, mode='off', region=(0.0, 0.0, 1.0, 1.0), padding=0.01):
+        """初始化区域检测器
+
+        Args:
+            mode (str): off不裁剪，fixed按region裁剪，auto自动检测面板位置
+            region (tuple): fixed模式下的相对坐标(左, 上, 右, 下)
+            padding (float): auto模式下检测到的面板向外扩展的比例，避免裁掉面板的描边
+        """
+        self.mode = mode
+        self.region = tuple(region)
+        self.padding = max(0.0, float(padding))
+        self._lock = threading.Lock()
+        # 分辨率 -> 已检测到的面板位置列表
+        self._samples = {}
+        # 分辨率 -> 学习得到的面板位置，None表示该分辨率检测失败
+        self._learned = {}
+
+    @staticmethod
+    def parse_region(value):
+        """解析ROI_REGION配置
+
+        Args:
+            value (str): 逗号分隔的四个比例，如'0.24,0.24,0.76,0.77'
+
+        Returns:
+            tuple: (左, 上, 右, 下)，格式错误时返回None
+        """
+        try:
+            left, top, right, bottom = (float(part) for part in str(value).split(','))
+        except ValueError:
+            return None
+        if not (0.0 <= left < right <= 1.0 and 0.0 <= top < bottom <= 1.0):
+            return None
+        return left, top, right, bottom
+
+    def is_enabled(self):
+        """是否需要裁剪
+
+        Returns:
+            bool: mode为fixed或auto时返回True
+        """
+        return self.mode in ('fixed', 'auto')
+
+    def detect_panel(self, image):
+        """检测单张截图中的面板外框
+
+        Args:
+            image (PIL.Image.Image): 截图
+
+        Returns:
+            tuple or None: 面板的像素坐标(左, 上, 右, 下)，检测失败时返回None
+        """
+        small = image.convert('L').reduce(self.DETECT_REDUCE)
+        gray = np.asarray(small, dtype=np.int16)
+        height, width = gray.shape
+
+        # 每列的水平方向强边缘数和每行的垂直方向强边缘数
+        column_edges = (np.abs(np.diff(gray, axis=1)) > self.EDGE_THRESHOLD).sum(axis=0)
+        row_edges = (np.abs(np.diff(gray, axis=0)) > self.EDGE_THRESHOLD).sum(axis=1)
+
+        columns = np.nonzero(column_edges >= self.EDGE_COVERAGE * height)[0]
+        rows = np.nonzero(row_edges >= self.EDGE_COVERAGE * width)[0]
+        columns = columns[(columns >= self.BORDER_IGNORE * width) & (columns < (1 - self.BORDER_IGNORE) * width - 1)]
+        rows = rows[(rows >= self.BORDER_IGNORE * height) & (rows < (1 - self.BORDER_IGNORE) * height - 1)]
+        if len(columns) < 2 or len(rows) < 2:
+            return None
+
+        # diff的第i个元素位于像素i和i+1之间，外框取边缘外侧的像素
+        left, right = int(columns[0]), int(columns[-1]) + 2
+        top, bottom = int(rows[0]), int(rows[-1]) + 2
+        if right - left < self.MIN_PANEL_FRACTION * width or bottom - top < self.MIN_PANEL_FRACTION * height:
+            return None
+
+        scale = self.DETECT_REDUCE
+        return left * scale, top * scale, min(right * scale, image.width), min(bottom * scale, image.height)
+
+    def get_crop_box(self, image):
+        """获取截图的裁剪区域
+
+        Args:
+            image (PIL.Image.Image): 截图
+
+        Returns:
+            tuple or None: 像素坐标(左, 上, 右, 下)，不需要裁剪时返回None
+        """
+        width, height = image.size
+        if self.mode == 'fixed':
+            left, top, right, bottom = self.region
+            return round(left * width), round(top * height), round(right * width), round(bottom * height)
+        if self.mode != 'auto':
+            return None
+
+        size = image.size
+        with self._lock:
+            if size in self._learned:
+                return self._learned[size]
+
+        box = self.detect_panel(image)
+
+        with self._lock:
+            if size in self._learned:
+                return self._learned[size]
+            samples = self._samples.setdefault(size, [])
+            samples.append(box)
+            if len(samples) < self.LEARN_SAMPLES:
+                return self._pad(box, size)
+
+            # 取各边的中位数作为该分辨率的面板位置
+            detected = [sample for sample in samples if sample is not None]
+            learned = None
+            if detected:
+                learned = self._pad(tuple(int(value) for value in np.median(np.array(detected), axis=0)), size)
+            self._learned[size] = learned
+            del self._samples[size]
+            return learned
+
+    def _pad(self, box, size):
+        """按padding向外扩展面板区域"""
+        if box is None:
+            return None
+        width, height = size
+        pad_x = round(self.padding * width)
+        pad_y = round(self.padding * height)
+        left, top, right, bottom = box
+        return max(0, left - pad_x), max(0, top - pad_y), min(width, right + pad_x), min(height, bottom + pad_y)
+
+    def crop(self, image):
+        """把截图裁剪到面板区域
+
+        Args:
+            image (PIL.Image.Image): 截图
+
+        Returns:
+            PIL.Image.Image: 裁剪后的图片，不需要裁剪或检测失败时返回原图
+        """
+        box = self.get_crop_box(image)
+        if box is None or box == (0, 0, image.width, image.height):
+            return image
+        return image.crop(box)
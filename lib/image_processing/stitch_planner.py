@@ -0,0 +1,185 @@
+import os
+
+
+class StitchItem:
+    """待拼接的一张源图片"""
+
+    __slots__ = ('file_path', 'width', 'height', 'crop_box', 'estimated_bytes')
+
+    def __init__(self, file_path, width, height, crop_box=None, estimated_bytes=0):
+        """初始化待拼接图片
+
+        Args:
+            file_path (str): 源图片路径
+            width (int): 裁剪后的宽度(像素)
+            height (int): 裁剪后的高度(像素)
+            crop_box (tuple): 源图片中的裁剪区域(左, 上, 右, 下)，None表示不裁剪
+            estimated_bytes (int): 编码后数据量的估计值(字节)
+        """
+        self.file_path = file_path
+        self.width = width
+        self.height = height
+        self.crop_box = crop_box
+        self.estimated_bytes = estimated_bytes
+
+
+class Placement:
+    """源图片在画布中的位置"""
+
+    __slots__ = ('file_path', 'crop_box', 'x', 'y', 'width', 'height')
+
+    def __init__(self, item, x, y):
+        self.file_path = item.file_path
+        self.crop_box = item.crop_box
+        self.x = x
+        self.y = y
+        self.width = item.width
+        self.height = item.height
+
+    def to_dict(self):
+        """转换为布局表中的条目
+
+        Returns:
+            dict: 包含file_name、x、y、width、height和crop_box的字典
+        """
+        return {
+            'file_name': os.path.basename(self.file_path),
+            'x': self.x,
+            'y': self.y,
+            'width': self.width,
+            'height': self.height,
+            'crop_box': self.crop_box
+        }
+
+
+class CanvasPlan:
+    """一张拼接画布的布局表，记录每张源图片的位置"""
+
+    def __init__(self):
+        self.placements = []
+        self.width = 0
+        self.height = 0
+        self.estimated_bytes = 0
+
+    @property
+    def file_paths(self):
+        """画布中所有源图片的路径，按放置顺序排列"""
+        return [placement.file_path for placement in self.placements]
+
+    @property
+    def name(self):
+        """画布的名称，单张图片时为文件名，多张图片时为stitched_首张_末张.png"""
+        if len(self.placements) == 1:
+            return os.path.basename(self.placements[0].file_path)
+        first = os.path.basename(self.placements[0].file_path).split('.')[0]
+        last = os.path.basename(self.placements[-1].file_path).split('.')[0]
+        return f'stitched_{first}_{last}.png'
+
+    def needs_render(self):
+        """是否需要重新绘制画布，单张未裁剪的图片可以直接使用原文件
+
+        Returns:
+            bool: 需要绘制时返回True
+        """
+        return len(self.placements) != 1 or self.placements[0].crop_box is not None
+
+    def get_layout(self):
+        """获取布局表
+
+        Returns:
+            list: 每张源图片的位置字典，按放置顺序排列
+        """
+        return [placement.to_dict() for placement in self.placements]
+
+    def _add(self, item, x, y):
+        self.placements.append(Placement(item, x, y))
+        self.width = max(self.width, x + item.width)
+        self.height = max(self.height, y + item.height)
+        self.estimated_bytes += item.estimated_bytes
+
+
+class StitchPlanner:
+    """拼接规划器，按OCR模块的尺寸和数据量限制把源图片装入尽量少的画布
+
+    使用按顺序装填的货架(shelf)算法：图片从左到右放在当前货架上，
+    放不下时在下方开一个新货架，画布的高度、宽度、数据量或图片数量达到上限时开启新画布。
+    源图片的顺序在画布内和画布之间都保持不变。
+
+    max_columns为1时每个货架只放一张图片，即纵向拼接。多列拼接会让不同截图的文字
+    处于同一行，只有能按坐标把识别结果拆回各个源图片时才应该使用，此时max_columns为0
+    表示只受画布宽度限制。
+    """
+
+    def __init__(self, max_width, max_height, max_bytes=0, max_columns=1, max_images=0):
+        """初始化规划器
+
+        Args:
+            max_width (int): 画布最大宽度(像素)，0表示不限制
+            max_height (int): 画布最大高度(像素)，0表示不限制
+            max_bytes (int): 画布编码后的最大数据量估计值(字节)，0表示不限制
+            max_columns (int): 每个货架最多放置的图片数量，0表示不限制
+            max_images (int): 每张画布最多包含的图片数量，0表示不限制
+        """
+        self.max_width = max(0, int(max_width))
+        self.max_height = max(0, int(max_height))
+        self.max_bytes = max(0, int(max_bytes))
+        self.max_columns = max(0, int(max_columns))
+        self.max_images = max(0, int(max_images))
+
+    def _fits(self, limit, value):
+        return not limit or value <= limit
+
+    def plan(self, items):
+        """规划画布
+
+        Args:
+            items (iterable): 按处理顺序排列的StitchItem
+
+        Returns:
+            list: CanvasPlan列表，超过限制或尺寸未知的单张图片单独成为一张画布
+        """
+        canvases = []
+        canvas = None
+        shelf_x = shelf_y = shelf_height = shelf_count = 0
+
+        for item in items:
+            # 尺寸未知(无法读取)或单张就超过限制的图片单独成为一张画布，后面的图片也从新画布开始
+            if (item.width <= 0 or item.height <= 0
+                    or not self._fits(self.max_width, item.width)
+                    or not self._fits(self.max_height, item.height)
+                    or not self._fits(self.max_bytes, item.estimated_bytes)):
+                isolated = CanvasPlan()
+                isolated._add(item, 0, 0)
+                canvases.append(isolated)
+                canvas = None
+                continue
+
+            if canvas is not None:
+                full = (
+                    (self.max_images and len(canvas.placements) >= self.max_images)
+                    or not self._fits(self.max_bytes, canvas.estimated_bytes + item.estimated_bytes)
+                )
+                if not full:
+                    # 优先放在当前货架的右侧
+                    if ((not self.max_columns or shelf_count < self.max_columns)
+                            and self._fits(self.max_width, shelf_x + item.width)
+                            and self._fits(self.max_height, shelf_y + max(shelf_height, item.height))):
+                        canvas._add(item, shelf_x, shelf_y)
+                        shelf_x += item.width
+                        shelf_height = max(shelf_height, item.height)
+                        shelf_count += 1
+                        continue
+                    # 在当前货架下方开新货架
+                    next_y = shelf_y + shelf_height
+                    if self._fits(self.max_width, item.width) and self._fits(self.max_height, next_y + item.height):
+                        canvas._add(item, 0, next_y)
+                        shelf_x, shelf_y, shelf_height, shelf_count = item.width, next_y, item.height, 1
+                        continue
+
+            # 开启新画布
+            canvas = CanvasPlan()
+            canvases.append(canvas)
+            canvas._add(item, 0, 0)
+            shelf_x, shelf_y, shelf_height, shelf_count = item.width, 0, item.height, 1
+
+        return canvases
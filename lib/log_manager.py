@@ -0,0 +1,153 @@
+import sys
+import atexit
+import threading
+
+
+class LogManager:
+    """分级的控制台输出管理器，单例模式
+
+    所有控制台输出按级别过滤，低于当前级别的消息直接丢弃，不会格式化。
+    消息模板和参数分开传入，只有需要输出时才调用format，例如:
+        LogManager.debug(LangManager.get_lang('image_line_content'), file_name, line)
+    计算参数本身开销较大(例如序列化整个配置)时，先用is_enabled检查级别。
+
+    输出先写入缓冲区，缓冲的行数达到MAX_BUFFERED_LINES、写入警告或错误消息以及调用flush时
+    一次性写到标准输出，避免在Windows控制台和SSH连接上逐行输出的开销。
+    其余消息最多在缓冲区中停留FLUSH_INTERVAL秒，等待OCR请求时也会按时写出。进程退出时会写出剩余的内容。
+    """
+    _instance = None
+
+    DEBUG = 10
+    INFO = 20
+    PROGRESS = 25
+    WARNING = 30
+    ERROR = 40
+
+    # LOG_LEVEL配置对应的最低输出级别
+    MODES = {
+        'debug': DEBUG,
+        'info': INFO,
+        'progress': PROGRESS,
+        'quiet': ERROR
+    }
+
+    MAX_BUFFERED_LINES = 200
+    FLUSH_INTERVAL = 0.5
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(LogManager, cls).__new__(cls)
+            cls._instance.level = cls.INFO
+            cls._instance._lock = threading.Lock()
+            cls._instance._buffer = []
+            cls._instance._timer = None
+            atexit.register(cls.flush)
+        return cls._instance
+
+    @classmethod
+    def get_instance(cls):
+        """获取输出管理器单例实例
+
+        Returns:
+            LogManager: 输出管理器实例
+        """
+        return cls()
+
+    @classmethod
+    def set_mode(cls, mode):
+        """按LOG_LEVEL配置设置最低输出级别
+
+        Args:
+            mode (str): debug输出所有消息(包括每一行识别结果)，info为默认的输出，
+                progress只输出处理进度、统计、警告和错误，quiet只输出错误
+        """
+        cls().level = cls.MODES.get(str(mode).lower(), cls.INFO)
+
+    @classmethod
+    def is_enabled(cls, level):
+        """是否会输出该级别的消息
+
+        Args:
+            level (int): 消息级别
+
+        Returns:
+            bool: 会输出时返回True
+        """
+        return level >= cls().level
+
+    @classmethod
+    def log(cls, level, message, *args):
+        """输出一条消息
+
+        Args:
+            level (int): 消息级别
+            message (str): 消息文本，有参数时作为format的模板
+            *args: 模板参数，只在消息需要输出时格式化
+        """
+        instance = cls()
+        if level < instance.level:
+            return
+        if args:
+            message = message.format(*args)
+        with instance._lock:
+            instance._buffer.append(message)
+            if level >= cls.WARNING or len(instance._buffer) >= cls.MAX_BUFFERED_LINES:
+                instance._write()
+            elif instance._timer is None:
+                # 缓冲区中第一条消息写入后开始计时，到时写出这段时间内的所有消息
+                instance._timer = threading.Timer(cls.FLUSH_INTERVAL, cls.flush)
+                instance._timer.daemon = True
+                instance._timer.start()
+
+    @classmethod
+    def debug(cls, message, *args):
+        """输出调试消息，例如每一行识别结果，只在debug级别输出"""
+        cls.log(cls.DEBUG, message, *args)
+
+    @classmethod
+    def info(cls, message, *args):
+        """输出一般消息"""
+        cls.log(cls.INFO, message, *args)
+
+    @classmethod
+    def progress(cls, message, *args):
+        """输出处理进度和统计消息，progress级别下仍会输出"""
+        cls.log(cls.PROGRESS, message, *args)
+
+    @classmethod
+    def warning(cls, message, *args):
+        """输出警告消息，立即写出缓冲区"""
+        cls.log(cls.WARNING, message, *args)
+
+    @classmethod
+    def error(cls, message, *args):
+        """输出错误消息，立即写出缓冲区，quiet级别下仍会输出"""
+        cls.log(cls.ERROR, message, *args)
+
+    @classmethod
+    def flush(cls):
+        """立即把缓冲区中的消息写到标准输出"""
+        instance = cls._instance
+        if instance is None:
+            return
+        with instance._lock:
+            instance._write()
+
+    def _write(self):
+        """写出缓冲区，调用时需持有锁"""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._buffer:
+            return
+        text = '\n'.join(self._buffer) + '\n'
+        self._buffer = []
+        stream = sys.stdout
+        if stream is None:
+            return
+        try:
+            stream.write(text)
+            stream.flush()
+        except (OSError, ValueError):
+            # 标准输出已关闭(例如进程退出时管道被关闭)，丢弃剩余的消息
+            pass
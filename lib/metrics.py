@@ -0,0 +1,220 @@
+import json
+import time
+import threading
+from lang_manager import LangManager
+
+
+class _NullTimer:
+    """未启用指标时使用的空计时器，所有阶段共用同一个实例"""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class _StageTimer:
+    """统计一个阶段耗时的计时器，退出时把单调时钟经过的时间计入该阶段"""
+
+    __slots__ = ('_metrics', '_stage', '_start')
+
+    def __init__(self, metrics, stage):
+        self._metrics = metrics
+        self._stage = stage
+        self._start = 0.0
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._metrics._add_time(self._stage, time.perf_counter() - self._start)
+        return False
+
+
+class PipelineMetrics:
+    """处理流程的分阶段计时器和计数器，单例模式
+
+    各阶段(解码、拼接、编码、OCR请求、文本处理、写入文件等)用timer计时，
+    上传字节数、像素数、重试次数等用count累加，处理结束后写入调试信息文件和<目录名>_metrics.json。
+    多个线程并发执行的阶段，耗时为各线程耗时之和，可能超过总耗时。
+
+    未启用时timer返回共享的空计时器，add_time和count只检查一次enabled就返回，几乎没有开销。
+    工作进程中的拼接和编码耗时随拼接结果返回主进程后再计入，见render_canvas。
+    """
+    _instance = None
+
+    # 输出时各阶段的顺序，未列出的阶段排在后面
+    STAGES = (
+        'scan', 'dedupe', 'plan', 'decode', 'stitch', 'encode', 'render_wait',
+        'cache_lookup', 'rate_limit_wait', 'ocr_request', 'job_poll_wait', 'retry_wait',
+        'process_text', 'journal', 'write_output'
+    )
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(PipelineMetrics, cls).__new__(cls)
+            cls._instance.enabled = False
+            cls._instance._lock = threading.Lock()
+            cls._instance._stages = {}
+            cls._instance._counters = {}
+            cls._instance._start = time.perf_counter()
+        return cls._instance
+
+    @classmethod
+    def get_instance(cls):
+        """获取指标单例实例
+
+        Returns:
+            PipelineMetrics: 指标实例
+        """
+        return cls()
+
+    @classmethod
+    def enable(cls, enabled=True):
+        """启用或停用指标统计
+
+        Args:
+            enabled (bool): 是否统计
+        """
+        cls().enabled = bool(enabled)
+
+    @classmethod
+    def is_enabled(cls):
+        """是否正在统计指标，需要额外计算(例如读取文件大小)的指标应先检查
+
+        Returns:
+            bool: 已启用时返回True
+        """
+        instance = cls._instance
+        return instance is not None and instance.enabled
+
+    @classmethod
+    def reset(cls):
+        """清空已统计的指标，并从现在开始计算总耗时"""
+        instance = cls()
+        with instance._lock:
+            instance._stages = {}
+            instance._counters = {}
+            instance._start = time.perf_counter()
+
+    @classmethod
+    def timer(cls, stage):
+        """获取统计一个阶段耗时的计时器，用法为with PipelineMetrics.timer('encode'): ...
+
+        Args:
+            stage (str): 阶段名称
+
+        Returns:
+            上下文管理器，未启用时为不计时的空计时器
+        """
+        instance = cls._instance
+        if instance is None or not instance.enabled:
+            return _NULL_TIMER
+        return _StageTimer(instance, stage)
+
+    @classmethod
+    def add_time(cls, stage, seconds):
+        """把在别处测得的耗时(例如工作进程中的耗时或休眠时间)计入一个阶段
+
+        Args:
+            stage (str): 阶段名称
+            seconds (float): 耗时(秒)
+        """
+        instance = cls._instance
+        if instance is None or not instance.enabled:
+            return
+        instance._add_time(stage, seconds)
+
+    @classmethod
+    def count(cls, name, value=1):
+        """累加一个计数器
+
+        Args:
+            name (str): 计数器名称
+            value (int): 增加的数量
+        """
+        instance = cls._instance
+        if instance is None or not instance.enabled:
+            return
+        with instance._lock:
+            instance._counters[name] = instance._counters.get(name, 0) + value
+
+    def _add_time(self, stage, seconds):
+        with self._lock:
+            entry = self._stages.get(stage)
+            if entry is None:
+                # [次数, 总耗时, 最长耗时]
+                entry = self._stages[stage] = [0, 0.0, 0.0]
+            entry[0] += 1
+            entry[1] += seconds
+            if seconds > entry[2]:
+                entry[2] = seconds
+
+    @classmethod
+    def snapshot(cls):
+        """获取当前统计的指标
+
+        Returns:
+            dict: 包含elapsed(从reset开始的总耗时)、stages(阶段名 -> calls、total、mean、max)
+                和counters(计数器名 -> 数值)
+        """
+        instance = cls()
+        with instance._lock:
+            stages = {name: list(entry) for name, entry in instance._stages.items()}
+            counters = dict(instance._counters)
+            elapsed = time.perf_counter() - instance._start
+
+        order = {name: index for index, name in enumerate(cls.STAGES)}
+        names = sorted(stages, key=lambda name: (order.get(name, len(order)), name))
+        return {
+            'elapsed': round(elapsed, 4),
+            'stages': {
+                name: {
+                    'calls': stages[name][0],
+                    'total': round(stages[name][1], 4),
+                    'mean': round(stages[name][1] / stages[name][0], 4) if stages[name][0] else 0.0,
+                    'max': round(stages[name][2], 4)
+                }
+                for name in names
+            },
+            'counters': dict(sorted(counters.items()))
+        }
+
+    @classmethod
+    def format_report(cls):
+        """把当前统计的指标格式化为写入调试信息文件的文本
+
+        Returns:
+            str: 分阶段耗时和计数器的文本
+        """
+        snapshot = cls.snapshot()
+        lines = [LangManager.get_lang('metrics_report_header').format(snapshot['elapsed'])]
+        for name, stage in snapshot['stages'].items():
+            lines.append(LangManager.get_lang('metrics_stage_line').format(
+                name, stage['calls'], stage['total'], stage['mean'], stage['max']
+            ))
+        if snapshot['counters']:
+            lines.append(LangManager.get_lang('metrics_counters_header'))
+            for name, value in snapshot['counters'].items():
+                lines.append(f'{name}: {value}\n')
+        return ''.join(lines)
+
+    @classmethod
+    def write_json(cls, path, extra=None):
+        """把当前统计的指标写入JSON文件
+
+        Args:
+            path (str): 文件路径
+            extra (dict): 一起写入的其他字段，例如处理目录和图片数量
+        """
+        data = dict(extra or {})
+        data.update(cls.snapshot())
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
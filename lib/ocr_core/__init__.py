@@ -2,9 +2,18 @@
 from .ocr_module import OCRModule 
 from .ocr_module_interface import OCRModuleInterface
 from .ocr_module_bootstraper import OCRModuleBootstraper
+from .rate_limiter import RateLimiter, QuotaExhaustedError
+from .ocr_dispatcher import OCRDispatcher
+from .ocr_image import OCRImage
+from .ocr_cache import OCRCache
 
 __all__ = [
     'OCRModule',
     'OCRModuleInterface',
     'OCRModuleBootstraper',
+    'RateLimiter',
+    'QuotaExhaustedError',
+    'OCRDispatcher',
+    'OCRImage',
+    'OCRCache',
 ]
\ No newline at end of file
@@ -0,0 +1,164 @@
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+
+
+class OCRCache:
+    """基于SQLite的OCR识别结果缓存
+
+    以上传的图片数据、OCR模块名称、识别选项和识别语言的哈希作为键，
+    保存识别文本和对应的调试信息条目。同一张图片在相同设置下再次识别时直接返回缓存结果，
+    不占用接口额度，修改开始/停止标记后重新处理同一目录只需要几秒钟。
+    键取决于编码后的上传数据，拼接、裁剪和编码方式改变后上传的数据不同，之前的结果不会命中。
+
+    缓存总大小超过max_bytes时按最近访问时间淘汰最旧的条目。
+    所有方法都是线程安全的，可以在并发识别的工作线程中直接调用。
+    """
+
+    # 每次淘汰时最多读取的条目数
+    EVICTION_BATCH = 64
+
+    def __init__(self, db_path, max_bytes=256 * 1024 * 1024, clock=time.time):
+        """打开或创建缓存数据库
+
+        Args:
+            db_path (str): SQLite数据库文件路径，所在目录不存在时自动创建
+            max_bytes (int): 缓存条目的最大总大小(字节)，0表示不限制
+            clock (callable): 返回当前时间的函数，用于记录最近访问时间
+        """
+        self.db_path = db_path
+        self.max_bytes = max(0, int(max_bytes))
+        self._clock = clock
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS ocr_cache ('
+            'key TEXT PRIMARY KEY, '
+            'text TEXT NOT NULL, '
+            'debug_entry TEXT NOT NULL, '
+            'size INTEGER NOT NULL, '
+            'last_access REAL NOT NULL)'
+        )
+        self._conn.execute('CREATE INDEX IF NOT EXISTS idx_ocr_cache_last_access ON ocr_cache (last_access)')
+        self._conn.commit()
+        self._total_size = self._conn.execute('SELECT COALESCE(SUM(size), 0) FROM ocr_cache').fetchone()[0]
+
+        # 统计信息
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evictions = 0
+
+    @staticmethod
+    def make_key(image_data, module_name, options, language):
+        """计算缓存键
+
+        Args:
+            image_data (bytes): 上传给OCR接口的图片数据
+            module_name (str): OCR模块名称
+            options (dict): 影响识别结果的模块选项
+            language (str): OCR识别语言
+
+        Returns:
+            str: 十六进制的SHA-256摘要
+        """
+        digest = hashlib.sha256()
+        digest.update(image_data)
+        settings = json.dumps([module_name, options or {}, language], sort_keys=True, ensure_ascii=False, default=str)
+        digest.update(b'\0')
+        digest.update(settings.encode('utf-8'))
+        return digest.hexdigest()
+
+    def get(self, key):
+        """查询缓存
+
+        Args:
+            key (str): 缓存键
+
+        Returns:
+            tuple or None: 命中时返回(识别文本, 调试信息条目)，未命中时返回None
+        """
+        with self._lock:
+            row = self._conn.execute('SELECT text, debug_entry FROM ocr_cache WHERE key = ?', (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self._conn.execute('UPDATE ocr_cache SET last_access = ? WHERE key = ?', (self._clock(), key))
+            self._conn.commit()
+            self.hits += 1
+            return row[0], row[1]
+
+    def put(self, key, text, debug_entry=''):
+        """写入缓存，必要时淘汰最久未访问的条目
+
+        Args:
+            key (str): 缓存键
+            text (str): 识别文本
+            debug_entry (str): 识别时的调试信息条目
+        """
+        debug_entry = debug_entry or ''
+        size = len(text.encode('utf-8')) + len(debug_entry.encode('utf-8'))
+        with self._lock:
+            old = self._conn.execute('SELECT size FROM ocr_cache WHERE key = ?', (key,)).fetchone()
+            self._conn.execute(
+                'INSERT OR REPLACE INTO ocr_cache (key, text, debug_entry, size, last_access) VALUES (?, ?, ?, ?, ?)',
+                (key, text, debug_entry, size, self._clock())
+            )
+            self._total_size += size - (old[0] if old else 0)
+            self.writes += 1
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self):
+        """淘汰最久未访问的条目直到总大小不超过限制，调用方需持有锁"""
+        if not self.max_bytes:
+            return
+        while self._total_size > self.max_bytes:
+            rows = self._conn.execute(
+                'SELECT key, size FROM ocr_cache ORDER BY last_access LIMIT ?', (self.EVICTION_BATCH,)
+            ).fetchall()
+            if not rows:
+                self._total_size = 0
+                return
+            for key, size in rows:
+                if self._total_size <= self.max_bytes:
+                    return
+                self._conn.execute('DELETE FROM ocr_cache WHERE key = ?', (key,))
+                self._total_size -= size
+                self.evictions += 1
+
+    def get_statistics(self):
+        """获取缓存统计信息
+
+        Returns:
+            dict: 包含hits、misses、writes、evictions、entries和total_bytes的字典
+        """
+        with self._lock:
+            entries = self._conn.execute('SELECT COUNT(*) FROM ocr_cache').fetchone()[0]
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'writes': self.writes,
+                'evictions': self.evictions,
+                'entries': entries,
+                'total_bytes': self._total_size
+            }
+
+    def clear(self):
+        """清空缓存中的所有条目"""
+        with self._lock:
+            self._conn.execute('DELETE FROM ocr_cache')
+            self._conn.commit()
+            self._total_size = 0
+
+    def close(self):
+        """关闭数据库连接"""
+        with self._lock:
+            self._conn.close()
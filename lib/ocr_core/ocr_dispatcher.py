@@ -0,0 +1,97 @@
+import asyncio
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+
+class OCRDispatcher:
+    """OCR任务分发器，以有界并发执行识别任务并按提交顺序返回结果
+
+    OCR接口的网络延迟远大于本地处理时间，同时保持多个请求在途可以显著缩短总耗时。
+    在途请求数由max_in_flight限制，实际的QPS由OCRModule共享的RateLimiter控制。
+    支持线程池(map_ordered)和事件循环(map_ordered_async)两种执行方式，
+    后者每个在途请求只占用一个协程，适合同时保持大量请求在途。
+    """
+
+    def __init__(self, max_in_flight=1):
+        """初始化分发器
+
+        Args:
+            max_in_flight (int): 同时在途的最大任务数，小于等于1时串行执行
+        """
+        self.max_in_flight = max(1, int(max_in_flight))
+
+    def map_ordered(self, func, items):
+        """并发地对每个任务调用func，并按items的原始顺序逐个产出结果
+
+        最早提交的任务完成后才会产出下一个结果，同时补充新的任务，
+        因此在途任务数始终不超过max_in_flight，内存占用也保持有界。
+
+        Args:
+            func (callable): 任务函数，接收单个任务参数，应自行处理可预期的异常
+            items (iterable): 任务参数序列
+
+        Yields:
+            tuple: (任务参数, 任务结果)
+        """
+        if self.max_in_flight <= 1:
+            for item in items:
+                yield item, func(item)
+            return
+
+        with ThreadPoolExecutor(max_workers=self.max_in_flight) as executor:
+            pending = deque()
+            for item in items:
+                pending.append((item, executor.submit(func, item)))
+                if len(pending) >= self.max_in_flight:
+                    head_item, head_future = pending.popleft()
+                    yield head_item, head_future.result()
+            while pending:
+                head_item, head_future = pending.popleft()
+                yield head_item, head_future.result()
+
+    def map_ordered_async(self, coro_func, items):
+        """在独立的事件循环中并发执行协程任务，并按items的原始顺序逐个产出结果
+
+        调用方仍以普通的for循环消费结果，每取一个结果事件循环就运行到该结果完成为止，
+        其他在途任务也会同时推进。协程中通过run_in_executor执行的阻塞操作
+        使用独立的线程池，线程数不超过max_in_flight且最多32个。
+
+        Args:
+            coro_func (callable): 协程函数，接收单个任务参数，应自行处理可预期的异常
+            items (iterable): 任务参数序列
+
+        Yields:
+            tuple: (任务参数, 任务结果)
+        """
+        loop = asyncio.new_event_loop()
+        executor = ThreadPoolExecutor(max_workers=min(32, self.max_in_flight))
+        loop.set_default_executor(executor)
+        results = self._map_ordered_async(coro_func, items)
+        try:
+            while True:
+                try:
+                    yield loop.run_until_complete(results.__anext__())
+                except StopAsyncIteration:
+                    break
+        finally:
+            loop.run_until_complete(results.aclose())
+            loop.close()
+            executor.shutdown(wait=True)
+
+    async def _map_ordered_async(self, coro_func, items):
+        pending = deque()
+        try:
+            for item in items:
+                pending.append((item, asyncio.ensure_future(coro_func(item))))
+                if len(pending) >= self.max_in_flight:
+                    head_item, head_task = pending.popleft()
+                    yield head_item, await head_task
+            while pending:
+                head_item, head_task = pending.popleft()
+                yield head_item, await head_task
+        finally:
+            # 提前结束时取消剩余的在途任务
+            for _, task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*(task for _, task in pending), return_exceptions=True)
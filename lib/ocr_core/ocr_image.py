@@ -0,0 +1,143 @@
+import io
+import os
+from PIL import Image
+
+
+class OCRImage:
+    """内存中的待识别图片
+
+    保存已编码的图片数据、显示用的名称和像素尺寸，
+    拼接后的图片直接以OCRImage的形式交给OCR模块，不需要先写入临时文件再读回。
+    OCR模块的识别方法同时接受文件路径、bytes和OCRImage，
+    可以用read_image_bytes和get_image_name统一处理这三种输入。
+    """
+
+    def __init__(self, name, data, size, layout=None):
+        """初始化内存图片
+
+        Args:
+            name (str): 图片名称，用于日志、结果和调试信息中显示
+            data (bytes): 已编码的图片数据(PNG、JPEG等)
+            size (tuple): 图片的像素尺寸(宽, 高)
+            layout (list): 拼接图片的布局表，每个元素记录一张源图片在画布中的位置，
+                格式见CanvasPlan.get_layout，非拼接图片为None
+        """
+        self.name = name
+        self.data = data
+        self.size = tuple(size)
+        self.layout = layout
+
+    @classmethod
+    def from_pil(cls, image, name, format='PNG', layout=None, **save_options):
+        """把PIL图片编码为内存中的OCRImage
+
+        Args:
+            image (PIL.Image.Image): 待编码的图片
+            name (str): 图片名称
+            format (str): 编码格式，传给PIL的save方法
+            layout (list): 拼接图片的布局表
+            **save_options: 传给PIL的save方法的其他编码参数
+
+        Returns:
+            OCRImage: 内存图片
+        """
+        buffer = io.BytesIO()
+        image.save(buffer, format=format, **save_options)
+        return cls(name, buffer.getvalue(), image.size, layout)
+
+    @classmethod
+    def from_file(cls, file_path):
+        """从图片文件创建OCRImage
+
+        Args:
+            file_path (str): 图片文件路径
+
+        Returns:
+            OCRImage: 内存图片，名称为文件名
+        """
+        with open(file_path, 'rb') as f:
+            data = f.read()
+        with Image.open(io.BytesIO(data)) as img:
+            size = img.size
+        return cls(os.path.basename(file_path), data, size)
+
+    def open(self):
+        """以PIL图片的形式打开
+
+        Returns:
+            PIL.Image.Image: 从内存数据解码的图片
+        """
+        return Image.open(io.BytesIO(self.data))
+
+    def __len__(self):
+        return len(self.data)
+
+    def __str__(self):
+        return self.name
+
+    def __repr__(self):
+        return f'OCRImage({self.name!r}, {len(self.data)} bytes, {self.size[0]}x{self.size[1]})'
+
+
+def read_image_bytes(image):
+    """获取待识别图片的编码数据
+
+    Args:
+        image (str or bytes or OCRImage): 图片文件路径、编码数据或内存图片
+
+    Returns:
+        bytes: 图片的编码数据
+    """
+    if isinstance(image, OCRImage):
+        return image.data
+    if isinstance(image, (bytes, bytearray)):
+        return bytes(image)
+    with open(image, 'rb') as f:
+        return f.read()
+
+
+def get_image_name(image):
+    """获取待识别图片的显示名称
+
+    Args:
+        image (str or bytes or OCRImage): 图片文件路径、编码数据或内存图片
+
+    Returns:
+        str: 文件路径返回文件名，内存图片返回其名称，bytes返回空字符串
+    """
+    if isinstance(image, OCRImage):
+        return image.name
+    if isinstance(image, (bytes, bytearray)):
+        return ''
+    return os.path.basename(image)
+
+
+def get_image_size(image):
+    """获取待识别图片的像素尺寸，文件只读取图片头不解码像素
+
+    Args:
+        image (str or bytes or OCRImage): 图片文件路径、编码数据或内存图片
+
+    Returns:
+        tuple: (宽, 高)
+    """
+    if isinstance(image, OCRImage):
+        return image.size
+    if isinstance(image, (bytes, bytearray)):
+        image = io.BytesIO(image)
+    with Image.open(image) as img:
+        return img.size
+
+
+def get_image_byte_size(image):
+    """获取待识别图片编码数据的字节数，文件只读取文件大小
+
+    Args:
+        image (str or bytes or OCRImage): 图片文件路径、编码数据或内存图片
+
+    Returns:
+        int: 字节数
+    """
+    if isinstance(image, (OCRImage, bytes, bytearray)):
+        return len(image)
+    return os.path.getsize(image)
@@ -1,13 +1,26 @@
 import os
+import json
+import time
+import sqlite3
+import asyncio
+import threading
 
 from lang_manager import LangManager
+from log_manager import LogManager
 from config.config_manager import ConfigManager
 from .ocr_module_interface import OCRModuleInterface
+from .rate_limiter import RateLimiter, QuotaExhaustedError
+from .ocr_cache import OCRCache
+from .ocr_image import read_image_bytes, get_image_byte_size
+from metrics import PipelineMetrics
 
 # 默认OCR模块名称
 DEFAULT_MODULE_NAME = 'baidu'
 
 class OCRModule:
+    # 异步任务模式下等待单个任务结果的最长时间(秒)
+    JOB_TIMEOUT = 600
+
     # 单例实例
     _instance = None
     # 模块注册表，合并自OCRModuleRegistry
@@ -19,6 +32,13 @@ class OCRModule:
             # 初始化实例属性
             cls._instance.module_name = module_name
             cls._instance.module_impl = None
+            cls._instance.rate_limiter = None
+            cls._instance._rate_limiter_lock = threading.Lock()
+            cls._instance.cache = None
+            cls._instance._cache_loaded = False
+            cls._instance._cache_lock = threading.Lock()
+            # 上一次识别是否命中缓存等状态按线程保存
+            cls._instance._local = threading.local()
             cls._instance._load_module_impl()
         return cls._instance
 
@@ -109,7 +129,7 @@ class OCRModule:
             module_class = self.get_module(ConfigManager.get('OCR_MODULE', DEFAULT_MODULE_NAME))
             self.module_impl = module_class()
         except ValueError as e:
-            print(LangManager.get_lang('ocr_module_load_fail').format(ConfigManager.get('OCR_MODULE', DEFAULT_MODULE_NAME), str(e)))
+            LogManager.error(LangManager.get_lang('ocr_module_load_fail'), ConfigManager.get('OCR_MODULE', DEFAULT_MODULE_NAME), str(e))
             self.module_impl = None
 
     def init_ocr_client(self):
@@ -125,15 +145,322 @@ class OCRModule:
     def recognize_text(self, image_path):
         """识别图片中的文本
 
+        依次查询结果缓存、获取请求配额，再交给OCR模块识别，
+        模块支持异步任务模式时提交任务并轮询结果。识别成功的结果会写入缓存。
+
+        Args:
+            image_path (str or bytes or OCRImage): 图片文件路径、编码数据或内存图片
+
+        Returns:
+            str: 识别出的文本，模块未加载或识别失败时返回None
+
+        Raises:
+            QuotaExhaustedError: 缓存未命中且OCR接口的每日额度已用尽
+        """
+        if self.module_impl is None:
+            return None
+
+        with PipelineMetrics.timer('cache_lookup'):
+            cache_key = self._get_cache_key(image_path)
+            cached = self._lookup_cache(cache_key)
+        if cached is not None:
+            self._local.cached_debug_entry = cached[1]
+            return cached[0]
+        self._local.cached_debug_entry = None
+
+        self._wait_for_request_slot()
+        self._record_request([image_path])
+        with PipelineMetrics.timer('ocr_request'):
+            if self.module_impl.supports_async_jobs():
+                text = self._run_job(image_path)
+            else:
+                text = self.module_impl.recognize_text(image_path)
+        if not text:
+            PipelineMetrics.count('ocr_failures')
+
+        self._store_cache(cache_key, text)
+        return text
+
+    def _record_request(self, image_paths):
+        """把一次OCR请求和上传的字节数计入指标
+
+        Args:
+            image_paths (list): 本次请求上传的图片
+        """
+        if not PipelineMetrics.is_enabled():
+            return
+        PipelineMetrics.count('ocr_calls')
+        PipelineMetrics.count('ocr_images', len(image_paths))
+        try:
+            PipelineMetrics.count('bytes_uploaded', sum(get_image_byte_size(image_path) for image_path in image_paths))
+        except OSError:
+            pass
+
+    def _run_job(self, image_path):
+        """以异步任务模式识别图片：提交任务后按模块声明的间隔轮询结果
+
+        Args:
+            image_path (str or bytes or OCRImage): 图片文件路径、编码数据或内存图片
+
+        Returns:
+            str: 识别出的文本，提交失败、任务失败或超时时返回None
+        """
+        job_id = self.module_impl.submit_job(image_path)
+        if job_id is None:
+            return None
+
+        poll_interval = max(0.0, float(self.module_impl.get_job_poll_interval()))
+        deadline = time.monotonic() + self.JOB_TIMEOUT
+        while True:
+            done, text = self.module_impl.poll_job(job_id)
+            if done:
+                return text
+            if time.monotonic() + poll_interval > deadline:
+                LogManager.warning(LangManager.get_lang('ocr_job_timeout'), image_path, self.JOB_TIMEOUT)
+                return None
+            time.sleep(poll_interval)
+            PipelineMetrics.add_time('job_poll_wait', poll_interval)
+
+    def supports_native_async(self):
+        """OCR模块是否提供原生的异步识别实现
+
+        Returns:
+            bool: 模块提供原生异步实现时返回True，模块未加载时返回False
+        """
+        if self.module_impl is None:
+            return False
+        return self.module_impl.supports_native_async()
+
+    async def recognize_text_async(self, image_path):
+        """异步识别图片中的文本，缓存和请求配额的处理与recognize_text相同
+
         Args:
-            image_path (str): 图片文件路径
+            image_path (str or bytes or OCRImage): 图片文件路径、编码数据或内存图片
 
         Returns:
             str: 识别出的文本，模块未加载或识别失败时返回None
+
+        Raises:
+            QuotaExhaustedError: 缓存未命中且OCR接口的每日额度已用尽
+        """
+        if self.module_impl is None:
+            return None
+
+        # 读取和哈希图片数据交给线程池，避免阻塞事件循环
+        loop = asyncio.get_event_loop()
+        cache_key = None
+        with PipelineMetrics.timer('cache_lookup'):
+            if self.get_cache() is not None:
+                cache_key = await loop.run_in_executor(None, self._get_cache_key, image_path)
+            cached = self._lookup_cache(cache_key)
+        if cached is not None:
+            self._local.cached_debug_entry = cached[1]
+            return cached[0]
+
+        await self._wait_for_request_slot_async()
+        self._record_request([image_path])
+        with PipelineMetrics.timer('ocr_request'):
+            text = await self.module_impl.recognize_text_async(image_path)
+        if not text:
+            PipelineMetrics.count('ocr_failures')
+
+        # 从模块返回到这里之间没有await，调试信息仍属于本次识别
+        self._local.cached_debug_entry = None
+        self._store_cache(cache_key, text)
+        return text
+
+    def supports_word_locations(self):
+        """OCR模块是否支持返回文字块位置的识别方式
+
+        Returns:
+            bool: 支持时返回True，模块未加载时返回False
+        """
+        if self.module_impl is None:
+            return False
+        return self.module_impl.supports_word_locations()
+
+    def recognize_words(self, image_path):
+        """识别图片中的文本和文字块位置，缓存和请求配额的处理与recognize_text相同
+
+        文字块列表以JSON保存在缓存中，缓存键与recognize_text的不同，两种结果不会混用。
+
+        Args:
+            image_path (str or bytes or OCRImage): 图片文件路径、编码数据或内存图片
+
+        Returns:
+            list: 文字块列表，格式见OCRModuleInterface.recognize_words，模块未加载或识别失败时返回None
+
+        Raises:
+            QuotaExhaustedError: 缓存未命中且OCR接口的每日额度已用尽
+        """
+        if self.module_impl is None:
+            return None
+
+        with PipelineMetrics.timer('cache_lookup'):
+            cache_key = self._get_cache_key(image_path, word_locations=True)
+            cached = self._lookup_cache(cache_key)
+        if cached is not None:
+            self._local.cached_debug_entry = cached[1]
+            return json.loads(cached[0])
+        self._local.cached_debug_entry = None
+
+        self._wait_for_request_slot()
+        self._record_request([image_path])
+        with PipelineMetrics.timer('ocr_request'):
+            words = self.module_impl.recognize_words(image_path)
+        if not words:
+            PipelineMetrics.count('ocr_failures')
+
+        self._store_cache(cache_key, json.dumps(words, ensure_ascii=False) if words else None)
+        return words
+
+    async def recognize_words_async(self, image_path):
+        """recognize_words的异步版本
+
+        Args:
+            image_path (str or bytes or OCRImage): 图片文件路径、编码数据或内存图片
+
+        Returns:
+            list: 文字块列表，模块未加载或识别失败时返回None
+
+        Raises:
+            QuotaExhaustedError: 缓存未命中且OCR接口的每日额度已用尽
         """
         if self.module_impl is None:
             return None
-        return self.module_impl.recognize_text(image_path)
+
+        loop = asyncio.get_event_loop()
+        cache_key = None
+        with PipelineMetrics.timer('cache_lookup'):
+            if self.get_cache() is not None:
+                cache_key = await loop.run_in_executor(None, self._get_cache_key, image_path, True)
+            cached = self._lookup_cache(cache_key)
+        if cached is not None:
+            self._local.cached_debug_entry = cached[1]
+            return json.loads(cached[0])
+
+        await self._wait_for_request_slot_async()
+        self._record_request([image_path])
+        with PipelineMetrics.timer('ocr_request'):
+            words = await self.module_impl.recognize_words_async(image_path)
+        if not words:
+            PipelineMetrics.count('ocr_failures')
+
+        # 从模块返回到这里之间没有await，调试信息仍属于本次识别
+        self._local.cached_debug_entry = None
+        self._store_cache(cache_key, json.dumps(words, ensure_ascii=False) if words else None)
+        return words
+
+    def get_max_batch_size(self):
+        """获取单次批量识别请求最多可以包含的图片数量
+
+        Returns:
+            int: 批量大小，模块未加载时返回1
+        """
+        if self.module_impl is None:
+            return 1
+        return max(1, int(self.module_impl.get_max_batch_size()))
+
+    def recognize_batch(self, image_paths):
+        """批量识别多张图片中的文本
+
+        命中缓存的图片不会加入批量请求，其余图片合并为一次请求，只获取一个请求配额。
+
+        Args:
+            image_paths (list): 图片列表，元素格式与recognize_text的image_path相同
+
+        Returns:
+            list: 与image_paths一一对应的识别文本，模块未加载时全部为None
+
+        Raises:
+            QuotaExhaustedError: 存在未命中缓存的图片且OCR接口的每日额度已用尽
+        """
+        if self.module_impl is None:
+            return [None] * len(image_paths)
+
+        texts = [None] * len(image_paths)
+        debug_entries = [''] * len(image_paths)
+        missed = []
+        with PipelineMetrics.timer('cache_lookup'):
+            cache_keys = [self._get_cache_key(image_path) for image_path in image_paths]
+            for index, cache_key in enumerate(cache_keys):
+                cached = self._lookup_cache(cache_key)
+                if cached is None:
+                    missed.append(index)
+                else:
+                    texts[index], debug_entries[index] = cached
+
+        if missed:
+            self._wait_for_request_slot()
+            missed_paths = [image_paths[index] for index in missed]
+            self._record_request(missed_paths)
+            with PipelineMetrics.timer('ocr_request'):
+                missed_texts = self.module_impl.recognize_batch(missed_paths)
+            missed_entries = self.module_impl.get_batch_debug_info()
+            for position, index in enumerate(missed):
+                text = missed_texts[position] if position < len(missed_texts) else None
+                debug_entry = missed_entries[position] if position < len(missed_entries) else ''
+                texts[index] = text
+                debug_entries[index] = debug_entry
+                if cache_keys[index] is not None and text:
+                    self.cache.put(cache_keys[index], text, debug_entry)
+
+        self._local.batch_debug_entries = debug_entries
+        return texts
+
+    def get_batch_debug_info(self):
+        """获取上一次批量识别中每张图片的调试信息条目
+
+        Returns:
+            list: 调试信息字符串列表，命中缓存的图片使用缓存的调试信息
+        """
+        return getattr(self._local, 'batch_debug_entries', [])
+
+    def supports_async_jobs(self):
+        """OCR模块是否支持提交任务后轮询结果的异步任务模式
+
+        Returns:
+            bool: 支持时返回True，模块未加载时返回False
+        """
+        if self.module_impl is None:
+            return False
+        return self.module_impl.supports_async_jobs()
+
+    def submit_job(self, image_path):
+        """提交一个异步识别任务
+
+        Args:
+            image_path (str or bytes or OCRImage): 图片文件路径、编码数据或内存图片
+
+        Returns:
+            str: 任务ID，模块未加载或提交失败时返回None
+        """
+        if self.module_impl is None:
+            return None
+        return self.module_impl.submit_job(image_path)
+
+    def poll_job(self, job_id):
+        """查询异步识别任务的结果
+
+        Args:
+            job_id (str): 任务ID
+
+        Returns:
+            tuple: (是否已结束, 识别出的文本)，模块未加载时返回(True, None)
+        """
+        if self.module_impl is None:
+            return True, None
+        return self.module_impl.poll_job(job_id)
+
+    def get_job_poll_interval(self):
+        """获取轮询异步识别任务结果的间隔时间(秒)
+
+        Returns:
+            float: 轮询间隔，模块未加载时返回1.0秒
+        """
+        if self.module_impl is None:
+            return 1.0
+        return self.module_impl.get_job_poll_interval()
 
     def get_recognition_debug_info(self):
         """获取上一次OCR识别的完整调试信息条目
@@ -144,8 +471,73 @@ class OCRModule:
         """
         if self.module_impl is None:
             return ""
+        cached_debug_entry = getattr(self._local, 'cached_debug_entry', None)
+        if cached_debug_entry is not None:
+            return cached_debug_entry
         return self.module_impl.get_recognition_debug_info()
 
+    def get_cache(self):
+        """获取OCR结果缓存，首次调用时根据配置打开缓存数据库
+
+        缓存默认不启用，启用后缓存文件位于父目录的cache/ocr_cache.sqlite3，由所有处理目录共享。
+
+        Returns:
+            OCRCache: 缓存实例，未启用缓存或打开失败时返回None
+        """
+        if not self._cache_loaded:
+            with self._cache_lock:
+                if not self._cache_loaded:
+                    if str(ConfigManager.get('ENABLE_OCR_CACHE', 'False')).lower() == 'true':
+                        try:
+                            max_mb = int(ConfigManager.get('OCR_CACHE_MAX_MB', 256))
+                            cache_path = os.path.join(ConfigManager.get_parent_dir(), 'cache', 'ocr_cache.sqlite3')
+                            self.cache = OCRCache(cache_path, max_mb * 1024 * 1024)
+                        except (sqlite3.Error, OSError, ValueError) as e:
+                            LogManager.warning(LangManager.get_lang('ocr_cache_open_fail'), str(e))
+                            self.cache = None
+                    self._cache_loaded = True
+        return self.cache
+
+    def _get_cache_key(self, image_path, word_locations=False):
+        """计算图片在当前模块和设置下的缓存键
+
+        Args:
+            image_path (str or bytes or OCRImage): 图片文件路径、编码数据或内存图片
+            word_locations (bool): 是否是recognize_words的结果，与识别文本分开缓存
+
+        Returns:
+            str or None: 缓存键，未启用缓存时返回None
+        """
+        if self.get_cache() is None:
+            return None
+        options = self.module_impl.get_cache_key_options()
+        if word_locations:
+            options = dict(options, word_locations=True)
+        return OCRCache.make_key(
+            read_image_bytes(image_path),
+            ConfigManager.get('OCR_MODULE', DEFAULT_MODULE_NAME),
+            options,
+            ConfigManager.get('OCR_LANGUAGE', 'default')
+        )
+
+    def _lookup_cache(self, cache_key):
+        """查询缓存，配置了OCR_CACHE_BYPASS时始终视为未命中
+
+        Returns:
+            tuple or None: 命中时返回(识别文本, 调试信息条目)
+        """
+        if cache_key is None:
+            return None
+        if str(ConfigManager.get('OCR_CACHE_BYPASS', 'False')).lower() == 'true':
+            return None
+        return self.cache.get(cache_key)
+
+    def _store_cache(self, cache_key, text):
+        """把识别成功的结果和调试信息写入缓存，需要在识别的同一线程中紧接着调用"""
+        if cache_key is None or not text:
+            return
+        self.cache.put(cache_key, text, self.module_impl.get_recognition_debug_info())
+
     # generate_debug_entry方法已移除，调试信息获取方式已整合到get_recognition_debug_info中
 
     def get_api_delay(self):
@@ -158,6 +550,78 @@ class OCRModule:
             return 1.5  # 默认返回1.5秒
         return self.module_impl.get_api_delay()
 
+    def get_rate_limits(self):
+        """获取OCR模块声明的调用频率限制
+
+        Returns:
+            dict: 频率限制字典，模块未加载时返回不限制的默认值
+        """
+        if self.module_impl is None:
+            return {'qps': 0.0, 'burst': 1, 'daily_quota': 0}
+        return self.module_impl.get_rate_limits()
+
+    def get_rate_limiter(self):
+        """获取所有OCR调用共享的限流器，首次调用时根据模块声明的限制创建
+
+        当天已用的额度按模块保存在父目录的cache/<模块名>_quota.json，重新运行时继续累计。
+
+        Returns:
+            RateLimiter: 共享的限流器实例
+        """
+        if self.rate_limiter is None:
+            with self._rate_limiter_lock:
+                if self.rate_limiter is None:
+                    parent_dir = ConfigManager.get_parent_dir()
+                    module_name = ConfigManager.get('OCR_MODULE', DEFAULT_MODULE_NAME)
+                    state_path = os.path.join(parent_dir, 'cache', f'{module_name}_quota.json') if parent_dir else None
+                    self.rate_limiter = RateLimiter.from_limits(self.get_rate_limits(), state_path=state_path)
+        return self.rate_limiter
+
+    def acquire_rate_limit(self):
+        """在发起OCR请求前获取请求配额，必要时阻塞等待
+
+        Returns:
+            float or None: 实际等待的秒数，每日额度已用尽时返回None
+        """
+        return self.get_rate_limiter().acquire()
+
+    async def acquire_rate_limit_async(self):
+        """acquire_rate_limit的异步版本，等待期间不阻塞事件循环
+
+        Returns:
+            float or None: 实际等待的秒数，每日额度已用尽时返回None
+        """
+        wait = self.get_rate_limiter().reserve()
+        if wait:
+            await asyncio.sleep(wait)
+        return wait
+
+    def _wait_for_request_slot(self):
+        """发起OCR请求前获取请求配额，等待时输出提示
+
+        Raises:
+            QuotaExhaustedError: OCR接口的每日额度已用尽
+        """
+        waited = self.acquire_rate_limit()
+        if waited is None:
+            raise QuotaExhaustedError()
+        if waited > 0:
+            PipelineMetrics.add_time('rate_limit_wait', waited)
+            LogManager.info(LangManager.get_lang('rate_limit_wait_info'), waited)
+
+    async def _wait_for_request_slot_async(self):
+        """_wait_for_request_slot的异步版本
+
+        Raises:
+            QuotaExhaustedError: OCR接口的每日额度已用尽
+        """
+        waited = await self.acquire_rate_limit_async()
+        if waited is None:
+            raise QuotaExhaustedError()
+        if waited > 0:
+            PipelineMetrics.add_time('rate_limit_wait', waited)
+            LogManager.info(LangManager.get_lang('rate_limit_wait_info'), waited)
+
     def get_max_width(self):
         """获取OCR模块支持的最大图片宽度(像素)
 
@@ -176,4 +640,24 @@ class OCRModule:
         """
         if self.module_impl is None:
             return 8192  # 默认返回8192像素
-        return self.module_impl.get_max_height()
\ No newline at end of file
+        return self.module_impl.get_max_height()
+
+    def get_max_payload_bytes(self):
+        """获取OCR模块单次请求支持的最大图片数据量(字节)
+
+        Returns:
+            int: 编码后图片数据的最大字节数，0表示不限制，模块未加载时返回0
+        """
+        if self.module_impl is None:
+            return 0
+        return self.module_impl.get_max_payload_bytes()
+
+    def get_supported_formats(self):
+        """获取OCR模块接受的图片编码格式
+
+        Returns:
+            list: PIL格式名列表，模块未加载时返回['PNG']
+        """
+        if self.module_impl is None:
+            return ['PNG']
+        return self.module_impl.get_supported_formats()
\ No newline at end of file
@@ -1,3 +1,4 @@
+import asyncio
 from abc import ABC, abstractmethod
 
 class OCRModuleInterface(ABC):
@@ -16,14 +17,169 @@ class OCRModuleInterface(ABC):
     def recognize_text(self, image_path):
         """识别图片中的文本
 
+        拼接后的图片以内存中的OCRImage传入，不会写入磁盘，
+        可以用ocr_core.ocr_image中的read_image_bytes和get_image_name统一处理各种输入
+
         Args:
-            image_path (str): 图片文件路径
+            image_path (str or bytes or OCRImage): 图片文件路径、编码数据或内存图片
 
         Returns:
             str: 识别出的文本，失败时返回None
         """
         pass
 
+    def supports_native_async(self):
+        """是否提供不阻塞事件循环的原生异步识别实现
+
+        返回True的模块需要覆盖recognize_text_async，并保证在协程返回前
+        (最后一次await之后)记录上一次识别的调试信息
+
+        Returns:
+            bool: 默认返回False
+        """
+        return False
+
+    async def recognize_text_async(self, image_path):
+        """异步识别图片中的文本
+
+        默认实现把同步的recognize_text交给线程池执行，模块可以覆盖为原生的异步实现
+
+        Args:
+            image_path (str or bytes or OCRImage): 图片文件路径、编码数据或内存图片
+
+        Returns:
+            str: 识别出的文本，失败时返回None
+        """
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(None, self.recognize_text, image_path)
+
+    def supports_word_locations(self):
+        """是否支持返回每个文字块在图片中位置的识别方式
+
+        返回True的模块需要实现recognize_words。主程序会用文字块的位置把拼接图片的识别结果
+        按布局表拆回各张源图片，因此可以把更多截图(包括左右并排的多列)拼接到一次请求中
+
+        Returns:
+            bool: 默认返回False
+        """
+        return False
+
+    def recognize_words(self, image_path):
+        """识别图片中的文本，并返回每个文字块的位置
+
+        调试信息的记录方式与recognize_text相同，异步任务模式的模块也在该方法中同步返回结果
+
+        Args:
+            image_path (str or bytes or OCRImage): 图片文件路径、编码数据或内存图片
+
+        Returns:
+            list: 按阅读顺序排列的文字块，失败时返回None。每个文字块是一个字典:
+                words: 文字块的文本
+                location: 文字块在图片中的位置{'left', 'top', 'width', 'height'}(像素)
+                chars: 可选，单字的列表[{'char': 单字, 'location': 位置}, ...]，
+                    文字块跨越多张源图片时按单字的位置拆分
+        """
+        return None
+
+    async def recognize_words_async(self, image_path):
+        """异步识别图片中的文本和文字块位置
+
+        默认实现把同步的recognize_words交给线程池执行，supports_native_async返回True的模块应覆盖为原生的异步实现
+
+        Args:
+            image_path (str or bytes or OCRImage): 图片文件路径、编码数据或内存图片
+
+        Returns:
+            list: 与recognize_words格式相同的文字块列表，失败时返回None
+        """
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(None, self.recognize_words, image_path)
+
+    def get_cache_key_options(self):
+        """获取影响识别结果的模块选项，用于计算识别结果缓存的键
+
+        选项变化后旧的缓存结果不会再被使用，模块应返回所有会改变识别结果的设置
+
+        Returns:
+            dict: 可以JSON序列化的选项字典，默认返回空字典
+        """
+        return {}
+
+    def get_max_batch_size(self):
+        """获取单次批量识别请求最多可以包含的图片数量
+
+        返回大于1的值表示模块支持recognize_batch，主程序会把多组图片合并为一次请求
+
+        Returns:
+            int: 默认返回1，即不支持批量识别
+        """
+        return 1
+
+    def recognize_batch(self, image_paths):
+        """批量识别多张图片中的文本
+
+        默认实现逐张调用recognize_text，支持批量接口的模块应覆盖此方法，
+        在一次请求中完成所有图片的识别以分摊请求和鉴权开销
+
+        Args:
+            image_paths (list): 图片列表，元素格式与recognize_text的image_path相同，长度不超过get_max_batch_size
+
+        Returns:
+            list: 与image_paths一一对应的识别文本，识别失败的位置为None
+        """
+        return [self.recognize_text(image_path) for image_path in image_paths]
+
+    def get_batch_debug_info(self):
+        """获取上一次批量识别中每张图片的调试信息条目
+
+        Returns:
+            list: 与上一次recognize_batch的image_paths一一对应的调试信息字符串，默认返回空列表
+        """
+        return []
+
+    def supports_async_jobs(self):
+        """是否支持提交任务后轮询结果的异步任务模式
+
+        返回True的模块需要实现submit_job和poll_job，主程序会先提交任务，
+        再按get_job_poll_interval的间隔轮询结果
+
+        Returns:
+            bool: 默认返回False
+        """
+        return False
+
+    def submit_job(self, image_path):
+        """提交一个异步识别任务
+
+        Args:
+            image_path (str or bytes or OCRImage): 图片文件路径、编码数据或内存图片
+
+        Returns:
+            str: 任务ID，提交失败时返回None
+        """
+        return None
+
+    def poll_job(self, job_id):
+        """查询异步识别任务的结果
+
+        任务完成后，get_recognition_debug_info应返回该任务的调试信息
+
+        Args:
+            job_id (str): submit_job返回的任务ID
+
+        Returns:
+            tuple: (是否已结束, 识别出的文本)，任务失败时为(True, None)
+        """
+        return True, None
+
+    def get_job_poll_interval(self):
+        """获取轮询异步识别任务结果的间隔时间(秒)
+
+        Returns:
+            float: 默认返回1.0秒
+        """
+        return 1.0
+
     @abstractmethod
     def get_recognition_debug_info(self):
         """获取上一次OCR识别的完整调试信息条目
@@ -42,6 +198,23 @@ class OCRModuleInterface(ABC):
         """
         pass
 
+    def get_rate_limits(self):
+        """获取OCR模块声明的调用频率限制
+
+        默认根据get_api_delay换算为QPS，模块可以覆盖此方法声明更精确的限制，
+        这些限制会交给共享的RateLimiter统一执行
+
+        Returns:
+            dict: 频率限制字典，格式为 {'qps': float, 'burst': int, 'daily_quota': int}
+                qps为0表示不限制QPS，daily_quota为0表示不限制每日额度
+        """
+        delay = self.get_api_delay()
+        return {
+            'qps': 1.0 / delay if delay and delay > 0 else 0.0,
+            'burst': 1,
+            'daily_quota': 0
+        }
+
     @abstractmethod
     def get_max_width(self):
         """获取OCR模块支持的最大图片宽度(像素)
@@ -58,4 +231,24 @@ class OCRModuleInterface(ABC):
         Returns:
             int: 支持的最大图片高度(像素)
         """
-        pass
\ No newline at end of file
+        pass
+
+    def get_max_payload_bytes(self):
+        """获取OCR模块单次请求支持的最大图片数据量(字节)
+
+        拼接规划器按该限制决定每张画布最多拼接多少图片，不实现时不限制数据量。
+
+        Returns:
+            int: 编码后图片数据的最大字节数，0表示不限制
+        """
+        return 0
+
+    def get_supported_formats(self):
+        """获取OCR模块接受的图片编码格式
+
+        主程序按PAYLOAD_ENCODING在这些格式中选择上传图片的编码方式，不实现时只使用PNG。
+
+        Returns:
+            list: PIL格式名列表，如['PNG', 'JPEG']
+        """
+        return ['PNG']
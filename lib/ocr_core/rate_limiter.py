@@ -0,0 +1,237 @@
+import os
+import json
+import atexit
+import time
+import datetime
+import threading
+
+
+class QuotaExhaustedError(Exception):
+    """OCR接口的每日调用额度已用尽"""
+    pass
+
+
+class RateLimiter:
+    """令牌桶限流器，由所有OCR调用共享
+
+    按照OCR模块声明的QPS、突发容量和每日额度控制请求发出的节奏。
+    与固定的调用后延迟不同，只有在令牌不足时才会等待，
+    因此请求本身耗时较长时不会再额外浪费时间。
+
+    每日额度按本地日期统计，日期变化时重置。指定state_path时当天已用的额度和额度用尽的标记
+    会保存到文件中，重新启动、继续处理或批量处理多个目录时不会从零开始计数。
+    已用额度每SAVE_EVERY次请求或间隔SAVE_INTERVAL秒才保存一次，额度用尽时立即保存，
+    其余未保存的计数由flush在处理结束或进程退出时写入。
+
+    时钟、日期和休眠函数均可注入，测试时可以传入假时钟而无需真实等待。
+    """
+
+    # 已用额度的保存频率: 累计的未保存请求数或距上次保存的秒数达到其一即保存
+    SAVE_EVERY = 20
+    SAVE_INTERVAL = 5.0
+
+    def __init__(self, qps=0.0, burst=1, daily_quota=0, clock=time.monotonic, sleep=time.sleep,
+                 state_path=None, today=datetime.date.today):
+        """初始化限流器
+
+        Args:
+            qps (float): 每秒允许的请求数，0表示不限制
+            burst (int): 令牌桶容量，即允许的最大突发请求数
+            daily_quota (int): 每日允许的请求总数，0表示不限制
+            clock (callable): 返回单调递增秒数的时钟函数
+            sleep (callable): 休眠函数，参数为秒数
+            state_path (str): 保存当天已用额度的JSON文件路径，None时只在内存中统计
+            today (callable): 返回当前本地日期的函数
+        """
+        self.qps = max(0.0, float(qps))
+        self.burst = max(1, int(burst))
+        self.daily_quota = max(0, int(daily_quota))
+        self._clock = clock
+        self._sleep = sleep
+        self._today = today
+        self._state_path = state_path
+        self._lock = threading.Lock()
+
+        now = self._clock()
+        self._tokens = float(self.burst)
+        self._last_refill = now
+        self._day = self._today()
+        self._day_count = 0
+        self._exhausted = False
+        self._unsaved = 0
+        self._last_save = now
+        self._load_state()
+        if self._state_path:
+            atexit.register(self.flush)
+
+        # 累计统计
+        self.total_requests = 0
+        self.total_wait = 0.0
+
+    @classmethod
+    def from_limits(cls, limits, clock=time.monotonic, sleep=time.sleep, state_path=None):
+        """根据OCR模块声明的限制创建限流器
+
+        Args:
+            limits (dict): 包含qps、burst、daily_quota的字典，缺失的键使用不限制的默认值
+            clock (callable): 时钟函数
+            sleep (callable): 休眠函数
+            state_path (str): 保存当天已用额度的JSON文件路径
+
+        Returns:
+            RateLimiter: 限流器实例
+        """
+        limits = limits or {}
+        return cls(
+            qps=limits.get('qps', 0.0),
+            burst=limits.get('burst', 1),
+            daily_quota=limits.get('daily_quota', 0),
+            clock=clock,
+            sleep=sleep,
+            state_path=state_path
+        )
+
+    def _load_state(self):
+        """读取之前的运行保存的当天已用额度，文件不存在、无法读取或不是当天的记录时忽略"""
+        if not self._state_path:
+            return
+        try:
+            with open(self._state_path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return
+        if not isinstance(state, dict) or state.get('date') != self._day.isoformat():
+            return
+        try:
+            self._day_count = max(0, int(state.get('used', 0)))
+        except (TypeError, ValueError):
+            self._day_count = 0
+        self._exhausted = bool(state.get('exhausted', False))
+
+    def _save_state(self):
+        """保存当天已用额度，调用方需持有锁
+
+        未设置每日额度且额度未用尽时不需要保存。先写入临时文件再替换，中途退出时不会留下不完整的文件。
+        """
+        if not self._state_path or not (self.daily_quota or self._exhausted):
+            return
+        state = {'date': self._day.isoformat(), 'used': self._day_count, 'exhausted': self._exhausted}
+        temp_path = self._state_path + '.tmp'
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self._state_path)), exist_ok=True)
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(state, f)
+            os.replace(temp_path, self._state_path)
+        except OSError:
+            # 无法保存时仍按内存中的计数限流
+            pass
+        self._unsaved = 0
+        self._last_save = self._clock()
+
+    def _save_state_throttled(self, now):
+        """请求计数累计到SAVE_EVERY次或距上次保存超过SAVE_INTERVAL秒时保存，调用方需持有锁"""
+        self._unsaved += 1
+        if self._unsaved >= self.SAVE_EVERY or now - self._last_save >= self.SAVE_INTERVAL:
+            self._save_state()
+
+    def flush(self):
+        """立即保存尚未写入文件的已用额度
+
+        处理结束时调用，进程退出时也会自动调用。
+        """
+        with self._lock:
+            if self._unsaved:
+                self._save_state()
+
+    def _refill(self, now):
+        """按经过的时间补充令牌，调用方需持有锁"""
+        if self.qps > 0:
+            elapsed = now - self._last_refill
+            if elapsed > 0:
+                self._tokens = min(float(self.burst), self._tokens + elapsed * self.qps)
+        self._last_refill = now
+
+        # 本地日期变化后重置每日额度
+        today = self._today()
+        if today != self._day:
+            self._day = today
+            self._day_count = 0
+            self._exhausted = False
+
+    def reserve(self):
+        """预订一个请求配额但不等待
+
+        令牌不足时允许令牌数变为负数，相当于排队预订未来的令牌，
+        这样多个线程同时请求时会按到达顺序依次错开。
+
+        Returns:
+            float or None: 需要等待的秒数，每日额度已用尽时返回None
+        """
+        with self._lock:
+            now = self._clock()
+            self._refill(now)
+
+            if self._exhausted:
+                return None
+            if self.daily_quota and self._day_count >= self.daily_quota:
+                self._exhausted = True
+                self._save_state()
+                return None
+
+            self._day_count += 1
+            self.total_requests += 1
+            self._save_state_throttled(now)
+
+            if self.qps <= 0:
+                return 0.0
+
+            self._tokens -= 1.0
+            if self._tokens >= 0:
+                return 0.0
+            wait = -self._tokens / self.qps
+            self.total_wait += wait
+            return wait
+
+    def acquire(self):
+        """获取一个请求配额，必要时阻塞等待
+
+        Returns:
+            float or None: 实际等待的秒数，每日额度已用尽时返回None
+        """
+        wait = self.reserve()
+        if wait:
+            self._sleep(wait)
+        return wait
+
+    def mark_exhausted(self):
+        """标记每日额度已用尽
+
+        用于OCR接口明确返回额度用尽错误时，立即停止后续请求，
+        直到本地日期变化。
+        """
+        with self._lock:
+            self._exhausted = True
+            self._save_state()
+
+    def is_exhausted(self):
+        """检查每日额度是否已用尽
+
+        Returns:
+            bool: 额度已用尽返回True
+        """
+        with self._lock:
+            self._refill(self._clock())
+            return self._exhausted
+
+    def get_remaining_quota(self):
+        """获取当天剩余的请求额度
+
+        Returns:
+            int or None: 剩余额度，未设置每日额度时返回None
+        """
+        with self._lock:
+            if not self.daily_quota:
+                return None
+            if self._exhausted:
+                return 0
+            return max(0, self.daily_quota - self._day_count)
@@ -0,0 +1,511 @@
+import sys
+import json
+import math
+import time
+import base64
+import random
+import struct
+import hashlib
+import argparse
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlsplit, parse_qs
+
+
+# 识别接口路径，与baidu_http_client.OCR_API_PATHS一致
+OCR_API_PATHS = {
+    '/rest/2.0/ocr/v1/accurate_basic': 'basicAccurate',
+    '/rest/2.0/ocr/v1/general_basic': 'basicGeneral',
+    '/rest/2.0/ocr/v1/accurate': 'accurate',
+    '/rest/2.0/ocr/v1/general': 'general'
+}
+
+# 返回文字位置的识别接口
+LOCATION_APIS = frozenset({'accurate', 'general'})
+
+# 百度OCR接口的错误码和错误信息
+ERROR_MESSAGES = {
+    17: 'Open api daily request limit reached',
+    18: 'Open api qps request limit reached',
+    110: 'Access token invalid or no longer valid',
+    111: 'Access token expired',
+    216100: 'invalid param',
+    216101: 'not enough param',
+    216201: 'image format error',
+    216202: 'image size error',
+    282000: 'internal error'
+}
+
+# canned模式默认返回的文本，与测试模块相同，包含默认的开始和结束标记
+DEFAULT_CANNED_LINES = [
+    '剧情梗概',
+    '这是固定的测试文本',
+    '用于调试OCR模块',
+    '无论输入什么图片都会返回这段文字',
+    '取消'
+]
+
+
+def read_image_size(image_data):
+    """从PNG、JPEG或BMP的文件头读取图片尺寸，不依赖PIL
+
+    Args:
+        image_data (bytes): 图片数据
+
+    Returns:
+        tuple: (宽, 高)，无法识别的格式返回None
+    """
+    if image_data[:8] == b'\x89PNG\r\n\x1a\n' and len(image_data) >= 24:
+        return struct.unpack('>II', image_data[16:24])
+    if image_data[:2] == b'BM' and len(image_data) >= 26:
+        width, height = struct.unpack('<ii', image_data[18:26])
+        return width, abs(height)
+    if image_data[:2] == b'\xff\xd8':
+        position = 2
+        while position + 9 <= len(image_data):
+            if image_data[position] != 0xFF:
+                return None
+            marker = image_data[position + 1]
+            length = struct.unpack('>H', image_data[position + 2:position + 4])[0]
+            # SOF0-SOF15中除DHT、JPG、DAC以外的标记包含图片尺寸
+            if 0xC0 <= marker <= 0xCF and marker not in (0xC4, 0xC8, 0xCC):
+                height, width = struct.unpack('>HH', image_data[position + 5:position + 9])
+                return width, height
+            position += 2 + length
+    return None
+
+
+class LatencyModel:
+    """模拟接口的响应时间分布"""
+
+    DISTRIBUTIONS = ('fixed', 'uniform', 'normal', 'lognormal')
+
+    def __init__(self, distribution='fixed', mean=0.0, jitter=0.0, seed=None):
+        """初始化响应时间模型
+
+        Args:
+            distribution (str): 分布类型，fixed、uniform、normal或lognormal
+            mean (float): 平均响应时间(秒)
+            jitter (float): 波动幅度(秒)，uniform为半宽，normal和lognormal为标准差
+            seed (int): 随机数种子，None表示不固定
+        """
+        if distribution not in self.DISTRIBUTIONS:
+            raise ValueError(f'unknown latency distribution: {distribution}')
+        self.distribution = distribution
+        self.mean = max(0.0, float(mean))
+        self.jitter = max(0.0, float(jitter))
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def sample(self):
+        """抽取一次响应时间
+
+        Returns:
+            float: 响应时间(秒)，不小于0
+        """
+        with self._lock:
+            if self.distribution == 'uniform':
+                value = self._random.uniform(self.mean - self.jitter, self.mean + self.jitter)
+            elif self.distribution == 'normal':
+                value = self._random.gauss(self.mean, self.jitter)
+            elif self.distribution == 'lognormal' and self.mean > 0:
+                # 按均值和标准差换算对数正态分布的参数，长尾更接近真实网络
+                variance = self.jitter ** 2
+                sigma2 = math.log(1 + variance / self.mean ** 2)
+                mu = math.log(self.mean) - sigma2 / 2
+                value = self._random.lognormvariate(mu, math.sqrt(sigma2))
+            else:
+                value = self.mean
+        return max(0.0, value)
+
+
+class BaiduEmulator:
+    """本地的百度OCR接口模拟服务器
+
+    实现token接口和basicAccurate、basicGeneral两个识别接口以及含位置信息的accurate、general接口，
+    返回格式与真实接口相同，
+    用于在没有网络或不想消耗额度时测试百度模块的并发、重试和限流流程。
+
+    - 响应时间按LatencyModel的分布模拟
+    - 超过qps或daily_quota时返回真实接口的错误码18和17
+    - base64编码后的图片超过max_image_bytes时返回错误码216202
+    - access_token过期后返回错误码111
+    - 按error_rate随机返回错误码282000
+    - text_mode为canned时返回固定文本，为echo时返回图片的摘要和大小
+    - 含位置信息的接口把文本行从上到下均匀排列在图片中，设置了tile_size时按该尺寸把图片划分成网格，
+      在每个格子中各排列一遍文本行，对应拼接画布中的每张截图；recognize_granularity为small时还返回单字位置
+
+    服务器在后台线程中运行，请求的统计信息可以通过stats或GET /emulator/stats获取。
+    """
+
+    def __init__(self, host='127.0.0.1', port=0, latency=None, qps=0.0, daily_quota=0,
+                 max_image_bytes=10 * 1024 * 1024, token_ttl=2592000, text_mode='canned',
+                 canned_lines=None, error_rate=0.0, api_key=None, seed=None, tile_size=None):
+        """初始化模拟服务器
+
+        Args:
+            host (str): 监听地址
+            port (int): 监听端口，0表示自动选择空闲端口
+            latency (LatencyModel): 识别接口的响应时间模型，None表示不延迟
+            qps (float): 每秒允许的识别请求数，0表示不限制
+            daily_quota (int): 允许的识别请求总数，0表示不限制
+            max_image_bytes (int): base64编码后的图片最大字节数，真实接口为10MB
+            token_ttl (int): access_token的有效期(秒)
+            text_mode (str): canned返回canned_lines，echo返回图片的摘要和大小
+            canned_lines (list): canned模式返回的文本行
+            error_rate (float): 随机返回内部错误的概率
+            api_key (str): 只接受该API Key换取token，None表示接受任意Key
+            seed (int): 随机数种子
+            tile_size (tuple): 拼接前单张截图的(宽, 高)，None表示整张图片作为一张截图
+        """
+        self.host = host
+        self.port = port
+        self.latency = latency or LatencyModel()
+        self.qps = max(0.0, float(qps))
+        self.daily_quota = max(0, int(daily_quota))
+        self.max_image_bytes = max(0, int(max_image_bytes))
+        self.token_ttl = int(token_ttl)
+        self.text_mode = text_mode
+        self.canned_lines = list(canned_lines or DEFAULT_CANNED_LINES)
+        self.error_rate = max(0.0, float(error_rate))
+        self.api_key = api_key
+        self._random = random.Random(seed)
+        self.tile_size = tuple(tile_size) if tile_size else None
+
+        self._lock = threading.Lock()
+        # access_token -> 过期时间
+        self._tokens = {}
+        # QPS限制的令牌桶，容量为qps(至少1个)，每秒补充qps个
+        self._bucket = max(1.0, self.qps)
+        self._bucket_time = time.monotonic()
+        # 已通过额度检查的识别请求数，用于每日额度限制
+        self._accepted = 0
+        self._server = None
+        self._thread = None
+        self.stats = {
+            'token_requests': 0,
+            'ocr_requests': 0,
+            'ok': 0,
+            'errors': {},
+            'bytes_received': 0,
+            'max_in_flight': 0
+        }
+        self._in_flight = 0
+
+    @property
+    def base_url(self):
+        """服务器的根地址，可以直接作为BAIDU_API_BASE_URL使用"""
+        return f'http://{self.host}:{self.port}'
+
+    def start(self):
+        """在后台线程中启动服务器
+
+        Returns:
+            BaiduEmulator: self，便于链式调用
+        """
+        emulator = self
+
+        class Handler(_EmulatorHandler):
+            pass
+        Handler.emulator = emulator
+
+        self._server = ThreadingHTTPServer((self.host, self.port), Handler)
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """停止服务器"""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+    def get_stats(self):
+        """获取请求统计信息的副本
+
+        Returns:
+            dict: 包含token_requests、ocr_requests、ok、errors(错误码 -> 次数)、
+                bytes_received和max_in_flight
+        """
+        with self._lock:
+            stats = dict(self.stats)
+            stats['errors'] = dict(self.stats['errors'])
+        return stats
+
+    def issue_token(self, client_id):
+        """处理token请求
+
+        Args:
+            client_id (str): 请求中的API Key
+
+        Returns:
+            tuple: (HTTP状态码, 响应JSON)
+        """
+        with self._lock:
+            self.stats['token_requests'] += 1
+            if self.api_key is not None and client_id != self.api_key:
+                return 401, {'error': 'invalid_client', 'error_description': 'unknown client id'}
+            token = '24.' + hashlib.sha1(f'{client_id}{time.time()}{self._random.random()}'.encode()).hexdigest()
+            self._tokens[token] = time.monotonic() + self.token_ttl
+        return 200, {
+            'access_token': token,
+            'expires_in': self.token_ttl,
+            'scope': 'public brain_all_scope vis-ocr_ocr',
+            'session_key': 'emulator',
+            'session_secret': 'emulator'
+        }
+
+    def _admit(self, token):
+        """检查token、每日额度和QPS限制，通过时占用一个额度
+
+        Returns:
+            int or None: 拒绝请求的错误码，通过时返回None
+        """
+        now = time.monotonic()
+        with self._lock:
+            expire_at = self._tokens.get(token)
+            if expire_at is None:
+                return 110
+            if now >= expire_at:
+                return 111
+            if self.daily_quota and self._accepted >= self.daily_quota:
+                return 17
+            if self.qps:
+                self._bucket = min(max(1.0, self.qps), self._bucket + (now - self._bucket_time) * self.qps)
+                self._bucket_time = now
+                if self._bucket < 1.0:
+                    return 18
+                self._bucket -= 1.0
+            self._accepted += 1
+        return None
+
+    def recognize(self, api_name, token, form):
+        """处理识别请求
+
+        Args:
+            api_name (str): 接口名称
+            token (str): 请求中的access_token
+            form (dict): 表单字段
+
+        Returns:
+            dict: 响应JSON
+        """
+        with self._lock:
+            self.stats['ocr_requests'] += 1
+            self._in_flight += 1
+            self.stats['max_in_flight'] = max(self.stats['max_in_flight'], self._in_flight)
+        try:
+            error_code = self._admit(token)
+            image = form.get('image', '')
+            with self._lock:
+                self.stats['bytes_received'] += len(image)
+            if error_code is None:
+                if not image:
+                    error_code = 216101
+                elif self.max_image_bytes and len(image) > self.max_image_bytes:
+                    error_code = 216202
+
+            image_data = b''
+            if error_code is None:
+                try:
+                    image_data = base64.b64decode(image, validate=True)
+                except ValueError:
+                    error_code = 216201
+
+            # 模拟处理时间，被拒绝的请求也需要一次网络往返
+            time.sleep(self.latency.sample())
+
+            if error_code is None and self.error_rate and self._random.random() < self.error_rate:
+                error_code = 282000
+            if error_code is not None:
+                with self._lock:
+                    self.stats['errors'][error_code] = self.stats['errors'].get(error_code, 0) + 1
+                return {'error_code': error_code, 'error_msg': ERROR_MESSAGES[error_code],
+                        'log_id': self._random.getrandbits(63)}
+
+            with self._lock:
+                self.stats['ok'] += 1
+            return self._build_result(api_name, image_data, form)
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+
+    def _build_result(self, api_name, image_data, form):
+        if self.text_mode == 'echo':
+            digest = hashlib.sha1(image_data).hexdigest()[:12]
+            lines = [f'{api_name} {digest} {len(image_data)} bytes']
+        else:
+            lines = self.canned_lines
+
+        with_probability = form.get('probability') == 'true'
+        with_location = api_name in LOCATION_APIS
+        with_chars = with_location and form.get('recognize_granularity') == 'small'
+        width, height = (read_image_size(image_data) or (1000, 1000)) if with_location else (0, 0)
+        tiles = self._split_tiles(width, height) if with_location else [(0, 0, 0, 0)]
+        words_result = []
+        for tile_left, tile_top, tile_width, tile_height in tiles:
+            line_height = max(1, tile_height // (len(lines) * 2 + 1)) if lines else 0
+            for index, line in enumerate(lines):
+                item = {'words': line}
+                if with_probability:
+                    item['probability'] = {'average': 0.99, 'min': 0.95, 'variance': 0.0001}
+                if with_location:
+                    # 每行占一个行高，行与行之间空一个行高，字宽等于行高但不超出截图
+                    char_width = max(1, min(line_height, (tile_width * 8 // 10) // max(1, len(line))))
+                    top = tile_top + line_height * (index * 2 + 1)
+                    left = tile_left + tile_width // 10
+                    item['location'] = {'top': top, 'left': left, 'width': char_width * len(line), 'height': line_height}
+                    if with_chars:
+                        item['chars'] = [
+                            {'char': char, 'location': {'top': top, 'left': left + char_width * offset,
+                                                        'width': char_width, 'height': line_height}}
+                            for offset, char in enumerate(line)
+                        ]
+                words_result.append(item)
+
+        result = {
+            'log_id': self._random.getrandbits(63),
+            'words_result_num': len(words_result),
+            'words_result': words_result
+        }
+        if form.get('detect_direction') == 'true':
+            result['direction'] = 0
+        if form.get('detect_language') == 'true':
+            result['language'] = -1
+        return result
+
+
+    def _split_tiles(self, width, height):
+        """按tile_size把图片划分成网格
+
+        拼接画布中同尺寸的截图按截图尺寸的整数倍排列，
+        网格的每个格子对应一张截图。
+
+        Args:
+            width (int): 图片宽度
+            height (int): 图片高度
+
+        Returns:
+            list: 每个格子的(左, 上, 宽, 高)，按行优先排列
+        """
+        if not self.tile_size:
+            return [(0, 0, width, height)]
+        tile_width = min(width, max(1, self.tile_size[0]))
+        tile_height = min(height, max(1, self.tile_size[1]))
+        return [
+            (column * tile_width, row * tile_height, tile_width, tile_height)
+            for row in range(max(1, height // tile_height))
+            for column in range(max(1, width // tile_width))
+        ]
+
+
+class _EmulatorHandler(BaseHTTPRequestHandler):
+    """模拟服务器的请求处理器，emulator由BaiduEmulator.start设置"""
+
+    emulator = None
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        # 压测时不输出每个请求的访问日志
+        pass
+
+    def _send_json(self, status, payload):
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json;charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('Connection', 'close')
+        self.end_headers()
+        self.wfile.write(body)
+        self.close_connection = True
+
+    def _read_body(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        return self.rfile.read(length) if length else b''
+
+    def do_GET(self):
+        parts = urlsplit(self.path)
+        query = {key: values[0] for key, values in parse_qs(parts.query).items()}
+        if parts.path == '/oauth/2.0/token':
+            self._send_json(*self.emulator.issue_token(query.get('client_id')))
+        elif parts.path == '/emulator/stats':
+            self._send_json(200, self.emulator.get_stats())
+        else:
+            self._send_json(404, {'error_code': 3, 'error_msg': 'Unsupported openapi method'})
+
+    def do_POST(self):
+        parts = urlsplit(self.path)
+        query = {key: values[0] for key, values in parse_qs(parts.query).items()}
+        body = self._read_body()
+        if parts.path == '/oauth/2.0/token':
+            form = {key: values[0] for key, values in parse_qs(body.decode('utf-8')).items()}
+            self._send_json(*self.emulator.issue_token(query.get('client_id') or form.get('client_id')))
+            return
+        api_name = OCR_API_PATHS.get(parts.path)
+        if api_name is None:
+            self._send_json(404, {'error_code': 3, 'error_msg': 'Unsupported openapi method'})
+            return
+        form = {key: values[0] for key, values in parse_qs(body.decode('utf-8')).items()}
+        # 百度接口的业务错误也以HTTP 200返回
+        self._send_json(200, self.emulator.recognize(api_name, query.get('access_token'), form))
+
+
+def _parse_size(value):
+    try:
+        width, height = (int(part) for part in value.lower().split('x'))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f'invalid size: {value} (expected WIDTHxHEIGHT)')
+    return width, height
+
+
+def main(argv=None):
+    """命令行入口，在前台运行模拟服务器直到按Ctrl+C"""
+    parser = argparse.ArgumentParser(description='Local Baidu OCR API emulator')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8500)
+    parser.add_argument('--latency', type=float, default=0.3, help='mean response time in seconds')
+    parser.add_argument('--jitter', type=float, default=0.1, help='response time spread in seconds')
+    parser.add_argument('--distribution', choices=LatencyModel.DISTRIBUTIONS, default='lognormal')
+    parser.add_argument('--qps', type=float, default=2, help='accepted OCR requests per second, 0 for unlimited')
+    parser.add_argument('--daily-quota', type=int, default=0, help='accepted OCR requests in total, 0 for unlimited')
+    parser.add_argument('--max-image-bytes', type=int, default=10 * 1024 * 1024,
+                        help='maximum base64 image size in bytes')
+    parser.add_argument('--token-ttl', type=int, default=2592000, help='access token lifetime in seconds')
+    parser.add_argument('--text-mode', choices=('canned', 'echo'), default='canned')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='probability of a 282000 internal error')
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--tile-size', type=_parse_size, default=None,
+                        help='screenshot size before stitching, e.g. 1920x1080, for word locations per screenshot')
+    args = parser.parse_args(argv)
+
+    emulator = BaiduEmulator(
+        host=args.host, port=args.port,
+        latency=LatencyModel(args.distribution, args.latency, args.jitter, args.seed),
+        qps=args.qps, daily_quota=args.daily_quota, max_image_bytes=args.max_image_bytes,
+        token_ttl=args.token_ttl, text_mode=args.text_mode, error_rate=args.error_rate, seed=args.seed,
+        tile_size=args.tile_size
+    ).start()
+    print(f'Baidu OCR emulator listening on {emulator.base_url}')
+    print(f"Set BAIDU_API_BASE_URL = '{emulator.base_url}' in the Baidu module config to use it")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        emulator.stop()
+        print(json.dumps(emulator.get_stats(), ensure_ascii=False))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
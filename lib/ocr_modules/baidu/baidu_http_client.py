@@ -0,0 +1,317 @@
+import ssl
+import json
+import time
+import base64
+import asyncio
+import threading
+import http.client
+from urllib.parse import urlsplit, urlencode
+from metrics import PipelineMetrics
+
+
+# 百度AI开放平台的默认接口地址
+DEFAULT_BASE_URL = 'https://aip.baidubce.com'
+
+# 识别接口名称到接口路径的映射
+OCR_API_PATHS = {
+    'basicAccurate': '/rest/2.0/ocr/v1/accurate_basic',
+    'basicGeneral': '/rest/2.0/ocr/v1/general_basic',
+    # 含位置信息的版本
+    'accurate': '/rest/2.0/ocr/v1/accurate',
+    'general': '/rest/2.0/ocr/v1/general'
+}
+
+
+class BaiduHttpClient:
+    """基于asyncio的百度OCR接口客户端
+
+    直接通过asyncio的流接口发送HTTP请求，不依赖aip SDK，
+    也不需要额外的第三方库，适合在事件循环中同时保持大量在途请求。
+    请求格式与aip SDK保持一致：先用API Key和Secret Key换取access_token，
+    再以表单方式提交base64编码的图片和识别选项。
+    recognize提供基于http.client的同步版本，供线程池并发方式使用。
+
+    base_url可以指向本地的HTTP桩服务器或baidu_emulator.py中的模拟服务器，
+    便于在没有网络的环境中测试。
+    """
+
+    # access_token提前过期的秒数，避免临界时刻使用过期的token
+    TOKEN_EXPIRY_MARGIN = 30
+
+    def __init__(self, api_key, secret_key, base_url=DEFAULT_BASE_URL, timeout=60.0):
+        """初始化客户端
+
+        Args:
+            api_key (str): 百度OCR API Key
+            secret_key (str): 百度OCR Secret Key
+            base_url (str): 接口根地址，支持http和https
+            timeout (float): 单次HTTP请求的超时时间(秒)
+        """
+        self.api_key = api_key
+        self.secret_key = secret_key
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+        self._access_token = None
+        self._token_expire_at = 0.0
+        self._token_lock = None
+        self._token_lock_loop = None
+        self._sync_token_lock = threading.Lock()
+
+    def build_token_url(self):
+        """构建获取access_token的URL
+
+        Returns:
+            str: 带查询参数的token接口URL
+        """
+        query = urlencode({
+            'grant_type': 'client_credentials',
+            'client_id': self.api_key,
+            'client_secret': self.secret_key
+        })
+        return f'{self.base_url}/oauth/2.0/token?{query}'
+
+    def build_ocr_request(self, api_name, image_data, options, access_token):
+        """构建识别请求的URL和表单正文
+
+        Args:
+            api_name (str): 接口名称，见OCR_API_PATHS
+            image_data (bytes): 图片的二进制数据
+            options (dict): 识别选项，与aip SDK一样直接作为表单字段提交
+            access_token (str): 接口访问令牌
+
+        Returns:
+            tuple: (请求URL, 表单正文bytes)
+        """
+        url = f'{self.base_url}{OCR_API_PATHS[api_name]}?{urlencode({"access_token": access_token})}'
+        data = {'image': base64.b64encode(image_data).decode()}
+        data.update(options or {})
+        return url, urlencode(data).encode('utf-8')
+
+    def _store_token(self, token_result):
+        """保存token接口的返回结果
+
+        Args:
+            token_result (dict): token接口返回的JSON
+
+        Returns:
+            str or None: access_token，获取失败时返回None
+        """
+        access_token = token_result.get('access_token')
+        if access_token:
+            expires_in = float(token_result.get('expires_in', 0))
+            self._access_token = access_token
+            self._token_expire_at = time.monotonic() + expires_in - self.TOKEN_EXPIRY_MARGIN
+        return access_token
+
+    def _token_valid(self):
+        return self._access_token is not None and time.monotonic() < self._token_expire_at
+
+    def _parse_token_response(self, body):
+        try:
+            token_result = json.loads(body.decode('utf-8'))
+        except ValueError:
+            return None
+        return self._store_token(token_result)
+
+    def _parse_ocr_response(self, status, body):
+        try:
+            return json.loads(body.decode('utf-8')) or {}
+        except ValueError:
+            return {'error_code': status, 'error_msg': body.decode('utf-8', 'replace')[:200]}
+
+    def get_access_token(self, refresh=False):
+        """同步获取access_token，未过期时直接使用缓存
+
+        Args:
+            refresh (bool): 是否强制重新获取
+
+        Returns:
+            str or None: access_token，获取失败时返回None
+        """
+        with self._sync_token_lock:
+            if not refresh and self._token_valid():
+                return self._access_token
+            status, body = self._http_request('GET', self.build_token_url())
+            return self._parse_token_response(body)
+
+    def recognize(self, api_name, image_data, options):
+        """同步调用百度OCR识别接口
+
+        Args:
+            api_name (str): 接口名称，见OCR_API_PATHS
+            image_data (bytes): 图片的二进制数据
+            options (dict): 识别选项
+
+        Returns:
+            dict: 接口返回的JSON，与aip SDK的返回格式相同
+        """
+        access_token = self.get_access_token()
+        if access_token is None:
+            return {'error_code': 110, 'error_msg': 'Access token invalid or no longer valid'}
+
+        result = self._post_ocr(api_name, image_data, options, access_token)
+        # token失效时与aip SDK一样刷新一次后重试
+        if result.get('error_code') in (110, 111):
+            PipelineMetrics.count('ocr_retries')
+            access_token = self.get_access_token(refresh=True)
+            if access_token is None:
+                return result
+            result = self._post_ocr(api_name, image_data, options, access_token)
+        return result
+
+    def _post_ocr(self, api_name, image_data, options, access_token):
+        url, body = self.build_ocr_request(api_name, image_data, options, access_token)
+        status, response_body = self._http_request(
+            'POST', url, body, {'Content-Type': 'application/x-www-form-urlencoded'}
+        )
+        return self._parse_ocr_response(status, response_body)
+
+    def _http_request(self, method, url, body=b'', headers=None):
+        """同步发送一次HTTP请求并读取完整响应
+
+        Args:
+            method (str): 请求方法
+            url (str): 完整URL
+            body (bytes): 请求正文
+            headers (dict): 额外的请求头
+
+        Returns:
+            tuple: (状态码, 响应正文bytes)
+        """
+        parts = urlsplit(url)
+        if parts.scheme == 'https':
+            connection = http.client.HTTPSConnection(parts.hostname, parts.port, timeout=self.timeout)
+        else:
+            connection = http.client.HTTPConnection(parts.hostname, parts.port, timeout=self.timeout)
+        try:
+            path = parts.path or '/'
+            if parts.query:
+                path = f'{path}?{parts.query}'
+            request_headers = {'Accept': 'application/json'}
+            request_headers.update(headers or {})
+            connection.request(method, path, body=body or None, headers=request_headers)
+            response = connection.getresponse()
+            return response.status, response.read()
+        finally:
+            connection.close()
+
+    async def get_access_token_async(self, refresh=False):
+        """获取access_token，未过期时直接使用缓存
+
+        Args:
+            refresh (bool): 是否强制重新获取
+
+        Returns:
+            str or None: access_token，获取失败时返回None
+        """
+        # 锁需要与当前事件循环绑定，复用客户端跨多个事件循环时重新创建
+        loop = asyncio.get_event_loop()
+        if self._token_lock is None or self._token_lock_loop is not loop:
+            self._token_lock = asyncio.Lock()
+            self._token_lock_loop = loop
+        async with self._token_lock:
+            if not refresh and self._token_valid():
+                return self._access_token
+            status, body = await self._http_request_async('GET', self.build_token_url())
+            return self._parse_token_response(body)
+
+    async def recognize_async(self, api_name, image_data, options):
+        """异步调用百度OCR识别接口
+
+        Args:
+            api_name (str): 接口名称，见OCR_API_PATHS
+            image_data (bytes): 图片的二进制数据
+            options (dict): 识别选项
+
+        Returns:
+            dict: 接口返回的JSON，与aip SDK的返回格式相同
+        """
+        access_token = await self.get_access_token_async()
+        if access_token is None:
+            return {'error_code': 110, 'error_msg': 'Access token invalid or no longer valid'}
+
+        result = await self._post_ocr_async(api_name, image_data, options, access_token)
+        # token失效时与aip SDK一样刷新一次后重试
+        if result.get('error_code') in (110, 111):
+            PipelineMetrics.count('ocr_retries')
+            access_token = await self.get_access_token_async(refresh=True)
+            if access_token is None:
+                return result
+            result = await self._post_ocr_async(api_name, image_data, options, access_token)
+        return result
+
+    async def _post_ocr_async(self, api_name, image_data, options, access_token):
+        url, body = self.build_ocr_request(api_name, image_data, options, access_token)
+        status, response_body = await self._http_request_async(
+            'POST', url, body, {'Content-Type': 'application/x-www-form-urlencoded'}
+        )
+        return self._parse_ocr_response(status, response_body)
+
+    async def _http_request_async(self, method, url, body=b'', headers=None):
+        """发送一次HTTP/1.1请求并读取完整响应
+
+        Args:
+            method (str): 请求方法
+            url (str): 完整URL
+            body (bytes): 请求正文
+            headers (dict): 额外的请求头
+
+        Returns:
+            tuple: (状态码, 响应正文bytes)
+        """
+        return await asyncio.wait_for(self._http_exchange(method, url, body, headers), self.timeout)
+
+    async def _http_exchange(self, method, url, body, headers):
+        parts = urlsplit(url)
+        is_https = parts.scheme == 'https'
+        port = parts.port or (443 if is_https else 80)
+        ssl_context = ssl.create_default_context() if is_https else None
+        reader, writer = await asyncio.open_connection(parts.hostname, port, ssl=ssl_context)
+        try:
+            path = parts.path or '/'
+            if parts.query:
+                path = f'{path}?{parts.query}'
+            request_headers = {
+                'Host': parts.netloc,
+                'Content-Length': str(len(body)),
+                'Connection': 'close',
+                'Accept': 'application/json'
+            }
+            request_headers.update(headers or {})
+            head = f'{method} {path} HTTP/1.1\r\n'
+            head += ''.join(f'{key}: {value}\r\n' for key, value in request_headers.items())
+            writer.write(head.encode('latin-1') + b'\r\n' + body)
+            await writer.drain()
+
+            # 解析状态行和响应头
+            status_line = await reader.readline()
+            if not status_line:
+                # 服务器没有返回任何内容就关闭了连接
+                raise asyncio.IncompleteReadError(b'', None)
+            status = int(status_line.split()[1])
+            response_headers = {}
+            while True:
+                line = await reader.readline()
+                if line in (b'\r\n', b'\n', b''):
+                    break
+                key, _, value = line.decode('latin-1').partition(':')
+                response_headers[key.strip().lower()] = value.strip()
+
+            # 读取响应正文，兼容分块传输编码
+            if response_headers.get('transfer-encoding', '').lower() == 'chunked':
+                chunks = []
+                while True:
+                    size = int((await reader.readline()).split(b';')[0].strip(), 16)
+                    if size == 0:
+                        await reader.readline()
+                        break
+                    chunks.append(await reader.readexactly(size))
+                    await reader.readline()
+                response_body = b''.join(chunks)
+            elif 'content-length' in response_headers:
+                response_body = await reader.readexactly(int(response_headers['content-length']))
+            else:
+                response_body = await reader.read()
+            return status, response_body
+        finally:
+            writer.close()
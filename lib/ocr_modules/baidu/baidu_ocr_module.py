@@ -1,12 +1,45 @@
-import os
 import json
+import time
+import random
+import asyncio
+import threading
+import http.client
 from ocr_core.ocr_module_interface import OCRModuleInterface
+from ocr_core.ocr_image import read_image_bytes, get_image_name
+from ocr_core.rate_limiter import QuotaExhaustedError
 from ocr_modules.baidu.debug_utils import BaiduOCRDebugUtils
+from ocr_modules.baidu.baidu_http_client import BaiduHttpClient, DEFAULT_BASE_URL
 from aip import AipOcr
 from lang_manager import LangManager
+from log_manager import LogManager
+from metrics import PipelineMetrics
+
+# 调用额度用尽的错误码: 每日额度、总额度，继续请求只会失败
+QUOTA_ERROR_CODES = frozenset({17, 19})
+# 临时性错误的错误码，等待后重试可能成功:
+# 未知错误、服务暂不可用、集群超限额、QPS超限、识别错误、服务器内部错误
+RETRYABLE_ERROR_CODES = frozenset({1, 2, 4, 18, 216630, 282000})
+# 网络层面的临时性异常，requests的异常也是OSError的子类；
+# 异步客户端在服务器提前关闭连接时抛出asyncio.IncompleteReadError(EOFError的子类)
+RETRYABLE_EXCEPTIONS = (
+    OSError, http.client.HTTPException, asyncio.TimeoutError, asyncio.IncompleteReadError, EOFError
+)
 
 class BaiduOCRModule(OCRModuleInterface):
-    """百度OCR模块实现"""
+    """百度OCR模块实现
+
+    识别文本使用不含位置的basicAccurate和basicGeneral接口；需要把拼接图片的结果拆回各张截图时，
+    recognize_words改用返回文字块和单字位置的accurate和general接口(需要在模块配置中启用BAIDU_WORD_LOCATIONS)。
+
+    接口返回的错误分为三类：临时性错误(QPS超限、服务器内部错误、网络异常等)按带随机抖动的指数退避重试，
+    最多重试max_retries次，每次重试前重新获取请求配额；额度用尽(每日或总额度)时标记共享限流器的额度已用尽，
+    之后的识别请求不再发出；其他错误(图片过大、格式错误等)重试也不会成功，直接返回失败。
+    """
+
+    # 第一次重试前的最长等待时间(秒)，之后每次翻倍
+    RETRY_BASE_DELAY = 0.5
+    # 重试前等待时间的上限(秒)
+    RETRY_MAX_DELAY = 8.0
 
     # 通用语言代码到百度OCR API语言类型的映射
     LANGUAGE_MAP = {
@@ -28,10 +61,38 @@ class BaiduOCRModule(OCRModuleInterface):
         self.api_key = None
         self.secret_key = None
         self.ocr_client = None
-        self.last_recognition_debug_info = {}
-        self.last_recognized_text = None
-        self.last_image_path = None
+        self.http_client = None
+        # 接口地址不是百度官方地址时同步识别也使用http_client，aip SDK的接口地址不可修改
+        self.use_http_client = False
+        # 临时性错误的最大重试次数
+        self.max_retries = 3
         self.ocr_options = None
+        # 上一次识别的状态按线程保存，并发识别时互不覆盖
+        self._local = threading.local()
+
+    @property
+    def last_recognition_debug_info(self):
+        return getattr(self._local, 'recognition_debug_info', {})
+
+    @last_recognition_debug_info.setter
+    def last_recognition_debug_info(self, value):
+        self._local.recognition_debug_info = value
+
+    @property
+    def last_recognized_text(self):
+        return getattr(self._local, 'recognized_text', None)
+
+    @last_recognized_text.setter
+    def last_recognized_text(self, value):
+        self._local.recognized_text = value
+
+    @property
+    def last_image_path(self):
+        return getattr(self._local, 'image_path', None)
+
+    @last_image_path.setter
+    def last_image_path(self, value):
+        self._local.image_path = value
 
     def init_ocr_client(self):
         """初始化百度OCR客户端和特有选项"""
@@ -44,13 +105,21 @@ class BaiduOCRModule(OCRModuleInterface):
 
             # 创建OCR客户端
             self.ocr_client = AipOcr(self.app_id, self.api_key, self.secret_key)
+            # 创建异步识别使用的HTTP客户端，BAIDU_API_BASE_URL可以指向本地的模拟服务器
+            base_url = (ConfigManager.get('BAIDU_API_BASE_URL', DEFAULT_BASE_URL) or DEFAULT_BASE_URL).rstrip('/')
+            self.http_client = BaiduHttpClient(self.api_key, self.secret_key, base_url=base_url)
+            self.use_http_client = base_url != DEFAULT_BASE_URL
+            try:
+                self.max_retries = max(0, int(ConfigManager.get('BAIDU_MAX_RETRIES', 3)))
+            except (TypeError, ValueError):
+                self.max_retries = 3
 
             # 初始化OCR选项
             self._init_ocr_options()
 
             return True
         except Exception as e:
-            print(f"初始化百度OCR客户端失败: {str(e)}")
+            LogManager.error(f"初始化百度OCR客户端失败: {str(e)}")
             return False
 
     def _init_ocr_options(self):
@@ -97,54 +166,365 @@ class BaiduOCRModule(OCRModuleInterface):
         """使用百度OCR识别图片中的文本
 
         Args:
-            image_path (str): 图片文件路径
+            image_path (str or bytes or OCRImage): 图片文件路径、编码数据或内存图片
 
         Returns:
             str: 识别出的文本，失败时返回None
         """
+        return self._recognize(image_path, with_locations=False)
+
+    def supports_word_locations(self):
+        """是否使用返回文字块位置的接口识别拼接图片
+
+        Returns:
+            bool: 模块配置BAIDU_WORD_LOCATIONS的值，默认为False，继续使用不含位置的basicAccurate/basicGeneral接口
+        """
         from config.config_manager import ConfigManager
+        return str(ConfigManager.get('BAIDU_WORD_LOCATIONS', 'False')).lower() == 'true'
+
+    def recognize_words(self, image_path):
+        """使用百度OCR含位置信息的接口识别图片中的文本和文字块位置
+
+        Args:
+            image_path (str or bytes or OCRImage): 图片文件路径、编码数据或内存图片
+
+        Returns:
+            list: 文字块列表，每个文字块包含words、location和chars(单字位置)，失败时返回None
+        """
+        return self._recognize(image_path, with_locations=True)
+
+    def _recognize(self, image_path, with_locations):
+        """同步识别图片，临时性错误退避后重试
+
+        Args:
+            image_path (str or bytes or OCRImage): 图片文件路径、编码数据或内存图片
+            with_locations (bool): 是否使用含位置信息的接口并返回文字块列表
+
+        Returns:
+            str or list: with_locations为False时返回识别出的文本，否则返回文字块列表，失败时返回None
+        """
         if self.ocr_client is None:
             if not self.init_ocr_client():
                 return None
 
         try:
-            with open(image_path, 'rb') as f:
-                image_data = f.read()
+            image_data = read_image_bytes(image_path)
 
             # 使用实例属性中的OCR选项
-            default_options = self.ocr_options.copy()
+            default_options = self._get_request_options(with_locations)
+            api_name = self._get_api_name(default_options, with_locations)
+
+            # 调用百度OCR API识别文本，临时性错误退避后重试
+            attempt = 0
+            while True:
+                try:
+                    result = self._request(api_name, image_data, default_options)
+                except RETRYABLE_EXCEPTIONS as e:
+                    if attempt >= self.max_retries:
+                        raise
+                    result = {'error_msg': str(e)}
+                else:
+                    if attempt >= self.max_retries or self.classify_error(result) != 'retryable':
+                        break
+                attempt += 1
+                delay = self._get_retry_delay(attempt, result)
+                # 重试同样占用请求配额，限流器已等待的时间计入退避时间
+                waited = self._acquire_retry_slot()
+                if delay > waited:
+                    time.sleep(delay - waited)
+                PipelineMetrics.add_time('retry_wait', max(delay, waited))
+
+            self._check_quota(result)
+            return self._handle_result(result, default_options, image_path, with_locations)
+        except QuotaExhaustedError:
+            self.last_recognized_text = None
+            raise
+        except Exception as e:
+            LogManager.error(LangManager.get_module_lang('recognize_error'), str(e))
+            self.last_recognized_text = None
+            return None
 
-            # 调用百度OCR API识别文本
-            if default_options.get('accuracy') == 'high':
-                # 高精度模式
-                result = self.ocr_client.basicAccurate(image_data, default_options)
-            else:
-                # 通用模式
-                result = self.ocr_client.basicGeneral(image_data, default_options)
-
-            # 收集调试信息
-            self.last_recognition_debug_info = {
-                'options': default_options,
-                'result': result,
-                'image_path': image_path
-            }
-            self.last_image_path = image_path
-
-            # 处理识别结果
-            if 'words_result' in result:
-                text = '\n'.join([item['words'] for item in result['words_result']])
-                self.last_recognized_text = text
-                return text
-            else:
-                error_msg = result.get('error_msg', '识别失败')
-                print(LangManager.get_module_lang('recognize_fail').format(error_msg))
-                self.last_recognized_text = None
+    def _get_request_options(self, with_locations):
+        """获取一次请求的识别选项
+
+        Args:
+            with_locations (bool): 是否使用含位置信息的接口
+
+        Returns:
+            dict: 识别选项的副本，含位置信息的接口还要求返回单字的位置
+        """
+        options = self.ocr_options.copy()
+        if with_locations:
+            options['recognize_granularity'] = 'small'
+        return options
+
+    @staticmethod
+    def _get_api_name(options, with_locations):
+        """按识别精度和是否需要位置信息选择接口
+
+        Returns:
+            str: aip SDK的方法名，也是BaiduHttpClient的接口名称
+        """
+        if options.get('accuracy') == 'high':
+            # 高精度模式
+            return 'accurate' if with_locations else 'basicAccurate'
+        # 通用模式
+        return 'general' if with_locations else 'basicGeneral'
+
+    def _request(self, api_name, image_data, options):
+        """同步发送一次识别请求
+
+        Args:
+            api_name (str): 接口名称，见_get_api_name
+            image_data (bytes): 图片的二进制数据
+            options (dict): 识别选项
+
+        Returns:
+            dict: 接口返回的JSON
+        """
+        if self.use_http_client:
+            return self.http_client.recognize(api_name, image_data, options)
+        return getattr(self.ocr_client, api_name)(image_data, options)
+
+    @staticmethod
+    def classify_error(result):
+        """按错误码对接口返回结果分类
+
+        Args:
+            result (dict): 百度OCR接口返回的JSON
+
+        Returns:
+            str: ok表示没有错误，retryable表示可以重试的临时性错误，
+                quota表示调用额度已用尽，permanent表示重试也不会成功的错误
+        """
+        if 'words_result' in result:
+            return 'ok'
+        try:
+            error_code = int(result.get('error_code'))
+        except (TypeError, ValueError):
+            # 没有错误码的异常响应(例如网关返回的错误页面)按临时性错误处理
+            return 'retryable'
+        if error_code in QUOTA_ERROR_CODES:
+            return 'quota'
+        if error_code in RETRYABLE_ERROR_CODES:
+            return 'retryable'
+        return 'permanent'
+
+    def _get_retry_delay(self, attempt, result):
+        """计算第attempt次重试前的等待时间并输出提示
+
+        使用全随机抖动的指数退避：在0到min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2^(attempt-1))之间随机取值，
+        同时失败的多个请求不会在同一时刻再次发出。
+
+        Args:
+            attempt (int): 第几次重试，从1开始
+            result (dict): 上一次请求的返回结果或异常信息
+
+        Returns:
+            float: 等待时间(秒)
+        """
+        delay = random.uniform(0, min(self.RETRY_MAX_DELAY, self.RETRY_BASE_DELAY * 2 ** (attempt - 1)))
+        PipelineMetrics.count('ocr_retries')
+        LogManager.warning(
+            LangManager.get_module_lang('recognize_retry'),
+            result.get('error_code', '-'), result.get('error_msg', ''), delay, attempt, self.max_retries
+        )
+        return delay
+
+    def _acquire_retry_slot(self):
+        """为重试获取请求配额，必要时阻塞等待
+
+        Returns:
+            float: 限流器等待的秒数
+
+        Raises:
+            QuotaExhaustedError: 每日额度已用尽
+        """
+        from ocr_core.ocr_module import OCRModule
+        waited = OCRModule.get_instance().acquire_rate_limit()
+        if waited is None:
+            raise QuotaExhaustedError()
+        return waited
+
+    async def _acquire_retry_slot_async(self):
+        """_acquire_retry_slot的异步版本，等待期间不阻塞事件循环"""
+        from ocr_core.ocr_module import OCRModule
+        waited = await OCRModule.get_instance().acquire_rate_limit_async()
+        if waited is None:
+            raise QuotaExhaustedError()
+        return waited
+
+    def _check_quota(self, result):
+        """接口返回额度用尽时标记共享限流器的额度已用尽，之后的请求不再发出
+
+        Args:
+            result (dict): 百度OCR接口返回的JSON
+
+        Raises:
+            QuotaExhaustedError: 接口返回额度用尽
+        """
+        if self.classify_error(result) != 'quota':
+            return
+        from ocr_core.ocr_module import OCRModule
+        OCRModule.get_instance().get_rate_limiter().mark_exhausted()
+        LogManager.error(
+            LangManager.get_module_lang('quota_exhausted_stop'), result.get('error_code'), result.get('error_msg', '')
+        )
+        raise QuotaExhaustedError()
+
+    def get_cache_key_options(self):
+        """获取影响识别结果的百度OCR选项
+
+        Returns:
+            dict: _init_ocr_options生成的识别选项，包含识别精度、语言和字体设置，
+                使用模拟服务器等非官方接口地址时还包含该地址，避免与真实接口的结果混用
+        """
+        from config.config_manager import ConfigManager
+        if self.ocr_options is None:
+            self._init_ocr_options()
+        options = dict(self.ocr_options)
+        base_url = (ConfigManager.get('BAIDU_API_BASE_URL', DEFAULT_BASE_URL) or DEFAULT_BASE_URL).rstrip('/')
+        if base_url != DEFAULT_BASE_URL:
+            options['api_base_url'] = base_url
+        return options
+
+    def supports_native_async(self):
+        """百度模块通过BaiduHttpClient提供不阻塞事件循环的原生异步实现
+
+        Returns:
+            bool: 始终返回True
+        """
+        return True
+
+    async def recognize_text_async(self, image_path):
+        """使用asyncio原生HTTP客户端识别图片中的文本
+
+        Args:
+            image_path (str or bytes or OCRImage): 图片文件路径、编码数据或内存图片
+
+        Returns:
+            str: 识别出的文本，失败时返回None
+        """
+        return await self._recognize_async(image_path, with_locations=False)
+
+    async def recognize_words_async(self, image_path):
+        """使用asyncio原生HTTP客户端识别图片中的文本和文字块位置
+
+        Args:
+            image_path (str or bytes or OCRImage): 图片文件路径、编码数据或内存图片
+
+        Returns:
+            list: 与recognize_words格式相同的文字块列表，失败时返回None
+        """
+        return await self._recognize_async(image_path, with_locations=True)
+
+    async def _recognize_async(self, image_path, with_locations):
+        """_recognize的异步版本，等待响应和退避时不阻塞事件循环
+
+        Args:
+            image_path (str or bytes or OCRImage): 图片文件路径、编码数据或内存图片
+            with_locations (bool): 是否使用含位置信息的接口并返回文字块列表
+
+        Returns:
+            str or list: 与_recognize相同
+        """
+        if self.http_client is None:
+            if not self.init_ocr_client():
                 return None
+
+        try:
+            # 读取文件交给线程池，避免阻塞事件循环，内存图片直接使用
+            if isinstance(image_path, str):
+                loop = asyncio.get_event_loop()
+                image_data = await loop.run_in_executor(None, read_image_bytes, image_path)
+            else:
+                image_data = read_image_bytes(image_path)
+
+            # 使用实例属性中的OCR选项
+            default_options = self._get_request_options(with_locations)
+            api_name = self._get_api_name(default_options, with_locations)
+
+            # 临时性错误退避后重试，与recognize_text相同
+            attempt = 0
+            while True:
+                try:
+                    result = await self.http_client.recognize_async(api_name, image_data, default_options)
+                except RETRYABLE_EXCEPTIONS as e:
+                    if attempt >= self.max_retries:
+                        raise
+                    result = {'error_msg': str(e) or type(e).__name__}
+                else:
+                    if attempt >= self.max_retries or self.classify_error(result) != 'retryable':
+                        break
+                attempt += 1
+                delay = self._get_retry_delay(attempt, result)
+                waited = await self._acquire_retry_slot_async()
+                if delay > waited:
+                    await asyncio.sleep(delay - waited)
+                PipelineMetrics.add_time('retry_wait', max(delay, waited))
+
+            # 从这里到返回之间没有await，调试信息不会被同一线程中的其他协程覆盖
+            self._check_quota(result)
+            return self._handle_result(result, default_options, image_path, with_locations)
+        except QuotaExhaustedError:
+            self.last_recognized_text = None
+            raise
         except Exception as e:
-            print(LangManager.get_module_lang('recognize_error').format(str(e)))
+            LogManager.error(LangManager.get_module_lang('recognize_error'), str(e))
             self.last_recognized_text = None
             return None
 
+    def _handle_result(self, result, options, image_path, with_locations=False):
+        """记录调试信息并从接口返回结果中提取文本
+
+        Args:
+            result (dict): 百度OCR接口返回的JSON
+            options (dict): 本次请求使用的OCR选项
+            image_path (str or bytes or OCRImage): 图片文件路径、编码数据或内存图片
+            with_locations (bool): 是否返回文字块列表
+
+        Returns:
+            str or list: 识别出的文本，with_locations为True时为文字块列表，失败时返回None
+        """
+        # 收集调试信息
+        self.last_recognition_debug_info = {
+            'options': options,
+            'result': result,
+            'image_path': image_path if isinstance(image_path, str) else get_image_name(image_path)
+        }
+        self.last_image_path = image_path
+
+        # 处理识别结果
+        if 'words_result' in result:
+            text = '\n'.join([item['words'] for item in result['words_result']])
+            self.last_recognized_text = text
+            if with_locations:
+                return self._extract_words(result)
+            return text
+        else:
+            error_msg = result.get('error_msg', '识别失败')
+            LogManager.error(LangManager.get_module_lang('recognize_fail'), error_msg)
+            self.last_recognized_text = None
+            return None
+
+    @staticmethod
+    def _extract_words(result):
+        """从含位置信息的接口返回结果中提取文字块列表
+
+        Args:
+            result (dict): accurate或general接口返回的JSON
+
+        Returns:
+            list: 文字块列表，格式见OCRModuleInterface.recognize_words
+        """
+        words = []
+        for item in result['words_result']:
+            word = {'words': item.get('words', ''), 'location': item.get('location')}
+            if item.get('chars'):
+                word['chars'] = [{'char': char.get('char', ''), 'location': char.get('location')} for char in item['chars']]
+            words.append(word)
+        return words
+
     def get_recognition_debug_info(self):
         """获取上一次OCR识别的完整调试信息条目
 
@@ -159,7 +539,7 @@ class BaiduOCRModule(OCRModuleInterface):
         use_custom_font = ConfigManager.get('USE_CUSTOM_FONT', False)
 
         # 提取文件名
-        file_name = os.path.basename(self.last_image_path)
+        file_name = get_image_name(self.last_image_path)
 
         # 生成调试信息条目
         debug_info = self.last_recognition_debug_info
@@ -171,11 +551,32 @@ class BaiduOCRModule(OCRModuleInterface):
     def get_api_delay(self):
         """获取API调用之间的延迟时间(秒)
 
+        仅为兼容旧接口保留，实际的频率控制由get_rate_limits声明
+
         Returns:
             float: API调用之间的延迟时间，固定为1.5秒
         """
         return 1.5  # 固定值
 
+    def get_rate_limits(self):
+        """获取百度OCR接口的调用频率限制
+
+        Returns:
+            dict: 频率限制字典，数值来自模块配置的BAIDU_QPS、BAIDU_BURST和BAIDU_DAILY_QUOTA
+        """
+        from config.config_manager import ConfigManager
+        try:
+            qps = float(ConfigManager.get('BAIDU_QPS', 2))
+            burst = int(ConfigManager.get('BAIDU_BURST', 1))
+            daily_quota = int(ConfigManager.get('BAIDU_DAILY_QUOTA', 0))
+        except (TypeError, ValueError):
+            qps, burst, daily_quota = 2.0, 1, 0
+        return {
+            'qps': qps,
+            'burst': burst,
+            'daily_quota': daily_quota
+        }
+
     def get_max_width(self):
         """获取OCR模块支持的最大图片宽度(像素)
 
@@ -190,4 +591,24 @@ class BaiduOCRModule(OCRModuleInterface):
         Returns:
             int: 支持的最大图片高度，固定为8192像素
         """
-        return 8192  # 固定值
\ No newline at end of file
+        return 8192  # 固定值
+
+    def get_max_payload_bytes(self):
+        """获取OCR模块单次请求支持的最大图片数据量(字节)
+
+        接口要求base64编码后的图片不超过10MB，base64编码会使数据量增加约1/3
+
+        Returns:
+            int: 编码后图片数据的最大字节数，固定为7MB
+        """
+        return 7 * 1024 * 1024
+
+    def get_supported_formats(self):
+        """获取OCR模块接受的图片编码格式
+
+        接口支持jpg、jpeg、png和bmp格式
+
+        Returns:
+            list: ['PNG', 'JPEG', 'BMP']
+        """
+        return ['PNG', 'JPEG', 'BMP']
\ No newline at end of file
@@ -3,6 +3,7 @@ import json
 import sys
 
 from lang_manager import LangManager
+from log_manager import LogManager
 from config.config_manager import ConfigManager
 
 # 百度OCR模块的bootstrap
@@ -52,6 +53,42 @@ def get_required_config_items():
             'default': 'your_secret_key',
             'description_key': 'baidu_secret_key_desc',
             'cannot_use_default': True
+        },
+        'BAIDU_QPS': {
+            'type': 'float',
+            'min_value': 0,
+            'default': '2',
+            'description_key': 'baidu_qps_desc'
+        },
+        'BAIDU_BURST': {
+            'type': 'integer',
+            'min_value': 1,
+            'default': '1',
+            'description_key': 'baidu_burst_desc'
+        },
+        'BAIDU_DAILY_QUOTA': {
+            'type': 'integer',
+            'min_value': 0,
+            'default': '0',
+            'description_key': 'baidu_daily_quota_desc'
+        },
+        'BAIDU_MAX_RETRIES': {
+            'type': 'integer',
+            'min_value': 0,
+            'max_value': 10,
+            'default': '3',
+            'description_key': 'baidu_max_retries_desc'
+        },
+        'BAIDU_WORD_LOCATIONS': {
+            'type': 'boolean',
+            'options': ['True', 'False'],
+            'default': 'False',
+            'description_key': 'baidu_word_locations_desc'
+        },
+        'BAIDU_API_BASE_URL': {
+            'type': 'str',
+            'default': 'https://aip.baidubce.com',
+            'description_key': 'baidu_api_base_url_desc'
         }
     }
 
@@ -97,43 +134,43 @@ def _download_file_from_github(github_path, local_path, download_url, default_la
 
             # 尝试使用语言数据，如果失败则使用默认文本
             try:
-                print(LangManager.get_module_lang('download_success').format(local_path))
+                LogManager.info(LangManager.get_module_lang('download_success'), local_path)
             except (KeyError, Exception):
                 if default_lang_data and 'download_success' in default_lang_data:
-                    print(default_lang_data['download_success'].format(local_path))
+                    LogManager.info(default_lang_data['download_success'], local_path)
                 else:
-                    print(f'下载成功: {local_path}')
+                    LogManager.info(f'下载成功: {local_path}')
             return True
         except requests.exceptions.RequestException as e:
             error_msg = str(e)
             if attempt < max_retries - 1:
                 # 尝试使用语言数据，如果失败则使用默认文本
                 try:
-                    print(LangManager.get_module_lang('download_fail').format(url, error_msg))
-                    print(LangManager.get_module_lang('retry_attempt').format(attempt+1))
+                    LogManager.error(LangManager.get_module_lang('download_fail'), url, error_msg)
+                    LogManager.warning(LangManager.get_module_lang('retry_attempt'), attempt+1)
                 except (KeyError, Exception):
                     if default_lang_data:
                         if 'download_fail' in default_lang_data:
-                            print(default_lang_data['download_fail'].format(url, error_msg))
+                            LogManager.error(default_lang_data['download_fail'], url, error_msg)
                         if 'retry_attempt' in default_lang_data:
-                            print(default_lang_data['retry_attempt'].format(attempt+1))
+                            LogManager.warning(default_lang_data['retry_attempt'], attempt+1)
                     else:
-                        print(f'下载失败 ({url}): {error_msg}')
-                        print(f'重试尝试 {attempt+1}...')
+                        LogManager.error(f'下载失败 ({url}): {error_msg}')
+                        LogManager.warning(f'重试尝试 {attempt+1}...')
             else:
                 # 尝试使用语言数据，如果失败则使用默认文本
                 try:
-                    print(LangManager.get_module_lang('download_fail').format(url, error_msg))
-                    print(LangManager.get_module_lang('max_retries_reached').format(max_retries))
+                    LogManager.error(LangManager.get_module_lang('download_fail'), url, error_msg)
+                    LogManager.error(LangManager.get_module_lang('max_retries_reached'), max_retries)
                 except (KeyError, Exception):
                     if default_lang_data:
                         if 'download_fail' in default_lang_data:
-                            print(default_lang_data['download_fail'].format(url, error_msg))
+                            LogManager.error(default_lang_data['download_fail'], url, error_msg)
                         if 'max_retries_reached' in default_lang_data:
-                            print(default_lang_data['max_retries_reached'].format(max_retries))
+                            LogManager.error(default_lang_data['max_retries_reached'], max_retries)
                     else:
-                        print(f'下载失败 ({url}): {error_msg}')
-                        print(f'已达到最大重试次数 ({max_retries})')
+                        LogManager.error(f'下载失败 ({url}): {error_msg}')
+                        LogManager.error(f'已达到最大重试次数 ({max_retries})')
     return False
 
 
@@ -150,8 +187,10 @@ def _check_module_files(module_dir, download_url, default_lang_data=None):
     critical_files_downloaded = True
 
     # 定义模块目录结构
+    # 下载地址固定在0.1.1版本，之后新增的文件放在unpublished_files中，只检查是否存在，不尝试下载
     MODULE_STRUCTURE = {
         'files': ['__init__.py', 'baidu_ocr_module.py', 'module_bootstrap.py', 'debug_utils.py'],
+        'unpublished_files': ['baidu_http_client.py'],
         'subdirectories': {
             'lang': {
                 'files': ['zh-cn.json', 'en.json']
@@ -167,53 +206,53 @@ def _check_module_files(module_dir, download_url, default_lang_data=None):
         if not os.path.exists(base_path):
             # 为dir_not_found添加异常处理
             try:
-                print(LangManager.get_module_lang('dir_not_found').format(base_path))
+                LogManager.info(LangManager.get_module_lang('dir_not_found'), base_path)
             except (KeyError, Exception):
                 if default_lang_data and 'dir_not_found' in default_lang_data:
-                    print(default_lang_data['dir_not_found'].format(base_path))
+                    LogManager.info(default_lang_data['dir_not_found'], base_path)
                 else:
-                    print(f'目录未找到: {base_path}')
+                    LogManager.info(f'目录未找到: {base_path}')
             os.makedirs(base_path, exist_ok=True)
             # 为dir_created添加异常处理
             try:
-                print(LangManager.get_module_lang('dir_created').format(base_path))
+                LogManager.info(LangManager.get_module_lang('dir_created'), base_path)
             except (KeyError, Exception):
                 if default_lang_data and 'dir_created' in default_lang_data:
-                    print(default_lang_data['dir_created'].format(base_path))
+                    LogManager.info(default_lang_data['dir_created'], base_path)
                 else:
-                    print(f'已创建目录: {base_path}')
+                    LogManager.info(f'已创建目录: {base_path}')
 
         # 检查当前目录中的文件
         if 'files' in dir_config:
             # 为dir_checking添加异常处理
             try:
-                print(LangManager.get_module_lang('dir_checking').format(base_path))
+                LogManager.debug(LangManager.get_module_lang('dir_checking'), base_path)
             except (KeyError, Exception):
                 if default_lang_data and 'dir_checking' in default_lang_data:
-                    print(default_lang_data['dir_checking'].format(base_path))
+                    LogManager.debug(default_lang_data['dir_checking'], base_path)
                 else:
-                    print(f'正在检查目录: {base_path}')
+                    LogManager.debug(f'正在检查目录: {base_path}')
             for file_name in dir_config['files']:
                 file_path = os.path.join(base_path, file_name)
                 # 检查文件是否存在
                 if os.path.exists(file_path):
                     # 为file_found添加异常处理
                     try:
-                        print(LangManager.get_module_lang('file_found').format(file_path))
+                        LogManager.debug(LangManager.get_module_lang('file_found'), file_path)
                     except (KeyError, Exception):
                         if default_lang_data and 'file_found' in default_lang_data:
-                            print(default_lang_data['file_found'].format(file_path))
+                            LogManager.debug(default_lang_data['file_found'], file_path)
                         else:
-                            print(f'找到文件: {file_path}')
+                            LogManager.debug(f'找到文件: {file_path}')
                 else:
                     # 为file_not_found添加异常处理
                     try:
-                        print(LangManager.get_module_lang('file_not_found').format(file_path))
+                        LogManager.info(LangManager.get_module_lang('file_not_found'), file_path)
                     except (KeyError, Exception):
                         if default_lang_data and 'file_not_found' in default_lang_data:
-                            print(default_lang_data['file_not_found'].format(file_path))
+                            LogManager.info(default_lang_data['file_not_found'], file_path)
                         else:
-                            print(f'未找到文件: {file_path}')
+                            LogManager.info(f'未找到文件: {file_path}')
                     # 构建GitHub路径
                     github_path = f'{github_prefix}/{file_name}' if github_prefix else file_name
                     # 从GitHub下载文件
@@ -221,12 +260,25 @@ def _check_module_files(module_dir, download_url, default_lang_data=None):
                         critical_files_downloaded = False
                         # 为critical_file_download_fail添加异常处理
                         try:
-                            print(LangManager.get_module_lang('critical_file_download_fail').format(github_path))
+                            LogManager.error(LangManager.get_module_lang('critical_file_download_fail'), github_path)
                         except (KeyError, Exception):
                             if default_lang_data and 'critical_file_download_fail' in default_lang_data:
-                                print(default_lang_data['critical_file_download_fail'].format(github_path))
+                                LogManager.error(default_lang_data['critical_file_download_fail'], github_path)
                             else:
-                                print(f'关键文件下载失败: {github_path}')
+                                LogManager.error(f'关键文件下载失败: {github_path}')
+
+        # 下载地址中还没有的文件只检查是否存在
+        for file_name in dir_config.get('unpublished_files', []):
+            file_path = os.path.join(base_path, file_name)
+            if os.path.exists(file_path):
+                continue
+            try:
+                LogManager.warning(LangManager.get_module_lang('file_not_published'), file_path)
+            except (KeyError, Exception):
+                if default_lang_data and 'file_not_published' in default_lang_data:
+                    LogManager.warning(default_lang_data['file_not_published'], file_path)
+                else:
+                    LogManager.warning(f'文件不存在且尚未发布到下载地址，请重新获取完整的模块: {file_path}')
 
         # 递归检查子目录
         if 'subdirectories' in dir_config:
@@ -262,7 +314,7 @@ def complete_module():
         lang_dir = os.path.join(module_dir, 'lang')
         if not os.path.exists(lang_dir):
             os.makedirs(lang_dir, exist_ok=True)
-            print(f'创建语言目录: {lang_dir}')
+            LogManager.info(f'创建语言目录: {lang_dir}')
 
         # 初始使用默认语言数据
         default_lang_data = {
@@ -276,6 +328,7 @@ def complete_module():
             'retry_attempt': '重试尝试 {{}}...',
             'max_retries_reached': '已达到最大重试次数 ({{}})',
             'critical_file_download_fail': '关键文件下载失败: {{}}',
+            'file_not_published': '文件不存在且尚未发布到下载地址，请重新获取完整的模块: {{}}',
             'check_complete': '检查完成',
             'exit_due_to_download_fail': '由于文件下载失败，程序退出'
         }
@@ -285,59 +338,59 @@ def complete_module():
         for lang in languages:
             lang_file = os.path.join(lang_dir, f'{lang}.json')
             if not os.path.exists(lang_file):
-                print(f'未找到语言文件: {lang_file}')
+                LogManager.info(f'未找到语言文件: {lang_file}')
                 github_path = f'lang/{lang}.json'
                 # 传递默认语言数据给下载函数
                 if not _download_file_from_github(github_path, lang_file, download_url, default_lang_data):
-                    print(f'下载语言文件失败: {lang_file}')
+                    LogManager.error(f'下载语言文件失败: {lang_file}')
                     sys.exit(1)
             else:
-                print(f'找到语言文件: {lang_file}')
+                LogManager.debug(f'找到语言文件: {lang_file}')
 
         # 加载语言数据
         LangManager.load_module_language_file(module_dir)
         # 检查并下载模块文件
         # 为check_start添加异常处理
         try:
-            print(LangManager.get_module_lang('check_start'))
+            LogManager.info(LangManager.get_module_lang('check_start'))
         except (KeyError, Exception):
             if default_lang_data and 'check_start' in default_lang_data:
-                print(default_lang_data['check_start'])
+                LogManager.info(default_lang_data['check_start'])
             else:
-                print('开始检查模块文件...')
+                LogManager.info('开始检查模块文件...')
 
         if not _check_module_files(module_dir, download_url, default_lang_data):
             # 为exit_due_to_download_fail添加异常处理
             try:
-                print(LangManager.get_module_lang('exit_due_to_download_fail'))
+                LogManager.error(LangManager.get_module_lang('exit_due_to_download_fail'))
             except (KeyError, Exception):
                 if default_lang_data and 'exit_due_to_download_fail' in default_lang_data:
-                    print(default_lang_data['exit_due_to_download_fail'])
+                    LogManager.error(default_lang_data['exit_due_to_download_fail'])
                 else:
-                    print('由于文件下载失败，程序退出')
+                    LogManager.error('由于文件下载失败，程序退出')
             return False
 
         # 为check_complete添加异常处理
         try:
-            print(LangManager.get_module_lang('check_complete'))
+            LogManager.info(LangManager.get_module_lang('check_complete'))
         except (KeyError, Exception):
             if default_lang_data and 'check_complete' in default_lang_data:
-                print(default_lang_data['check_complete'])
+                LogManager.info(default_lang_data['check_complete'])
             else:
-                print('检查完成')
+                LogManager.info('检查完成')
         return True
     except Exception as e:
         # 为complete_fail添加异常处理和调试信息
         try:
             lang_data = LangManager.get_module_lang_data()
-            print(f'语言数据状态: {lang_data}')
+            LogManager.debug(f'语言数据状态: {lang_data}')
             if 'complete_fail' in lang_data:
-                print(lang_data['complete_fail'].format(str(e)))
+                LogManager.error(lang_data['complete_fail'], str(e))
             else:
-                print(f'补全失败: {str(e)}')
+                LogManager.error(f'补全失败: {str(e)}')
         except Exception as lang_e:
-            print(f'获取语言数据时出错: {str(lang_e)}')
-            print(f'补全失败: {str(e)}')
+            LogManager.error(f'获取语言数据时出错: {str(lang_e)}')
+            LogManager.error(f'补全失败: {str(e)}')
         return False
 
 def get_module_class():
@@ -355,4 +408,4 @@ def get_module_class():
 if __name__ == '__main__':
     # 当直接运行此文件时，可以用于测试模块补全功能
     complete_module()
-    print('百度OCR模块bootstrap完成')
\ No newline at end of file
+    LogManager.debug('百度OCR模块bootstrap完成')
\ No newline at end of file
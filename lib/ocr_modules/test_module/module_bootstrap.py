@@ -1,5 +1,6 @@
 import os
 import json
+from log_manager import LogManager
 
 # 测试OCR模块的bootstrap
 # 此文件由ModuleBootstraper加载和使用，负责模块的依赖管理、配置和初始化
@@ -29,6 +30,23 @@ def get_required_config_items():
             'type': 'bool',
             'default': True,
             'description_key': 'test_mode_desc'
+        },
+        'TEST_BATCH_SIZE': {
+            'type': 'integer',
+            'min_value': 1,
+            'max_value': 64,
+            'default': '1',
+            'description_key': 'test_batch_size_desc'
+        },
+        'TEST_ASYNC_JOBS': {
+            'type': 'boolean',
+            'default': 'False',
+            'description_key': 'test_async_jobs_desc'
+        },
+        'TEST_WORD_LOCATIONS': {
+            'type': 'boolean',
+            'default': 'False',
+            'description_key': 'test_word_locations_desc'
         }
     }
 
@@ -61,7 +79,7 @@ def complete_module():
     try:
         # 获取当前模块路径
         module_path = os.path.dirname(os.path.abspath(__file__))
-        print(f"正在补全测试模块，模块路径: {module_path}")
+        LogManager.info(f"正在补全测试模块，模块路径: {module_path}")
 
         # 硬编码完整的下载链接
         download_url = 'https://raw.githubusercontent.com/dalizi2333333/railTale_Extractor/0.1.1/lib/ocr_modules/test_module/ocr_test_module.py'
@@ -70,28 +88,30 @@ def complete_module():
         module_file_path = os.path.join(module_path, 'ocr_test_module.py')
         # 只有当文件不存在或大小为0时才下载
         if not os.path.exists(module_file_path) or os.path.getsize(module_file_path) == 0:
-            print(f"正在下载ocr_test_module.py文件从: {download_url}")
+            LogManager.info(f"正在下载ocr_test_module.py文件从: {download_url}")
             response = requests.get(download_url, timeout=10)
             if response.status_code != 200:
-                print(f"下载ocr_test_module.py失败，状态码: {response.status_code}")
+                LogManager.error(f"下载ocr_test_module.py失败，状态码: {response.status_code}")
                 raise Exception(f"无法下载测试模块文件: {download_url}")
             
             with open(module_file_path, 'wb') as f:
                 f.write(response.content)
-            print(f"成功下载ocr_test_module.py到: {module_file_path}")
+            LogManager.info(f"成功下载ocr_test_module.py到: {module_file_path}")
         else:
-            print(f"ocr_test_module.py文件已存在且不为空，跳过下载")
+            LogManager.debug(f"ocr_test_module.py文件已存在且不为空，跳过下载")
 
         # 确保lang目录存在
         lang_dir = os.path.join(module_path, 'lang')
         if not os.path.exists(lang_dir):
             os.makedirs(lang_dir, exist_ok=True)
-            print(f'创建语言目录: {lang_dir}')
+            LogManager.info(f'创建语言目录: {lang_dir}')
 
         # 生成语言文件
-        # 测试模块只有test_mode_desc这一个键
         lang_data = {
-            'test_mode_desc': '测试模式: 启用后将使用测试模块进行OCR识别，适用于开发和调试'
+            'test_mode_desc': '测试模式: 启用后将使用测试模块进行OCR识别，适用于开发和调试',
+            'test_batch_size_desc': '测试模块单次批量识别的最大图片数量，大于1时模拟支持批量识别的OCR模块',
+            'test_async_jobs_desc': '测试模块是否模拟提交任务后轮询结果的异步任务模式',
+            'test_word_locations_desc': '测试模块是否模拟返回文字位置，启用时拼接图片中的每张截图都返回一份固定文本'
         }
 
         # 保存中文语言文件
@@ -99,16 +119,16 @@ def complete_module():
         if not os.path.exists(zh_cn_path) or os.path.getsize(zh_cn_path) == 0:
             with open(zh_cn_path, 'w', encoding='utf-8') as f:
                 json.dump(lang_data, f, ensure_ascii=False, indent=2)
-            print(f"已创建中文语言文件: {zh_cn_path}")
+            LogManager.info(f"已创建中文语言文件: {zh_cn_path}")
         else:
-            print(f"中文语言文件已存在且不为空，跳过创建")
+            LogManager.debug(f"中文语言文件已存在且不为空，跳过创建")
 
         # 加载模块语言文件
         LangManager.load_module_language_file(module_path)
-        print("测试模块补全完成")
+        LogManager.info("测试模块补全完成")
         return True
     except Exception as e:
-        print(f"补全测试模块失败: {str(e)}")
+        LogManager.error(f"补全测试模块失败: {str(e)}")
         return False
 
 
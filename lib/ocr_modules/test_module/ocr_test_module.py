@@ -1,38 +1,60 @@
-import os
 import json
+import uuid
 import datetime
+import threading
 from ocr_core.ocr_module_interface import OCRModuleInterface
+from ocr_core.ocr_image import OCRImage, get_image_name, get_image_size
 from lang_manager import LangManager
+from log_manager import LogManager
 
 class OCRTestModule(OCRModuleInterface):
     """测试OCR模块实现，用于调试主系统"""
 
     def __init__(self):
-        self.last_image_path = None
         self.last_recognized_text = "剧情梗概\n这是固定的测试文本\n用于调试OCR模块\n无论输入什么图片都会返回这段文字\n取消"
-        self.last_recognition_debug_info = {}
         self.ocr_OCR_MODULE = None
+        # 上一次识别的状态按线程保存，并发识别时互不覆盖
+        self._local = threading.local()
+        # 异步任务模式下已提交但尚未取回结果的任务
+        self._jobs = {}
+        self._jobs_lock = threading.Lock()
+
+    @property
+    def last_image_path(self):
+        return getattr(self._local, 'image_path', None)
+
+    @last_image_path.setter
+    def last_image_path(self, value):
+        self._local.image_path = value
+
+    @property
+    def last_recognition_debug_info(self):
+        return getattr(self._local, 'recognition_debug_info', {})
+
+    @last_recognition_debug_info.setter
+    def last_recognition_debug_info(self, value):
+        self._local.recognition_debug_info = value
 
     def init_ocr_client(self):
         """初始化测试OCR客户端"""
         from config.config_manager import ConfigManager
         self.ocr_OCR_MODULE = ConfigManager.get('OCR_MODULE')
         
-        # 获取并打印ConfigManager中的所有实际配置项
-        from config.config_manager import ConfigManager
-        all_config = ConfigManager.get_config()
-        print("=== ConfigManager中的所有实际配置项 ===")
-        print(json.dumps(all_config, ensure_ascii=False, indent=2))
+        # 获取并输出ConfigManager中的所有实际配置项，只在LOG_LEVEL为debug时序列化
+        if LogManager.is_enabled(LogManager.DEBUG):
+            all_config = ConfigManager.get_config()
+            LogManager.debug("=== ConfigManager中的所有实际配置项 ===")
+            LogManager.debug(json.dumps(all_config, ensure_ascii=False, indent=2))
         
         # 模拟初始化过程
-        print("初始化测试OCR客户端成功")
+        LogManager.info("初始化测试OCR客户端成功")
         return True
 
     def recognize_text(self, image_path):
         """模拟识别图片中的文本，同时获取和打印实际配置项
 
         Args:
-            image_path (str): 图片文件路径
+            image_path (str or bytes or OCRImage): 图片文件路径、编码数据或内存图片
 
         Returns:
             str: 固定的测试文本
@@ -61,19 +83,54 @@ class OCRTestModule(OCRModuleInterface):
             'TEST_MODE_DESC': test_mode_desc
         }
         
-        # 打印ConfigManager中的所有实际配置项
-        print("=== 测试模块使用的所有实际配置项 ===")
-        print(json.dumps(app_config, ensure_ascii=False, indent=2))
-        
-        # 打印关键配置项
-        print("=== 测试模块关键配置项 ===")
-        print(f"OCR_MODULE: {self.ocr_OCR_MODULE}")
-        print(f"TEST_MODE_DESC: {test_mode_desc}")
-        print(f"时间戳: {current_time}")
-        print("===========================")
+        # 输出ConfigManager中的所有实际配置项和关键配置项，只在LOG_LEVEL为debug时序列化
+        if LogManager.is_enabled(LogManager.DEBUG):
+            LogManager.debug("=== 测试模块使用的所有实际配置项 ===")
+            LogManager.debug(json.dumps(app_config, ensure_ascii=False, indent=2))
+            LogManager.debug("=== 测试模块关键配置项 ===")
+            LogManager.debug("OCR_MODULE: {}", self.ocr_OCR_MODULE)
+            LogManager.debug("TEST_MODE_DESC: {}", test_mode_desc)
+            LogManager.debug("时间戳: {}", current_time)
+            LogManager.debug("===========================")
         
         return self.last_recognized_text
 
+    def supports_word_locations(self):
+        """是否模拟返回文字位置
+
+        Returns:
+            bool: 模块配置TEST_WORD_LOCATIONS为True时返回True
+        """
+        from config.config_manager import ConfigManager
+        return str(ConfigManager.get('TEST_WORD_LOCATIONS', 'False')).lower() == 'true'
+
+    def recognize_words(self, image_path):
+        """模拟识别文字位置，拼接图片中的每张源图片都返回一份固定的测试文本
+
+        Args:
+            image_path (str or bytes or OCRImage): 图片文件路径、编码数据或内存图片
+
+        Returns:
+            list: 文字块列表，固定文本的各行从上到下排列在每张源图片的区域中
+        """
+        self.recognize_text(image_path)
+        if isinstance(image_path, OCRImage) and image_path.layout:
+            regions = [(entry['x'], entry['y'], entry['width'], entry['height']) for entry in image_path.layout]
+        else:
+            width, height = get_image_size(image_path)
+            regions = [(0, 0, width, height)]
+
+        lines = self.last_recognized_text.split('\n')
+        words = []
+        for left, top, width, height in regions:
+            line_height = max(1, height // (len(lines) + 1))
+            for index, line in enumerate(lines):
+                words.append({
+                    'words': line,
+                    'location': {'left': left, 'top': top + line_height * index, 'width': width, 'height': line_height}
+                })
+        return words
+
     def get_recognition_debug_info(self):
         """获取上一次OCR识别的完整调试信息条目
 
@@ -84,7 +141,7 @@ class OCRTestModule(OCRModuleInterface):
             return "无调试信息可用"
 
         # 提取文件名
-        file_name = os.path.basename(self.last_image_path) if self.last_image_path else "未知文件"
+        file_name = get_image_name(self.last_image_path) if self.last_image_path is not None else "未知文件"
 
         # 生成调试信息
         debug_info = self.last_recognition_debug_info
@@ -102,6 +159,89 @@ class OCRTestModule(OCRModuleInterface):
 
         return debug_message
 
+    def get_max_batch_size(self):
+        """获取单次批量识别的最大图片数量
+
+        Returns:
+            int: 模块配置TEST_BATCH_SIZE的值，默认为1即不支持批量识别
+        """
+        from config.config_manager import ConfigManager
+        try:
+            return max(1, int(ConfigManager.get('TEST_BATCH_SIZE', 1)))
+        except (TypeError, ValueError):
+            return 1
+
+    def recognize_batch(self, image_paths):
+        """模拟批量识别，每张图片都返回固定的测试文本
+
+        Args:
+            image_paths (list): 图片列表
+
+        Returns:
+            list: 与image_paths一一对应的固定测试文本
+        """
+        texts = []
+        debug_entries = []
+        for image_path in image_paths:
+            texts.append(self.recognize_text(image_path))
+            debug_entries.append(self.get_recognition_debug_info())
+        self._local.batch_debug_info = debug_entries
+        return texts
+
+    def get_batch_debug_info(self):
+        """获取上一次批量识别中每张图片的调试信息条目
+
+        Returns:
+            list: 调试信息字符串列表
+        """
+        return getattr(self._local, 'batch_debug_info', [])
+
+    def supports_async_jobs(self):
+        """是否模拟异步任务模式
+
+        Returns:
+            bool: 模块配置TEST_ASYNC_JOBS为True时返回True
+        """
+        from config.config_manager import ConfigManager
+        return str(ConfigManager.get('TEST_ASYNC_JOBS', 'False')).lower() == 'true'
+
+    def submit_job(self, image_path):
+        """模拟提交异步识别任务，任务在提交时即已完成
+
+        Args:
+            image_path (str or bytes or OCRImage): 图片文件路径、编码数据或内存图片
+
+        Returns:
+            str: 任务ID
+        """
+        job_id = uuid.uuid4().hex
+        with self._jobs_lock:
+            self._jobs[job_id] = image_path
+        return job_id
+
+    def poll_job(self, job_id):
+        """模拟查询异步识别任务的结果
+
+        Args:
+            job_id (str): 任务ID
+
+        Returns:
+            tuple: (True, 固定的测试文本)，任务ID不存在时为(True, None)
+        """
+        with self._jobs_lock:
+            image_path = self._jobs.pop(job_id, None)
+        if image_path is None:
+            return True, None
+        return True, self.recognize_text(image_path)
+
+    def get_job_poll_interval(self):
+        """获取轮询任务结果的间隔时间(秒)
+
+        Returns:
+            float: 0秒
+        """
+        return 0.0
+
     def get_api_delay(self):
         """获取API调用之间的延迟时间(秒)
 
@@ -110,6 +250,14 @@ class OCRTestModule(OCRModuleInterface):
         """
         return 0.0
 
+    def get_rate_limits(self):
+        """获取调用频率限制
+
+        Returns:
+            dict: 不限制QPS和每日额度
+        """
+        return {'qps': 0.0, 'burst': 1, 'daily_quota': 0}
+
     def get_max_width(self):
         """获取OCR模块支持的最大图片宽度(像素)
 
@@ -124,4 +272,12 @@ class OCRTestModule(OCRModuleInterface):
         Returns:
             int: 8192像素
         """
-        return 8192
\ No newline at end of file
+        return 8192
+
+    def get_supported_formats(self):
+        """获取OCR模块接受的图片编码格式
+
+        Returns:
+            list: 测试模块不解析图片内容，接受PNG、JPEG和WebP
+        """
+        return ['PNG', 'JPEG', 'WEBP']
\ No newline at end of file
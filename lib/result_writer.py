@@ -0,0 +1,111 @@
+import os
+import time
+import shutil
+import threading
+
+
+class StreamingResultWriter:
+    """按顺序流式写入结果文件的写入器
+
+    每张画布的文本处理完成后立即写入结果文件，处理中途就可以查看已完成部分的结果，
+    内存中也不再保存整个目录的文本。写入时带有序号，先完成的后序画布暂存在重排缓冲区中，
+    等前面的画布都写入后再按顺序写出，保证结果文件中的顺序与图片顺序一致。
+
+    写入的内容每隔FSYNC_INTERVAL秒同步到磁盘一次。处理结束时把统计信息等汇总内容
+    与已写入的文本一起写入临时文件，再原子地替换结果文件，
+    结果文件要么是没有汇总内容的中间结果，要么是包含完整汇总内容的最终结果。
+    """
+
+    # 两次同步到磁盘之间的最短间隔(秒)
+    FSYNC_INTERVAL = 2.0
+
+    def __init__(self, output_file, clock=time.monotonic):
+        """
+        初始化写入器
+
+        参数:
+            output_file: 结果文件路径
+            clock: 返回当前时间的函数，用于控制同步到磁盘的间隔
+        """
+        self.output_file = output_file
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._file = None
+        # 序号 -> 等待前面的内容写入后才能写出的文本
+        self._pending = {}
+        self._next_sequence = 0
+        self._last_sync = 0.0
+
+    def open(self):
+        """创建(清空)结果文件，开始写入"""
+        with self._lock:
+            self._file = open(self.output_file, 'w', encoding='utf-8')
+            self._pending.clear()
+            self._next_sequence = 0
+            self._last_sync = self._clock()
+
+    def write(self, sequence, text):
+        """
+        写入一段文本
+
+        参数:
+            sequence: 文本的序号，从0开始连续编号，每个序号只写入一次
+            text: 要写入的文本，可以为空字符串
+
+        该方法是线程安全的，序号之前的文本都已写入时立即写出，否则暂存到重排缓冲区。
+        """
+        with self._lock:
+            self._pending[sequence] = text
+            written = False
+            while self._next_sequence in self._pending:
+                self._file.write(self._pending.pop(self._next_sequence))
+                self._next_sequence += 1
+                written = True
+            if written:
+                self._file.flush()
+                if self._clock() - self._last_sync >= self.FSYNC_INTERVAL:
+                    os.fsync(self._file.fileno())
+                    self._last_sync = self._clock()
+
+    def get_buffered_count(self):
+        """
+        获取重排缓冲区中等待写出的文本段数
+
+        返回:
+            int: 等待写出的文本段数
+        """
+        with self._lock:
+            return len(self._pending)
+
+    def finish(self, footer):
+        """
+        写入汇总内容并原子地替换结果文件
+
+        参数:
+            footer: 写在所有文本之后的汇总内容
+
+        重排缓冲区中缺少前序内容的文本按序号顺序写出。
+        """
+        with self._lock:
+            for sequence in sorted(self._pending):
+                self._file.write(self._pending[sequence])
+            self._pending.clear()
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._file.close()
+            self._file = None
+
+            temp_file = f'{self.output_file}.tmp'
+            with open(self.output_file, 'rb') as src, open(temp_file, 'wb') as dst:
+                shutil.copyfileobj(src, dst)
+                dst.write(footer.encode('utf-8'))
+                dst.flush()
+                os.fsync(dst.fileno())
+            os.replace(temp_file, self.output_file)
+
+    def close(self):
+        """关闭结果文件，未调用finish时结果文件中只有已写出的文本"""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
@@ -0,0 +1,184 @@
+import os
+import json
+import time
+import threading
+
+
+class RunJournal:
+    """只追加的运行日志，记录每张画布的识别结果，使中断的处理可以继续
+
+    每识别完一张画布就以一行JSON追加一条记录，并立即写入磁盘(fsync)，
+    进程崩溃、断电或被中断时最多丢失正在写入的一行。记录包含:
+        files: 画布中源图片的文件名列表
+        name: 画布名称
+        status: ok表示识别成功，error表示识别失败
+        text / debug_entry: 识别成功时的原始识别文本和调试信息条目
+        parts: 可选，拼接图片按文字块位置拆分后各源图片的[文件名, 原始识别文本]列表
+        error: 识别失败时的错误信息
+        elapsed: 识别耗时(秒)
+        time: 记录时间戳
+
+    重新运行时读取日志，已记录的图片不再识别，而是把记录中的原始识别文本
+    重新交给文本提取器处理，因此修改开始/停止标记后结果仍然正确。
+    """
+
+    STATUS_OK = 'ok'
+    STATUS_ERROR = 'error'
+
+    def __init__(self, journal_path):
+        """
+        初始化运行日志
+
+        参数:
+            journal_path: 日志文件路径
+        """
+        self.journal_path = journal_path
+        self._lock = threading.Lock()
+        self._file = None
+        # 读取时跳过的损坏行数
+        self.corrupt_lines = 0
+
+    def load(self):
+        """
+        读取日志中的所有记录
+
+        返回:
+            list: 记录字典列表，按写入顺序排列；日志不存在时返回空列表
+
+        无法解析的行(通常是崩溃时写了一半的最后一行)会被跳过并计入corrupt_lines。
+        """
+        records = []
+        self.corrupt_lines = 0
+        if not os.path.exists(self.journal_path):
+            return records
+
+        with open(self.journal_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    self.corrupt_lines += 1
+                    continue
+                if isinstance(record, dict) and record.get('files'):
+                    records.append(record)
+                else:
+                    self.corrupt_lines += 1
+        return records
+
+    def find_reusable(self, records, file_names, retry_failed=False):
+        """
+        找出可以直接复用的记录
+
+        参数:
+            records: load返回的记录列表
+            file_names: 本次要处理的图片文件名列表
+            retry_failed: 为True时只复用识别成功的记录，识别失败的图片重新识别
+
+        返回:
+            dict: 图片文件名 -> 覆盖该图片的记录，同一张图片有多条记录时以最后一条为准，
+                只复用所有源图片都在本次处理范围内的记录
+        """
+        wanted = set(file_names)
+        latest = {}
+        for record in records:
+            for file_name in record['files']:
+                latest[file_name] = record
+
+        reusable = {}
+        for record in {id(record): record for record in latest.values()}.values():
+            if retry_failed and record.get('status') != self.STATUS_OK:
+                continue
+            files = record['files']
+            # 拼接范围变化后部分图片已有更新的记录，不能再复用整条记录
+            if any(latest.get(file_name) is not record or file_name not in wanted for file_name in files):
+                continue
+            for file_name in files:
+                reusable[file_name] = record
+        return reusable
+
+    def open(self, truncate=False):
+        """
+        打开日志文件用于追加记录
+
+        参数:
+            truncate: 为True时清空已有的记录，重新开始记录
+        """
+        with self._lock:
+            self._file = open(self.journal_path, 'w' if truncate else 'a', encoding='utf-8')
+            # 崩溃时写了一半的最后一行没有换行符，新记录需要从新的一行开始
+            if not truncate and self._ends_with_partial_line():
+                self._file.write('\n')
+                self._file.flush()
+
+    def _ends_with_partial_line(self):
+        """日志文件是否以不完整的一行结尾"""
+        with open(self.journal_path, 'rb') as f:
+            f.seek(0, os.SEEK_END)
+            if f.tell() == 0:
+                return False
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) != b'\n'
+
+    def append(self, file_names, name, recognition, elapsed):
+        """
+        追加一条画布记录并写入磁盘
+
+        参数:
+            file_names: 画布中源图片的文件名列表
+            name: 画布名称
+            recognition: recognize_image返回的识别结果字典
+            elapsed: 识别耗时(秒)
+
+        该方法是线程安全的，可以在识别完成的工作线程中直接调用。
+        """
+        record = {
+            'files': list(file_names),
+            'name': name,
+            'elapsed': round(elapsed, 3),
+            'time': time.time()
+        }
+        if 'error' in recognition:
+            record['status'] = self.STATUS_ERROR
+            record['error'] = recognition['error']
+        else:
+            record['status'] = self.STATUS_OK
+            record['text'] = recognition['text']
+            record['debug_entry'] = recognition.get('debug_entry', '')
+            if recognition.get('parts'):
+                record['parts'] = [list(part) for part in recognition['parts']]
+        line = json.dumps(record, ensure_ascii=False) + '\n'
+
+        with self._lock:
+            if self._file is None:
+                return
+            self._file.write(line)
+            self._file.flush()
+            os.fsync(self._file.fileno())
+
+    @staticmethod
+    def to_recognition(record):
+        """
+        把记录转换为recognize_image返回的识别结果字典
+
+        参数:
+            record: 日志记录
+
+        返回:
+            dict: {'text': ..., 'debug_entry': ...}或{'error': ...}，拆分过的记录还包含parts
+        """
+        if record.get('status') == RunJournal.STATUS_OK:
+            recognition = {'text': record.get('text', ''), 'debug_entry': record.get('debug_entry', '')}
+            if record.get('parts'):
+                recognition['parts'] = [tuple(part) for part in record['parts']]
+            return recognition
+        return {'error': record.get('error', '')}
+
+    def close(self):
+        """关闭日志文件"""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
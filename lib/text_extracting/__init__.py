@@ -2,5 +2,9 @@
 
 from .text_extractor import TextExtractor
 from .font_enhancement_detector import detect_font_enhancement
+from .marker_matcher import MarkerMatcher, parse_markers
+from .layout_splitter import split_words_by_layout
+from .paragraph_deduper import ParagraphDeduper, normalize_paragraph
 
-__all__ = ['TextExtractor', 'detect_font_enhancement']
\ No newline at end of file
+__all__ = ['TextExtractor', 'detect_font_enhancement', 'MarkerMatcher', 'parse_markers', 'split_words_by_layout',
+           'ParagraphDeduper', 'normalize_paragraph']
\ No newline at end of file
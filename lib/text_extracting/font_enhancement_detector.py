@@ -2,6 +2,7 @@ import os
 import json
 from config.config_manager import ConfigManager
 from lang_manager import LangManager
+from log_manager import LogManager
 
 class FontEnhancementDetector:
     """字体增强检测器，负责检测字体文件并提供相应的OCR语言设置
@@ -56,12 +57,12 @@ class FontEnhancementDetector:
                     self.language_to_fonts = font_data.get('language_to_font', {})
             except Exception as e:
                 error_msg = LangManager.get_lang('font_file_load_error')
-                print(error_msg.format(str(e)))
+                LogManager.error(error_msg, str(e))
                 self.font_to_language = {}
                 self.language_to_fonts = {}
         except Exception as e:
             error_msg = LangManager.get_lang('cache_initialization_error')
-            print(error_msg.format(str(e)))
+            LogManager.error(error_msg, str(e))
             self.ocr_language_mapping = {}
             self.font_to_language = {}
 
@@ -91,7 +92,7 @@ class FontEnhancementDetector:
                 ocr_language = LangManager.get_lang('language_mapping')
             except Exception as e:
                 error_msg = LangManager.get_lang('ocr_language_fetch_error')
-                print(error_msg.format(str(e)))
+                LogManager.error(error_msg, str(e))
                 ocr_language = self.DEFAULT_OCR_LANGUAGE
         else:
             ocr_language = original_ocr_language
@@ -103,10 +104,10 @@ class FontEnhancementDetector:
                 font_file, font_path = matched_font
                 use_custom_font = True
                 found_fonts.append(({'file_name': font_file, 'ocr_language': self.font_to_language[font_file]}, font_path))
-                print(LangManager.get_lang('single_font_detected').format(font_path))
+                LogManager.info(LangManager.get_lang('single_font_detected'), font_path)
             # 非default模式下，如果找不到匹配字体，则不启用字体增强
             else:
-                print(LangManager.get_lang('no_font_detected_simple'))
+                LogManager.info(LangManager.get_lang('no_font_detected_simple'))
         else:
             # 2. 对于default模式，先尝试查找当前语言对应的字体
             matched_font = self._find_font_by_language(ocr_language)
@@ -114,7 +115,7 @@ class FontEnhancementDetector:
                 font_file, font_path = matched_font
                 use_custom_font = True
                 found_fonts.append(({'file_name': font_file, 'ocr_language': self.font_to_language[font_file]}, font_path))
-                print(LangManager.get_lang('single_font_detected').format(font_path))
+                LogManager.info(LangManager.get_lang('single_font_detected'), font_path)
             else:
                 # 3. 如果找不到对应语言的字体，查找所有支持的字体
                 found_fonts = self._find_fonts_in_directory()
@@ -125,13 +126,13 @@ class FontEnhancementDetector:
                     font_path = current_font_path
                     # 使用找到的字体对应的语言
                     ocr_language = font_info['ocr_language']
-                    print(LangManager.get_lang('single_font_detected').format(font_path))
+                    LogManager.info(LangManager.get_lang('single_font_detected'), font_path)
                 elif len(found_fonts) > 1:
                     # 打印多字体警告信息
-                    print(LangManager.get_lang('multiple_fonts_warning'))
+                    LogManager.warning(LangManager.get_lang('multiple_fonts_warning'))
                 else:
                     # 打印无字体检测提示
-                    print(LangManager.get_lang('no_font_detected_simple'))
+                    LogManager.info(LangManager.get_lang('no_font_detected_simple'))
         # 将结果保存到配置系统
         ConfigManager.set('USE_CUSTOM_FONT', use_custom_font)
         ConfigManager.set('CUSTOM_FONT_PATH', font_path)
@@ -0,0 +1,82 @@
+def _center(location):
+    return (location.get('left', 0) + location.get('width', 0) / 2.0,
+            location.get('top', 0) + location.get('height', 0) / 2.0)
+
+
+def _distance(entry, point):
+    """点到源图片区域的距离，点在区域内时为0"""
+    x, y = point
+    dx = max(entry['x'] - x, 0, x - (entry['x'] + entry['width']))
+    dy = max(entry['y'] - y, 0, y - (entry['y'] + entry['height']))
+    return dx * dx + dy * dy
+
+
+def _locate(layout, point):
+    """找出点所在的源图片，点落在所有源图片之外(例如画布的空白处)时取最近的一张
+
+    Args:
+        layout (list): 布局表
+        point (tuple): 画布中的坐标(x, y)
+
+    Returns:
+        int: 源图片在布局表中的序号
+    """
+    return min(range(len(layout)), key=lambda index: _distance(layout[index], point))
+
+
+def _contains(entry, location, tolerance=2):
+    """文字块是否完整地位于源图片区域内，允许tolerance像素的误差"""
+    return (location.get('left', 0) >= entry['x'] - tolerance
+            and location.get('top', 0) >= entry['y'] - tolerance
+            and location.get('left', 0) + location.get('width', 0) <= entry['x'] + entry['width'] + tolerance
+            and location.get('top', 0) + location.get('height', 0) <= entry['y'] + entry['height'] + tolerance)
+
+
+def split_words_by_layout(words, layout):
+    """按拼接图片的布局表把识别出的文字块拆回各张源图片
+
+    每个文字块按中心点归属到所在的源图片，各源图片中的文字块保持识别结果的顺序。
+    左右并排的源图片中处于同一高度的文字可能被识别为一个跨越多张源图片的文字块，
+    这时如果识别结果带有单字位置，就按每个字的中心点拆分，同一源图片中连续的字组成一行。
+
+    Args:
+        words (list): OCR模块recognize_words返回的文字块列表
+        layout (list): OCRImage的布局表，格式见CanvasPlan.get_layout
+
+    Returns:
+        list: 与布局表一一对应的(源图片文件名, 识别文本)，没有文字的源图片文本为空字符串
+    """
+    lines = [[] for _ in layout]
+    for word in words or []:
+        text = word.get('words', '')
+        location = word.get('location')
+        if not text or not layout:
+            continue
+        if not location:
+            # 没有位置的文字块无法拆分，归属第一张源图片
+            lines[0].append(text)
+            continue
+
+        index = _locate(layout, _center(location))
+        chars = word.get('chars')
+        if not chars or _contains(layout[index], location):
+            lines[index].append(text)
+            continue
+
+        # 跨越多张源图片的文字块按单字拆分
+        run_index = None
+        run = []
+        for char in chars:
+            char_location = char.get('location')
+            char_index = _locate(layout, _center(char_location)) if char_location else run_index
+            if char_index is None:
+                char_index = index
+            if char_index != run_index and run:
+                lines[run_index].append(''.join(run))
+                run = []
+            run_index = char_index
+            run.append(char.get('char', ''))
+        if run:
+            lines[run_index].append(''.join(run))
+
+    return [(entry['file_name'], '\n'.join(entry_lines)) for entry, entry_lines in zip(layout, lines)]
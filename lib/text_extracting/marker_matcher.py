@@ -0,0 +1,341 @@
+from collections import deque
+
+
+def parse_markers(value):
+    """把配置中的标记转换为标记列表
+
+    配置加载器只在值包含逗号时把多个标记拆分为列表，只有一个标记时得到的是字符串，
+    直接遍历字符串会把每个字符当作一个标记，因此统一在这里按逗号拆分。
+
+    Args:
+        value (str|list): 逗号分隔的标记字符串或标记列表
+
+    Returns:
+        list: 去除首尾空白、空标记和重复标记后的标记列表，保持原有顺序
+    """
+    if not value:
+        return []
+    if isinstance(value, str):
+        value = value.split(',')
+    markers = []
+    for marker in value:
+        marker = str(marker).strip()
+        if marker and marker not in markers:
+            markers.append(marker)
+    return markers
+
+
+def split_pieces(marker, count):
+    """把标记分为count段长度尽量相等的连续片段
+
+    编辑次数不超过count-1的近似匹配至少完整包含其中一段(每次编辑最多破坏一段)，
+    因此只需在片段出现的位置附近进行近似匹配。
+
+    Args:
+        marker (str): 标记
+        count (int): 片段数量，不超过标记长度
+
+    Returns:
+        list: 按顺序排列的片段
+    """
+    size, extra = divmod(len(marker), count)
+    pieces = []
+    start = 0
+    for index in range(count):
+        end = start + size + (1 if index < extra else 0)
+        pieces.append(marker[start:end])
+        start = end
+    return pieces
+
+
+class MarkerMatcher:
+    """多模式字符串匹配器(Aho–Corasick自动机)，支持容忍少量识别错误的近似匹配
+
+    创建时把所有标记编译为一个自动机，之后对每段文本只需逐字符扫描一次，
+    就能找出所有标记出现的位置，耗时只与文本长度和匹配数量有关，不随标记数量增长。
+    每个标记可以附带一个值(例如开始或停止)，匹配结果中原样返回。
+
+    允许编辑的标记不直接加入自动机，而是把它的各个片段加入自动机，
+    只在片段出现的位置附近用Myers位并行算法计算编辑距离，没有片段出现的行不增加任何开销。
+    为避免正文中相近的词被当作标记，有错字的近似匹配只在该行没有完全相同的标记、
+    并且匹配占据整行(行中其余的字数加上编辑距离不超过允许的编辑次数)时才返回。
+    """
+
+    # 每次编辑至少需要标记中有这么多个字，避免很短的标记近似匹配到正文
+    CHARS_PER_EDIT = 4
+
+    def __init__(self, markers, max_edits=0):
+        """编译标记
+
+        Args:
+            markers (iterable): (标记, 值)的序列，同一个标记出现多次时使用第一次的值
+            max_edits (int): 每个标记最多允许的编辑(替换、插入或删除一个字)次数，
+                实际允许的次数不超过标记长度除以CHARS_PER_EDIT，0表示只进行精确匹配
+        """
+        # 每个状态的转移表、失败指针和在该状态结束的关键字序号(包括沿失败指针可达的关键字)
+        self._goto = [{}]
+        self._fail = [0]
+        self._output = [()]
+        # 自动机中的关键字: (标记序号, 关键字长度, 是否为近似匹配标记的片段)
+        self._keywords = []
+        # 近似匹配标记的字符位置掩码，键为标记序号
+        self._patterns = {}
+        self.markers = []
+        self.values = []
+        self.max_edits = []
+
+        for marker, value in markers:
+            if not marker or marker in self.markers:
+                continue
+            index = len(self.markers)
+            edits = min(max(int(max_edits), 0), len(marker) // self.CHARS_PER_EDIT)
+            self.markers.append(marker)
+            self.values.append(value)
+            self.max_edits.append(edits)
+            if not edits:
+                self._add_keyword(marker, index, False)
+                continue
+            for piece in split_pieces(marker, edits + 1):
+                self._add_keyword(piece, index, True)
+            pattern = {}
+            for position, char in enumerate(marker):
+                pattern[char] = pattern.get(char, 0) | (1 << position)
+            self._patterns[index] = pattern
+
+        # 按广度优先的顺序计算失败指针，父状态的失败指针总是先于子状态计算
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                fail = self._goto[fail].get(char, 0)
+                self._fail[next_state] = fail
+                if self._output[fail]:
+                    self._output[next_state] = self._output[next_state] + self._output[fail]
+
+    def _add_keyword(self, keyword, index, is_piece):
+        """把关键字加入自动机的转移表"""
+        state = 0
+        for char in keyword:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append(())
+                self._goto[state][char] = next_state
+            state = next_state
+        self._output[state] = self._output[state] + (len(self._keywords),)
+        self._keywords.append((index, len(keyword), is_piece))
+
+    def __bool__(self):
+        return bool(self.markers)
+
+    def find_all(self, text):
+        """找出文本中所有标记出现的位置，包括相互重叠的匹配
+
+        Args:
+            text (str): 要查找的文本
+
+        Returns:
+            list: (开始位置, 结束位置, 标记, 值)的列表，按结束位置排列。
+                近似匹配的开始和结束位置为文本中与标记对应的部分
+        """
+        matches = []
+        if not self.markers:
+            return matches
+        goto = self._goto
+        fail = self._fail
+        output = self._output
+        keywords = self._keywords
+        root = goto[0]
+        windows = None
+        state = 0
+        for position, char in enumerate(text):
+            if state == 0:
+                # 大部分字符不是任何标记的开头，在根状态直接跳过
+                state = root.get(char, 0)
+            else:
+                while state and char not in goto[state]:
+                    state = fail[state]
+                state = goto[state].get(char, 0)
+            if output[state]:
+                end = position + 1
+                for keyword in output[state]:
+                    index, length, is_piece = keywords[keyword]
+                    if is_piece:
+                        if windows is None:
+                            windows = {}
+                        windows.setdefault(index, []).append((end - length, end))
+                    else:
+                        marker = self.markers[index]
+                        matches.append((end - len(marker), end, marker, self.values[index]))
+
+        if windows:
+            for index, pieces in windows.items():
+                matches.extend(self._find_approximate(text, index, pieces))
+            matches.sort(key=lambda match: match[1])
+        return matches
+
+    def _find_approximate(self, text, index, pieces):
+        """在片段出现的位置附近查找近似匹配的标记
+
+        Args:
+            text (str): 要查找的文本
+            index (int): 标记序号
+            pieces (list): 标记的片段在文本中出现的(开始位置, 结束位置)，按结束位置排列
+
+        Returns:
+            list: (开始位置, 结束位置, 标记, 值)的列表
+        """
+        marker = self.markers[index]
+        max_edits = self.max_edits[index]
+        span = len(marker) + max_edits
+        matches = []
+        window_start = window_end = -1
+        # 包含片段的匹配长度不超过span，合并相互重叠的查找范围
+        for piece_start, piece_end in pieces:
+            start = max(piece_end - span, 0)
+            end = min(piece_start + span, len(text))
+            if start <= window_end:
+                window_end = max(window_end, end)
+                continue
+            if window_end > window_start:
+                matches.extend(self._search_window(text, index, window_start, window_end))
+            window_start, window_end = start, end
+        if window_end > window_start:
+            matches.extend(self._search_window(text, index, window_start, window_end))
+
+        # 行中有完全相同的标记时只使用精确匹配
+        exact = [match for distance, match in matches if distance == 0]
+        if exact:
+            return exact
+        return [match for distance, match in matches if self._is_line_marker(text, match, distance, max_edits)]
+
+    @staticmethod
+    def _is_line_marker(text, match, distance, max_edits):
+        """有错字的匹配是否占据整行，行中匹配以外的字也算作编辑
+
+        正文中与标记只差一两个字的词很常见(例如"剧情梗的内容")，只有单独成行的近似匹配才作为标记。
+        """
+        start, end = match[0], match[1]
+        return len(text[:start].strip()) + len(text[end:].strip()) + distance <= max_edits
+
+    def _search_window(self, text, index, window_start, window_end):
+        """用Myers位并行算法在text[window_start:window_end]中查找编辑距离不超过限制的匹配
+
+        算法用两个位向量表示动态规划矩阵一列中相邻元素的差，每读入一个字符只需常数次位运算，
+        同时维护标记末尾对应的编辑距离。距离连续不超过限制的一组结束位置只保留距离最小的一个。
+
+        Returns:
+            list: (编辑距离, (开始位置, 结束位置, 标记, 值))的列表
+        """
+        marker = self.markers[index]
+        value = self.values[index]
+        max_edits = self.max_edits[index]
+        pattern = self._patterns[index]
+        length = len(marker)
+        mask = (1 << length) - 1
+        high = 1 << (length - 1)
+        positive = mask
+        negative = 0
+        score = length
+
+        matches = []
+        # 距离连续不超过限制的一组结束位置中距离最小的结束位置
+        run_ends = []
+        run_score = 0
+        for position in range(window_start, window_end):
+            equal = pattern.get(text[position], 0)
+            vertical = equal | negative
+            horizontal = ((((equal & positive) + positive) & mask) ^ positive) | equal
+            positive_h = negative | (~(horizontal | positive) & mask)
+            negative_h = positive & horizontal
+            if positive_h & high:
+                score += 1
+            elif negative_h & high:
+                score -= 1
+            # 文本中的匹配可以从任意位置开始，第0行始终为0，左移时不补1
+            positive_h = (positive_h << 1) & mask
+            negative_h = (negative_h << 1) & mask
+            positive = negative_h | (~(vertical | positive_h) & mask)
+            negative = positive_h & vertical
+
+            if score <= max_edits:
+                if not run_ends or score < run_score:
+                    run_ends = [position + 1]
+                    run_score = score
+                elif score == run_score:
+                    run_ends.append(position + 1)
+            elif run_ends:
+                matches.append(self._approximate_match(text, index, run_ends, window_start))
+                run_ends = []
+        if run_ends:
+            matches.append(self._approximate_match(text, index, run_ends, window_start))
+        return matches
+
+    def _approximate_match(self, text, index, ends, window_start):
+        """确定近似匹配的开始和结束位置
+
+        从每个候选的结束位置向前逐字计算标记与text[start:end]的编辑距离，选取距离最小的匹配，
+        距离相同时优先结束位置靠后的(多出的字归入标记，不留在正文中)，再优先长度接近标记的
+
+        Args:
+            text (str): 要查找的文本
+            index (int): 标记序号
+            ends (list): 编辑距离同为最小值的候选结束位置
+            window_start (int): 查找范围的开始位置，匹配不会早于该位置开始
+
+        Returns:
+            tuple: (编辑距离, (开始位置, 结束位置, 标记, 值))
+        """
+        marker = self.markers[index]
+        length = len(marker)
+        best = None
+        for end in ends:
+            # previous[i]为标记的最后i个字与已读入的文本之间的编辑距离
+            previous = list(range(length + 1))
+            for count in range(1, length + self.max_edits[index] + 1):
+                start = end - count
+                if start < window_start:
+                    break
+                char = text[start]
+                current = [count]
+                for i in range(1, length + 1):
+                    current.append(min(
+                        previous[i - 1] + (marker[length - i] != char),
+                        previous[i] + 1,
+                        current[i - 1] + 1
+                    ))
+                previous = current
+                key = (current[length], -end, abs(count - length))
+                if best is None or key < best[0]:
+                    best = (key, start, end)
+        return best[0][0], (best[1], best[2], marker, self.values[index])
+
+    def find(self, text):
+        """找出文本中互不重叠的标记
+
+        从左到右选取匹配，同一位置开始的多个标记优先选择最长的，
+        与已选匹配重叠的其他匹配被忽略。
+
+        Args:
+            text (str): 要查找的文本
+
+        Returns:
+            list: (开始位置, 结束位置, 标记, 值)的列表，按开始位置排列
+        """
+        matches = self.find_all(text)
+        if len(matches) <= 1:
+            return matches
+        matches.sort(key=lambda match: (match[0], match[0] - match[1]))
+        selected = []
+        last_end = 0
+        for match in matches:
+            if match[0] >= last_end:
+                selected.append(match)
+                last_end = match[1]
+        return selected
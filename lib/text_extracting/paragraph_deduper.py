@@ -0,0 +1,196 @@
+import hashlib
+import unicodedata
+import numpy as np
+
+_SHIFT_CODE_POINT = np.uint64(21)
+_SHIFT_HASH = np.uint64(32)
+
+
+class _NormalizeTable(dict):
+    """str.translate使用的字符映射表，每个字符第一次出现时计算并缓存映射结果"""
+
+    def __missing__(self, code):
+        char = unicodedata.normalize('NFKC', chr(code)).casefold()
+        char = ''.join(c for c in char if unicodedata.category(c)[0] not in 'PZC')
+        self[code] = char
+        return char
+
+
+_NORMALIZE_TABLE = _NormalizeTable()
+
+
+def normalize_paragraph(text):
+    """把段落规范化为用于比较的形式
+
+    统一全角/半角字符和大小写，去掉空白、标点和控制字符，
+    这样只在标点或换行位置上不同的两次识别结果会得到相同的文本。
+
+    Args:
+        text (str): 段落文本
+
+    Returns:
+        str: 规范化后的文本
+    """
+    return text.translate(_NORMALIZE_TABLE)
+
+
+class ParagraphDeduper:
+    """整次运行范围内的段落去重索引
+
+    每个段落先按规范化文本的哈希值查找完全相同的段落，命中时只需一次字典查找。
+    fuzzy模式下再用MinHash签名和LSH分桶查找只有少量识别错误不同的近似段落：
+    签名按BANDS段分桶，至少一段完全相同的段落才作为候选，候选按签名估计的相似度排序后，
+    再计算相邻两字片段集合的Jaccard相似度与阈值比较。每个段落只与少数候选比较，
+    段落数量很多时总耗时仍然与段落数量成正比。
+    """
+
+    NUM_PERMUTATIONS = 64
+    BANDS = 16
+    # 规范化后短于该长度的段落只做完全相同的去重
+    MIN_FUZZY_LENGTH = 8
+
+    def __init__(self, threshold=0.8, fuzzy=True, seed=1):
+        """初始化去重索引
+
+        Args:
+            threshold (float): 判定为近似重复的最小相似度(0~1)
+            fuzzy (bool): 是否查找近似重复的段落，False时只去除完全相同的段落
+            seed (int): 生成MinHash哈希函数的随机种子
+        """
+        self.threshold = float(threshold)
+        self.fuzzy = fuzzy
+        rng = np.random.RandomState(seed)
+        # MinHash的各个哈希函数为64位乘法移位哈希((a * x + b) mod 2^64) >> 32，a为奇数
+        size = (self.NUM_PERMUTATIONS, 1)
+        self._a = rng.randint(0, 1 << 62, size=size, dtype=np.int64).astype(np.uint64) * np.uint64(2) + np.uint64(1)
+        self._b = rng.randint(0, 1 << 62, size=size, dtype=np.int64).astype(np.uint64)
+        self._band_bytes = self.NUM_PERMUTATIONS // self.BANDS * 4
+
+        self._exact = {}
+        self._sources = []
+        self._signatures = np.empty((0, self.NUM_PERMUTATIONS), dtype=np.uint32)
+        self._signature_count = 0
+        self._signature_ids = []
+        self._signature_texts = []
+        self._buckets = {}
+
+    def __len__(self):
+        return len(self._sources)
+
+    @staticmethod
+    def _shingles(normalized):
+        """把规范化文本中相邻的两个字组成片段，一个错字只影响两个片段
+
+        Returns:
+            numpy.ndarray: 片段数组，每个片段为两个字的码位拼接成的整数，可能有重复
+        """
+        code_points = np.frombuffer(normalized.encode('utf-32-le'), dtype=np.uint32).astype(np.uint64)
+        return (code_points[:-1] << _SHIFT_CODE_POINT) | code_points[1:]
+
+    def _signature(self, shingles):
+        """计算片段的MinHash签名"""
+        values = self._a * shingles
+        values += self._b
+        return (values.min(axis=1) >> _SHIFT_HASH).astype(np.uint32)
+
+    def _band_keys(self, signature):
+        """把签名分为BANDS段，计算各段的桶键"""
+        raw = signature.tobytes()
+        size = self._band_bytes
+        return [hash((start, raw[start:start + size])) for start in range(0, len(raw), size)]
+
+    @staticmethod
+    def _jaccard(first, second):
+        """计算两个去重排序后的片段数组的Jaccard相似度"""
+        common = len(np.intersect1d(first, second, assume_unique=True))
+        return common / float(len(first) + len(second) - common)
+
+    def _find_similar(self, signature, keys, shingles):
+        """在与签名至少有一段相同的段落中查找相似度不低于阈值的段落
+
+        Returns:
+            tuple: (签名矩阵中的行号, 相似度)，没有时返回None
+        """
+        candidates = set()
+        for key in keys:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                continue
+            if isinstance(bucket, list):
+                candidates.update(bucket)
+            else:
+                candidates.add(bucket)
+        if not candidates:
+            return None
+
+        rows = np.fromiter(candidates, dtype=np.int64, count=len(candidates))
+        estimates = (self._signatures[rows] == signature).mean(axis=1)
+        shingles = np.unique(shingles)
+        # 签名估计值的误差约为0.06，远低于阈值的候选不再计算实际相似度
+        for index in np.argsort(-estimates):
+            if estimates[index] < self.threshold - 0.2:
+                break
+            row = int(rows[index])
+            similarity = self._jaccard(shingles, np.unique(self._shingles(self._signature_texts[row])))
+            if similarity >= self.threshold:
+                return row, similarity
+        return None
+
+    def _store_signature(self, signature, paragraph_id, normalized):
+        """把签名追加到签名矩阵中，矩阵按需成倍扩容"""
+        if self._signature_count == len(self._signatures):
+            grown = np.empty((max(1024, 2 * len(self._signatures)), self.NUM_PERMUTATIONS), dtype=np.uint32)
+            grown[:self._signature_count] = self._signatures[:self._signature_count]
+            self._signatures = grown
+        self._signatures[self._signature_count] = signature
+        self._signature_count += 1
+        self._signature_ids.append(paragraph_id)
+        self._signature_texts.append(normalized)
+
+    def add(self, text, source):
+        """查找与之前的段落重复的段落，不重复时把段落加入索引
+
+        Args:
+            text (str): 段落文本
+            source (str): 段落来源，通常为图片文件名，重复时返回保留的段落的来源
+
+        Returns:
+            tuple: 段落重复时返回(保留的段落的来源, 相似度)，完全相同时相似度为1.0；
+                不重复时返回None
+        """
+        normalized = normalize_paragraph(text)
+        if not normalized:
+            return None
+
+        digest = hashlib.blake2b(normalized.encode('utf-8'), digest_size=16).digest()
+        paragraph_id = self._exact.get(digest)
+        if paragraph_id is not None:
+            return self._sources[paragraph_id], 1.0
+
+        signature = None
+        keys = ()
+        if self.fuzzy and len(normalized) >= self.MIN_FUZZY_LENGTH:
+            shingles = self._shingles(normalized)
+            signature = self._signature(shingles)
+            keys = self._band_keys(signature)
+            similar = self._find_similar(signature, keys, shingles)
+            if similar is not None:
+                row, similarity = similar
+                return self._sources[self._signature_ids[row]], similarity
+
+        paragraph_id = len(self._sources)
+        self._sources.append(source)
+        self._exact[digest] = paragraph_id
+        if signature is not None:
+            row = self._signature_count
+            self._store_signature(signature, paragraph_id, normalized)
+            # 大部分桶只有一个段落，直接保存行号，出现第二个段落时再转换为列表
+            for key in keys:
+                bucket = self._buckets.get(key)
+                if bucket is None:
+                    self._buckets[key] = row
+                elif isinstance(bucket, list):
+                    bucket.append(row)
+                else:
+                    self._buckets[key] = [bucket, row]
+        return None
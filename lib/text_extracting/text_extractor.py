@@ -1,9 +1,14 @@
-import os
-import time
+import asyncio
 from lang_manager import LangManager
+from log_manager import LogManager
 from ocr_core.ocr_module import OCRModule
+from ocr_core.rate_limiter import QuotaExhaustedError
+from ocr_core.ocr_image import OCRImage, get_image_name, get_image_size, get_image_byte_size
 from config.config_manager import ConfigManager
-from PIL import Image
+from metrics import PipelineMetrics
+from .marker_matcher import MarkerMatcher, parse_markers
+from .layout_splitter import split_words_by_layout
+from .paragraph_deduper import ParagraphDeduper
 
 
 class TextExtractor:
@@ -18,29 +23,62 @@ class TextExtractor:
         初始化文本提取器
 
         属性初始化:
-            start_markers: 开始记录文本的标记列表
-            stop_markers: 停止记录文本的标记列表
-            output: 存储处理后的文本输出
+            start_markers: 开始记录文本的标记列表，可以出现在行中任意位置
+            stop_markers: 停止记录文本的标记列表，需要单独占一整行
+            midline_stop_markers: 可以出现在行中任意位置的停止标记列表
+            marker_max_edits: 开始标记和行内停止标记最多允许的识别错误(编辑)次数
+            marker_matcher: 由开始标记和行内停止标记编译的多模式匹配器，按marker_max_edits容忍识别错误
+            paragraph_deduper: 整次运行范围内的段落去重索引，PARAGRAPH_DEDUPE为off时为None
+            merged_paragraphs: 被合并的重复段落列表，元素为(文件名, 段落文本, 保留的段落所在文件名, 相似度)
+            output_ocr_debug: 是否收集OCR调试信息
+            output: 尚未写入结果文件的处理后文本，由TextProcessor在每张画布处理后取走
             success_count: 成功处理的图片数量
             error_count: 处理失败的图片数量
             suspected_dash_files: 疑似包含破折号问题的文件列表
             ocr_debug_info: 存储OCR调试信息
         """
-        self.start_markers = ConfigManager.get('START_MARKERS', [])
-        self.stop_markers = ConfigManager.get('STOP_MARKERS', [])
+        self.start_markers = parse_markers(ConfigManager.get('START_MARKERS', []))
+        self.stop_markers = parse_markers(ConfigManager.get('STOP_MARKERS', []))
+        self.midline_stop_markers = parse_markers(ConfigManager.get('MIDLINE_STOP_MARKERS', []))
+        self._stop_lines = frozenset(self.stop_markers)
+        self.marker_max_edits = int(ConfigManager.get('MARKER_MAX_EDITS', 0))
+        # i、×等很短的停止标记在正文中也会出现，只有单独成行时才算停止标记，不加入匹配器
+        self.marker_matcher = MarkerMatcher(
+            [(marker, 'start') for marker in self.start_markers] +
+            [(marker, 'stop') for marker in self.midline_stop_markers],
+            max_edits=self.marker_max_edits
+        )
+        self.paragraph_deduper = self.create_paragraph_deduper()
+        self.merged_paragraphs = []
+        self.output_ocr_debug = ConfigManager.get('OUTPUT_OCR_DEBUG', 'False').lower() == 'true'
         self.output = []
         self.success_count = 0
         self.error_count = 0
         self.suspected_dash_files = []
         self.ocr_debug_info = []
 
-    def process_text(self, file_name, text):
+    @staticmethod
+    def create_paragraph_deduper():
+        """
+        根据PARAGRAPH_DEDUPE和PARAGRAPH_SIMILARITY_THRESHOLD配置创建段落去重索引
+
+        返回:
+            ParagraphDeduper: 段落去重索引，PARAGRAPH_DEDUPE为off时返回None
+        """
+        mode = ConfigManager.get('PARAGRAPH_DEDUPE', 'off')
+        if mode not in ('exact', 'fuzzy'):
+            return None
+        threshold = float(ConfigManager.get('PARAGRAPH_SIMILARITY_THRESHOLD', 0.8))
+        return ParagraphDeduper(threshold=threshold, fuzzy=mode == 'fuzzy')
+
+    def process_text(self, file_name, text, debug_entry=None):
         """
         处理单张图片的OCR文本
 
         参数:
             file_name: 图片文件名
             text: OCR识别的文本
+            debug_entry: 本次识别的调试信息条目，为None时从OCR模块获取上一次识别的调试信息
 
         返回:
             str: 处理后的文本，如果处理失败则返回None
@@ -54,20 +92,20 @@ class TextExtractor:
         """
         if not text:
             error_msg = LangManager.get_lang('ocr_recognition_failed')
-            print(error_msg)
+            LogManager.error(error_msg)
             self.output.append(f'{error_msg}\n')
             self.error_count += 1
             return None
 
         # 获取配置
         use_custom_font = ConfigManager.get('USE_CUSTOM_FONT', False)
-        output_ocr_debug = ConfigManager.get('OUTPUT_OCR_DEBUG', False)
 
         # 收集OCR调试信息
-        if output_ocr_debug:
-            # 获取OCR模块单例实例
-            ocr_module = OCRModule.get_instance()
-            debug_entry = ocr_module.get_recognition_debug_info()
+        if self.output_ocr_debug:
+            if debug_entry is None:
+                # 获取OCR模块单例实例
+                ocr_module = OCRModule.get_instance()
+                debug_entry = ocr_module.get_recognition_debug_info()
             if debug_entry:
                 self.ocr_debug_info.append(debug_entry + '\n')
 
@@ -78,34 +116,49 @@ class TextExtractor:
         current_paragraph = []
 
         for line in lines:
-            # 打印行内容
-            print(LangManager.get_lang('image_line_content').format(file_name, line))
-
-            # 检查是否到达新的开始记录点
-            if any(marker in line for marker in self.start_markers) and not start_recording:
-                start_recording = True
-                # 找出实际匹配的标记
-                matched_marker = next(marker for marker in self.start_markers if marker in line)
-                print(LangManager.get_lang('start_recording_text').format(matched_marker, file_name))
-                current_paragraph = []  # 重置当前段落
-                continue  # 不记录开始标记本身
-
-            # 检查是否到达停止记录点
-            if start_recording:
-                if line.strip() in self.stop_markers:
-                    start_recording = False  # 重置以便下一次检测
-                    print(LangManager.get_lang('stop_recording_text').format(line, file_name))
-                    # 将当前段落添加到过滤文本中（如果不为空且不重复）
-                    paragraph_text = ''.join(current_paragraph)
-                    if paragraph_text and paragraph_text not in filtered_text:
-                        filtered_text.append(paragraph_text)
+            # 输出行内容，只在LOG_LEVEL为debug时输出
+            LogManager.debug(LangManager.get_lang('image_line_content'), file_name, line)
+
+            # 检查是否到达停止记录点(整行都是停止标记)
+            if start_recording and line.strip() in self._stop_lines:
+                start_recording = False  # 重置以便下一次检测
+                LogManager.debug(LangManager.get_lang('stop_recording_text'), line, file_name)
+                # 将当前段落添加到过滤文本中（如果不为空且不重复）
+                self._append_paragraph(file_name, filtered_text, current_paragraph)
+                current_paragraph = []
+                continue
+
+            # 一次扫描找出行内所有的开始标记和行内停止标记，标记前后的文本分别归属停止前和开始后的段落
+            position = 0
+            for start, end, marker, kind in self.marker_matcher.find(line):
+                if (kind == 'start') == start_recording:
+                    # 记录中的开始标记和未记录时的停止标记属于正文，不处理
+                    continue
+                if line[start:end] != marker:
+                    # 识别结果中的标记有错字，近似匹配到了标记
+                    LogManager.info(LangManager.get_lang('marker_approximate_match'), line[start:end], marker, file_name)
+                if kind == 'start':
+                    start_recording = True
+                    LogManager.debug(LangManager.get_lang('start_recording_text'), marker, file_name)
+                    current_paragraph = []  # 重置当前段落，不记录开始标记本身
                 else:
+                    before = line[position:start].strip()
+                    if before:
+                        current_paragraph.append(before)
+                    start_recording = False
+                    LogManager.debug(LangManager.get_lang('stop_recording_text'), marker, file_name)
+                    self._append_paragraph(file_name, filtered_text, current_paragraph)
+                    current_paragraph = []
+                position = end
+
+            if start_recording:
+                if position == 0:
                     current_paragraph.append(line)
+                elif line[position:].strip():
+                    current_paragraph.append(line[position:].strip())
 
         # 确保最后一个段落被添加（如果没有遇到停止标记且不为空且不重复）
-        paragraph_text = ''.join(current_paragraph)
-        if paragraph_text and paragraph_text not in filtered_text:
-            filtered_text.append(paragraph_text)
+        self._append_paragraph(file_name, filtered_text, current_paragraph)
 
         # 将过滤后的文本块连接
         processed_text = '\n'.join(filtered_text)  # 使用换行符分隔不同段落
@@ -115,86 +168,375 @@ class TextExtractor:
 
         # 文本后处理：检测疑似破折号的情况
         if not use_custom_font and '一一' in processed_text:
-            print(LangManager.get_lang('suspected_dash_detected').format(file_name))
+            LogManager.warning(LangManager.get_lang('suspected_dash_detected'), file_name)
             self.suspected_dash_files.append(file_name)
 
         self.output.append(f'{processed_text}\n')  # 不同图片的内容输出到不同行
         self.success_count += 1
-        print(LangManager.get_lang('process_success').format(file_name))
+        LogManager.info(LangManager.get_lang('process_success'), file_name)
 
         return processed_text
 
-    def process_image(self, file_path):
+    def _append_paragraph(self, file_name, filtered_text, paragraph):
         """
-        处理单个图片路径，执行OCR识别和文本处理
+        把段落的各行连接后添加到过滤文本中，空段落和重复的段落不添加
+
+        启用段落去重时，与之前任意一张图片中的段落重复的段落也不添加，记录在merged_paragraphs中
+
+        参数:
+            file_name: 图片文件名
+            filtered_text: 本张图片已提取的段落列表
+            paragraph: 当前段落的行列表
+        """
+        paragraph_text = ''.join(paragraph)
+        if not paragraph_text or paragraph_text in filtered_text:
+            return
+        if self.paragraph_deduper is not None:
+            duplicate = self.paragraph_deduper.add(paragraph_text, file_name)
+            if duplicate is not None:
+                kept_file_name, similarity = duplicate
+                LogManager.info(
+                    LangManager.get_lang('duplicate_paragraph_skipped'),
+                    file_name, self.preview_paragraph(paragraph_text), kept_file_name, similarity
+                )
+                self.merged_paragraphs.append((file_name, paragraph_text, kept_file_name, similarity))
+                PipelineMetrics.count('paragraphs_merged')
+                return
+        filtered_text.append(paragraph_text)
+
+    @staticmethod
+    def preview_paragraph(paragraph_text, length=20):
+        """
+        截取段落开头用于输出到控制台和结果文件
 
         参数:
-            file_path: 图片文件路径
+            paragraph_text: 段落文本
+            length: 最多保留的字数
 
         返回:
-            dict: 包含处理结果或错误信息的字典
-                - 如果成功: {'text': 处理后的文本}
+            str: 超出长度时以省略号结尾的段落开头
+        """
+        if len(paragraph_text) <= length:
+            return paragraph_text
+        return paragraph_text[:length] + '…'
+
+    def recognize_image(self, file_path):
+        """
+        对单个图片路径执行OCR识别，不修改提取器的任何状态
+
+        参数:
+            file_path: 图片文件路径或内存中的OCRImage
+
+        返回:
+            dict: 包含识别结果或错误信息的字典
+                - 如果成功: {'text': OCR识别的原始文本, 'debug_entry': 调试信息条目}，
+                  拼接图片按文字块位置拆分后还包含'parts': [(源图片文件名, 识别文本), ...]
                 - 如果失败: {'error': 错误信息}
 
-        该方法执行以下操作:
+        该方法只读取共享状态，可以在多个线程中并发调用，
+        识别结果需要再交给handle_recognition按原始顺序处理。
+        执行以下操作:
         1. 检查图片尺寸是否符合要求
         2. 获取OCR模块单例
-        3. 使用OCR模块识别文本
-        4. 添加延迟以避免API QPS限制
-        5. 调用process_text处理识别的文本
-        6. 捕获并处理可能的异常
+        3. 使用OCR模块识别文本，OCR模块会先查询结果缓存，
+           未命中时通过共享限流器获取请求配额，避免超出API QPS限制；
+           多张截图拼接的图片在OCR模块支持时识别文字块位置，按布局表拆回各张截图
+        4. 获取本次识别对应的调试信息
         """
         try:
-            # 检查图片尺寸
-            with Image.open(file_path) as img:
-                width, height = img.size
-                
             # 获取OCR模块单例
             ocr_module = OCRModule.get_instance()
-            
+
             # 检查图片尺寸是否超过OCR模块的最大支持尺寸
-            max_width = ocr_module.get_max_width()
-            max_height = ocr_module.get_max_height()
-            
-            if width > max_width or height > max_height:
-                error_msg = LangManager.get_lang('image_size_exceeded').format(
-                    file_path, width, height, max_width, max_height
-                )
-                print(error_msg)
-                self.output.append(f'{error_msg}\n')
-                self.error_count += 1
+            error_msg = self._check_image_size(file_path, ocr_module)
+            if error_msg:
                 return {'error': error_msg}
-            
-            # 使用OCR模块识别文本
+
+            if self._needs_split(file_path, ocr_module):
+                return self._split_recognition(file_path, ocr_module.recognize_words(file_path), ocr_module)
+
+            # 使用OCR模块识别文本，命中缓存时不发起请求，否则按频率限制获取请求配额
             text = ocr_module.recognize_text(file_path)
-            
-            # 添加延迟以避免QPS限制
-            delay = ocr_module.get_api_delay()
-            print(LangManager.get_lang('ocr_module_delay_info').format(delay))
-            time.sleep(delay)
-            
-            # 处理识别的文本
-            file_name = os.path.basename(file_path)
-            processed_text = self.process_text(
-                file_name=file_name,
-                text=text
-            )
-            
-            if processed_text:
-                # 调试信息已存储在self.ocr_debug_info中，无需返回
-                return {
-                    'text': processed_text
-                }
-            else:
-                error_msg = LangManager.get_lang('text_processing_failed').format(file_path)
+
+            # 模块的调试信息按线程保存，需要在同一线程中紧接着识别调用获取
+            debug_entry = ''
+            if text and self.output_ocr_debug:
+                debug_entry = ocr_module.get_recognition_debug_info()
+
+            return {
+                'text': text,
+                'debug_entry': debug_entry
+            }
+        except QuotaExhaustedError:
+            return {'error': LangManager.get_lang('daily_quota_exhausted').format(file_path)}
+        except Exception as e:
+            error_msg = LangManager.get_lang('ocr_processing_failed').format(file_path, str(e))
+            return {'error': error_msg}
+
+    async def recognize_image_async(self, file_path):
+        """
+        recognize_image的异步版本，供事件循环驱动的分发器使用
+
+        参数:
+            file_path: 图片文件路径或内存中的OCRImage
+
+        返回:
+            dict: 与recognize_image相同格式的识别结果
+
+        OCR模块提供原生异步实现时，请求在事件循环中完成，不占用线程；
+        否则把recognize_image整体交给线程池执行。
+        """
+        ocr_module = OCRModule.get_instance()
+        if not ocr_module.supports_native_async() or ocr_module.supports_async_jobs():
+            loop = asyncio.get_event_loop()
+            return await loop.run_in_executor(None, self.recognize_image, file_path)
+
+        try:
+            # 检查图片尺寸是否超过OCR模块的最大支持尺寸
+            error_msg = self._check_image_size(file_path, ocr_module)
+            if error_msg:
                 return {'error': error_msg}
+
+            if self._needs_split(file_path, ocr_module):
+                words = await ocr_module.recognize_words_async(file_path)
+                return self._split_recognition(file_path, words, ocr_module)
+
+            # 使用OCR模块的原生异步实现识别文本，等待请求配额时不阻塞事件循环
+            text = await ocr_module.recognize_text_async(file_path)
+
+            # 识别返回后不经过await立即获取调试信息，不会被其他协程覆盖
+            debug_entry = ''
+            if text and self.output_ocr_debug:
+                debug_entry = ocr_module.get_recognition_debug_info()
+
+            return {
+                'text': text,
+                'debug_entry': debug_entry
+            }
+        except QuotaExhaustedError:
+            return {'error': LangManager.get_lang('daily_quota_exhausted').format(file_path)}
         except Exception as e:
             error_msg = LangManager.get_lang('ocr_processing_failed').format(file_path, str(e))
-            print(error_msg)
+            return {'error': error_msg}
+
+    def recognize_images(self, file_paths):
+        """
+        通过OCR模块的批量接口在一次请求中识别多张图片，不修改提取器的任何状态
+
+        参数:
+            file_paths: 图片文件路径或OCRImage的列表，长度不超过OCR模块的最大批量大小
+
+        返回:
+            list: 与file_paths一一对应、与recognize_image格式相同的识别结果
+
+        尺寸超限的图片不会加入批量请求，直接返回错误；需要按文字块位置拆分的拼接图片
+        不加入批量请求，通过recognize_image单独识别；
+        整个批量请求只占用一个请求配额，请求失败时所有图片都返回错误。
+        """
+        recognitions = [None] * len(file_paths)
+        try:
+            # 获取OCR模块单例
+            ocr_module = OCRModule.get_instance()
+
+            # 检查每张图片的尺寸
+            batch = []
+            for index, file_path in enumerate(file_paths):
+                error_msg = self._check_image_size(file_path, ocr_module)
+                if error_msg:
+                    recognitions[index] = {'error': error_msg}
+                elif self._needs_split(file_path, ocr_module):
+                    recognitions[index] = self.recognize_image(file_path)
+                else:
+                    batch.append((index, file_path))
+            if not batch:
+                return recognitions
+
+            # 命中缓存的图片不加入请求，整个批量请求只获取一个请求配额
+            try:
+                texts = ocr_module.recognize_batch([file_path for _, file_path in batch])
+            except QuotaExhaustedError:
+                for index, file_path in batch:
+                    recognitions[index] = {'error': LangManager.get_lang('daily_quota_exhausted').format(file_path)}
+                return recognitions
+            debug_entries = ocr_module.get_batch_debug_info() if self.output_ocr_debug else []
+
+            for position, (index, file_path) in enumerate(batch):
+                text = texts[position] if position < len(texts) else None
+                debug_entry = debug_entries[position] if text and position < len(debug_entries) else ''
+                recognitions[index] = {
+                    'text': text,
+                    'debug_entry': debug_entry
+                }
+            return recognitions
+        except Exception as e:
+            for index, file_path in enumerate(file_paths):
+                if recognitions[index] is None or 'text' in recognitions[index]:
+                    recognitions[index] = {'error': LangManager.get_lang('ocr_processing_failed').format(file_path, str(e))}
+            return recognitions
+
+    @staticmethod
+    def _needs_split(file_path, ocr_module):
+        """
+        识别结果是否需要按文字块位置拆回各张源图片
+
+        参数:
+            file_path: 图片文件路径或内存中的OCRImage
+            ocr_module: OCR模块单例
+
+        返回:
+            bool: 多张截图拼接的图片并且OCR模块支持返回文字块位置时返回True
+        """
+        return (isinstance(file_path, OCRImage) and file_path.layout is not None
+                and len(file_path.layout) > 1 and ocr_module.supports_word_locations())
+
+    def _split_recognition(self, file_path, words, ocr_module):
+        """
+        把拼接图片的文字块按布局表拆分为各张源图片的识别文本
+
+        参数:
+            file_path: 带有布局表的OCRImage
+            words: OCR模块识别出的文字块列表，识别失败时为None
+            ocr_module: OCR模块单例
+
+        返回:
+            dict: 与recognize_image格式相同的识别结果，成功时包含parts
+        """
+        if not words:
+            return {'text': None, 'debug_entry': ''}
+
+        # 模块的调试信息按线程保存，需要在同一线程中紧接着识别调用获取
+        debug_entry = ''
+        if self.output_ocr_debug:
+            debug_entry = ocr_module.get_recognition_debug_info()
+        return {
+            'text': '\n'.join(word.get('words', '') for word in words),
+            'parts': split_words_by_layout(words, file_path.layout),
+            'debug_entry': debug_entry
+        }
+
+    def _check_image_size(self, file_path, ocr_module):
+        """
+        检查图片尺寸和数据量是否超过OCR模块的最大支持尺寸和最大数据量
+
+        参数:
+            file_path: 图片文件路径或内存中的OCRImage
+            ocr_module: OCR模块单例
+
+        返回:
+            str: 超出限制时返回错误信息，否则返回None
+        """
+        width, height = get_image_size(file_path)
+
+        max_width = ocr_module.get_max_width()
+        max_height = ocr_module.get_max_height()
+
+        if width > max_width or height > max_height:
+            return LangManager.get_lang('image_size_exceeded').format(
+                file_path, width, height, max_width, max_height
+            )
+
+        max_bytes = ocr_module.get_max_payload_bytes()
+        if max_bytes:
+            size = get_image_byte_size(file_path)
+            if size > max_bytes:
+                return LangManager.get_lang('image_bytes_exceeded').format(file_path, size, max_bytes)
+        return None
+
+    def handle_recognition(self, file_path, recognition):
+        """
+        处理recognize_image返回的识别结果，更新输出和统计信息
+
+        参数:
+            file_path: 图片文件路径或内存中的OCRImage
+            recognition: recognize_image返回的字典
+
+        返回:
+            dict: 包含处理结果或错误信息的字典
+                - 如果成功: {'text': 处理后的文本}，识别结果已拆分到各张源图片时
+                  还包含'parts': [(源图片文件名, 处理后的文本), ...]
+                - 如果失败: {'error': 错误信息}
+
+        该方法会修改输出内容和统计数据，需要按图片的原始顺序在同一线程中调用。
+        已拆分的识别结果按源图片逐张处理，开始/停止标记不会跨越截图，统计数据也按截图计数。
+        """
+        if 'error' in recognition:
+            error_msg = recognition['error']
+            LogManager.error(error_msg)
             self.output.append(f'{error_msg}\n')
             self.error_count += 1
             return {'error': error_msg}
 
+        if recognition.get('parts') and recognition.get('text'):
+            return self._handle_parts(file_path, recognition)
+
+        # 处理识别的文本
+        file_name = get_image_name(file_path)
+        processed_text = self.process_text(
+            file_name=file_name,
+            text=recognition['text'],
+            debug_entry=recognition.get('debug_entry', '')
+        )
+
+        if processed_text:
+            # 调试信息已存储在self.ocr_debug_info中，无需返回
+            return {
+                'text': processed_text
+            }
+        else:
+            error_msg = LangManager.get_lang('text_processing_failed').format(file_path)
+            return {'error': error_msg}
+
+    def _handle_parts(self, file_path, recognition):
+        """
+        逐张处理已按源图片拆分的识别结果
+
+        画布中没有文字的源图片作为内容为空的成功结果，整张画布都没有识别出文字时才由handle_recognition报告识别失败。
+
+        参数:
+            file_path: 拼接后的OCRImage或运行日志中记录的画布名称
+            recognition: 包含parts的识别结果字典
+
+        返回:
+            dict: {'text': 各源图片处理后的文本, 'parts': [(源图片文件名, 处理后的文本), ...]}，
+                所有源图片都处理失败时返回{'error': 错误信息}
+        """
+        debug_entry = recognition.get('debug_entry', '')
+        parts = []
+        for file_name, text in recognition['parts']:
+            if not text:
+                # 画布中识别出了文字，只是这张源图片中没有(例如空白或过场截图)，不算识别失败
+                self.success_count += 1
+                parts.append((file_name, ''))
+                continue
+            # 调试信息只随第一张有文字的源图片记录一次
+            processed_text = self.process_text(file_name=file_name, text=text, debug_entry=debug_entry)
+            debug_entry = ''
+            if processed_text is not None:
+                parts.append((file_name, processed_text))
+
+        if not parts:
+            return {'error': LangManager.get_lang('text_processing_failed').format(file_path)}
+        return {
+            'text': '\n'.join(text for _, text in parts if text),
+            'parts': parts
+        }
+
+    def process_image(self, file_path):
+        """
+        处理单个图片路径，执行OCR识别和文本处理
+
+        参数:
+            file_path: 图片文件路径或内存中的OCRImage
+
+        返回:
+            dict: 包含处理结果或错误信息的字典
+                - 如果成功: {'text': 处理后的文本}
+                - 如果失败: {'error': 错误信息}
+
+        该方法依次调用recognize_image和handle_recognition，适用于串行处理。
+        """
+        return self.handle_recognition(file_path, self.recognize_image(file_path))
+
     def get_statistics(self):
         """
         获取处理统计信息
@@ -204,9 +546,11 @@ class TextExtractor:
                 - success_count: 成功处理的图片数量
                 - error_count: 处理失败的图片数量
                 - suspected_dash_count: 疑似包含破折号问题的文件数量
+                - merged_paragraph_count: 被合并的重复段落数量
         """
         return {
             'success_count': self.success_count,
             'error_count': self.error_count,
-            'suspected_dash_count': len(self.suspected_dash_files)
+            'suspected_dash_count': len(self.suspected_dash_files),
+            'merged_paragraph_count': len(self.merged_paragraphs)
         }
\ No newline at end of file
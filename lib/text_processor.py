@@ -1,13 +1,28 @@
+import io
 import os
 import sys
 import time
 import json
+import heapq
+import asyncio
+import itertools
+import threading
+from concurrent.futures.process import BrokenProcessPool
 from PIL import Image
 from lang_manager import LangManager
+from log_manager import LogManager
 from config.config_manager import ConfigManager
 
 from ocr_core.ocr_module import OCRModule
+from ocr_core.ocr_dispatcher import OCRDispatcher
+from ocr_core.ocr_image import OCRImage
+from image_processing.canvas_pool import CanvasPool
+from image_processing.canvas_renderer import CanvasRenderer, render_canvas
+from image_processing.payload_encoder import PayloadEncoder
 from text_extracting.text_extractor import TextExtractor
+from run_journal import RunJournal
+from result_writer import StreamingResultWriter
+from metrics import PipelineMetrics
 
 class TextProcessor:
     """文本处理加载器，负责协调整个图片处理流程
@@ -17,12 +32,19 @@ class TextProcessor:
     并最终生成处理结果和调试信息。
     """
 
-    def __init__(self, config=None):
+    # 估计的画布数据量占OCR模块最大数据量的比例上限，为估计误差留出余量
+    PAYLOAD_SAFETY_MARGIN = 0.8
+    # 需要处理的图片扩展名
+    IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.bmp', '.gif')
+
+    def __init__(self, config=None, canvas_renderer=None, canvas_pool=None):
         """
         初始化文本处理器
 
         参数:
             config: 配置字典，如果为None则使用默认配置
+            canvas_renderer: 多个目录共用的渲染器，见create_canvas_renderer，由调用方负责关闭
+            canvas_pool: 多个目录共用的画布池，由调用方负责清空
 
         属性初始化:
             parent_dir: 项目根目录
@@ -30,9 +52,33 @@ class TextProcessor:
             dir_name: 处理目录名称
             output_file: 结果输出文件路径
             debug_output_file: OCR调试信息输出文件路径
+            journal_file: 运行日志文件路径
+            metrics_file: 分阶段耗时和计数器的JSON文件路径
+            resume_mode: 运行日志的使用方式，off重新开始，resume跳过已记录的图片，retry_failed只重新识别失败的图片
+            journal: 运行日志，打开失败时为None
+            result_writer: 流式写入结果文件的写入器，开始处理图片后创建
+            output_sequence: 下一段写入结果文件的文本的序号
+            watch_mode: 是否在处理完已有截图后继续监视处理目录中的新截图
+            watch_settle_seconds: 新截图保持不变多久后视为写入完成(秒)
+            watch_poll_interval: 监视模式下两次检查之间的最长间隔(秒)
+            stop_event: 设置后结束监视模式
             output_ocr_debug: 是否输出OCR调试信息的标志
-            max_vertical_images: 最大纵向拼接图片数量
-            temp_dir: 临时文件目录
+            output_metrics: 是否统计分阶段耗时和计数器，并写入调试信息和metrics_file
+            max_vertical_images: vertical拼接模式下每张画布的最大图片数量
+            stitch_mode: 拼接方式，packed按OCR模块的尺寸和数据量限制拼接，vertical按max_vertical_images纵向拼接
+            stitch_color_mode: 拼接画布的颜色模式，RGB为彩色，L为灰度，1为二值
+            payload_encoder: 按PAYLOAD_ENCODING在OCR模块的数据量限制内选择上传图片编码方式的编码器
+            canvas_pool: 在各张画布之间复用内存的拼接画布池
+            cpu_workers: 拼接和编码画布的工作进程数，0表示在识别线程中拼接
+            canvas_renderer: 在工作进程中拼接画布的渲染器，cpu_workers为0时为None
+            shared_canvas: 渲染器和画布池是否由调用方传入，是时处理结束后不关闭渲染器、不清空画布池
+            max_concurrent_requests: 同时在途的最大OCR请求数
+            dispatch_mode: 并发方式，thread使用线程池，async使用事件循环
+            dedupe_screenshots: 是否在OCR识别前跳过近似重复的截图
+            dedupe_hash_threshold: 判定截图近似重复的最大感知哈希差异位数
+            skipped_duplicates: 被跳过的重复截图列表，元素为(文件名, 代表图片文件名, 差异位数)
+            duplicate_detector: 近似重复截图检测器，第一次去重时创建
+            region_detector: 拼接前把截图裁剪到剧情梗概面板的区域检测器
             loc_manager: 语言管理器实例
             text_extractor: 文本提取器实例
             processed_results: 存储处理结果的字典
@@ -44,12 +90,44 @@ class TextProcessor:
         # 设置输出文件
         self.output_file = os.path.join(self.process_dir, f'{self.dir_name}.txt')
         self.debug_output_file = os.path.join(self.process_dir, f'{self.dir_name}_ocr_debug.txt')
+        self.journal_file = os.path.join(self.process_dir, f'{self.dir_name}_journal.jsonl')
+        self.metrics_file = os.path.join(self.process_dir, f'{self.dir_name}_metrics.json')
         # 从配置中获取更多信息
         self.output_ocr_debug = ConfigManager.get('OUTPUT_OCR_DEBUG', 'False').lower() == 'true'# 因为没储存成布尔值，所以用这个奇淫技巧转换为布尔值
+        self.output_metrics = ConfigManager.get('OUTPUT_METRICS', 'False').lower() == 'true'
+        # 每个处理目录单独统计
+        PipelineMetrics.enable(self.output_metrics)
+        PipelineMetrics.reset()
         self.max_vertical_images = int(ConfigManager.get('MAX_VERTICAL_IMAGES', 4))
-        # 临时目录，用于存储拼接后的图片
-        self.temp_dir = os.path.join(self.process_dir, 'temp')
-        os.makedirs(self.temp_dir, exist_ok=True)
+        self.stitch_mode = ConfigManager.get('STITCH_MODE', 'packed')
+        self.stitch_color_mode = ConfigManager.get('STITCH_COLOR_MODE', 'RGB')
+        self.max_concurrent_requests = int(ConfigManager.get('MAX_CONCURRENT_REQUESTS', 4))
+        self.dispatch_mode = ConfigManager.get('DISPATCH_MODE', 'thread')
+        self.dedupe_screenshots = ConfigManager.get('DEDUPE_SCREENSHOTS', 'False').lower() == 'true'
+        self.dedupe_hash_threshold = int(ConfigManager.get('DEDUPE_HASH_THRESHOLD', 10))
+        self.resume_mode = ConfigManager.get('RESUME_MODE', 'off')
+        self.journal = None
+        self.result_writer = None
+        self.output_sequence = 0
+        self.watch_mode = ConfigManager.get('WATCH_MODE', 'False').lower() == 'true'
+        self.watch_settle_seconds = float(ConfigManager.get('WATCH_SETTLE_SECONDS', 2.0))
+        self.watch_poll_interval = 1.0
+        self.stop_event = threading.Event()
+        self.skipped_duplicates = []
+        self.duplicate_detector = None
+        self.region_detector = self.create_region_detector()
+        self.cpu_workers = int(ConfigManager.get('CPU_WORKERS', 2))
+        # 批量处理时所有目录共用一个渲染器和画布池，工作进程只启动一次
+        self.shared_canvas = canvas_renderer is not None or canvas_pool is not None
+        if self.shared_canvas:
+            self.canvas_renderer = canvas_renderer
+        else:
+            self.canvas_renderer = self.create_canvas_renderer()
+        self.canvas_pool = canvas_pool if canvas_pool is not None else CanvasPool(max_idle=self.max_concurrent_requests)
+        if self.canvas_renderer is not None:
+            self.payload_encoder = self.canvas_renderer.encoder
+        else:
+            self.payload_encoder = self.create_payload_encoder()
 
         # 初始化文本提取器
         self.text_extractor = TextExtractor()
@@ -57,6 +135,53 @@ class TextProcessor:
         # 存储处理结果
         self.processed_results = {}
 
+    def create_region_detector(self):
+        """根据ROI_MODE和ROI_REGION配置创建区域检测器
+
+        返回:
+            RegionDetector: 区域检测器，ROI_REGION格式错误时不裁剪
+        """
+        from image_processing.region_detector import RegionDetector
+
+        roi_mode = ConfigManager.get('ROI_MODE', 'off')
+        roi_region = ConfigManager.get('ROI_REGION', '0.24,0.24,0.76,0.77')
+        region = RegionDetector.parse_region(roi_region)
+        if roi_mode == 'fixed' and region is None:
+            LogManager.warning(LangManager.get_lang('roi_region_invalid'), roi_region)
+            roi_mode = 'off'
+        return RegionDetector(roi_mode, region or (0.0, 0.0, 1.0, 1.0))
+
+    @staticmethod
+    def create_payload_encoder():
+        """根据PAYLOAD_ENCODING等配置和OCR模块声明的格式与数据量限制创建编码器
+
+        返回:
+            PayloadEncoder: 上传图片的编码器
+        """
+        ocr_module = OCRModule.get_instance()
+        return PayloadEncoder(
+            strategy=ConfigManager.get('PAYLOAD_ENCODING', 'png'),
+            formats=ocr_module.get_supported_formats(),
+            max_bytes=ocr_module.get_max_payload_bytes(),
+            color_mode=ConfigManager.get('STITCH_COLOR_MODE', 'RGB'),
+            quality=int(ConfigManager.get('PAYLOAD_QUALITY', 90)),
+            png_compress_level=int(ConfigManager.get('PAYLOAD_PNG_COMPRESS_LEVEL', 6))
+        )
+
+    @classmethod
+    def create_canvas_renderer(cls):
+        """根据CPU_WORKERS配置创建在工作进程中拼接画布的渲染器
+
+        批量处理时由调用方创建一次并传给每个目录的TextProcessor，所有目录共用同一组工作进程。
+
+        返回:
+            CanvasRenderer: 渲染器，CPU_WORKERS为0时返回None
+        """
+        cpu_workers = int(ConfigManager.get('CPU_WORKERS', 2))
+        if cpu_workers <= 0:
+            return None
+        return CanvasRenderer(cpu_workers, cls.create_payload_encoder())
+
     def initialize(self):
         """初始化OCR模块和相关配置
 
@@ -70,7 +195,7 @@ class TextProcessor:
 
             return True
         except Exception as e:
-            print(LangManager.get_lang('init_fail').format(str(e)))
+            LogManager.error(LangManager.get_lang('init_fail'), str(e))
             return False
 
     def find_image_files(self):
@@ -79,9 +204,20 @@ class TextProcessor:
         返回:
             list: 按文件名排序的图片文件列表
         """
-        image_files = [f for f in os.listdir(self.process_dir) if f.lower().endswith(('.png', '.jpg', '.jpeg', '.bmp', '.gif'))]
-        
-        # 按文件名排序
+        with PipelineMetrics.timer('scan'):
+            image_files = [f for f in os.listdir(self.process_dir) if f.lower().endswith(self.IMAGE_EXTENSIONS)]
+            return self.sort_image_files(image_files)
+
+    def sort_image_files(self, image_files):
+        """按文件名排序图片文件，文件名都是数字时按数值排序
+
+        参数:
+            image_files: 图片文件名列表
+
+        返回:
+            list: 排序后的图片文件名列表
+        """
+        image_files = list(image_files)
         try:
             image_files.sort(key=lambda x: int(os.path.splitext(x)[0]))
         except ValueError:
@@ -89,56 +225,466 @@ class TextProcessor:
         
         return image_files
 
-    def stitch_images_vertically(self, image_paths):
+    def remove_duplicate_images(self, image_files):
+        """跳过近似重复的截图，每组重复截图只保留最早的一张
+
+        参数:
+            image_files: 按处理顺序排列的图片文件名列表
+
+        返回:
+            list: 去除重复截图后的图片文件名列表，被跳过的截图记录在skipped_duplicates中
         """
-        将多张图片纵向拼接成一张
-        
+        from image_processing.duplicate_detector import DuplicateDetector
+
+        # 检测器保留之前处理过的代表图片，监视模式下新截图也会与之前的截图比较
+        if self.duplicate_detector is None:
+            self.duplicate_detector = DuplicateDetector(threshold=self.dedupe_hash_threshold)
+        image_paths = [os.path.join(self.process_dir, file_name) for file_name in image_files]
+        with PipelineMetrics.timer('dedupe'):
+            kept_paths, duplicates = self.duplicate_detector.find_duplicates(image_paths)
+        PipelineMetrics.count('duplicates_skipped', len(duplicates))
+
+        for duplicate_path, representative_path, distance in duplicates:
+            duplicate_name = os.path.basename(duplicate_path)
+            representative_name = os.path.basename(representative_path)
+            LogManager.info(LangManager.get_lang('duplicate_screenshot_skipped'), duplicate_name, representative_name, distance)
+            self.skipped_duplicates.append((duplicate_name, representative_name, distance))
+
+        return [os.path.basename(image_path) for image_path in kept_paths]
+
+    def build_stitch_items(self, file_paths):
+        """读取每张图片的尺寸和裁剪区域，生成拼接规划器的输入
+
         参数:
-            image_paths: 图片路径列表
-        
+            file_paths: 按处理顺序排列的图片路径列表
+
         返回:
-            str: 拼接后的图片路径，如果拼接失败则返回None
+            list: StitchItem列表，无法读取的图片按原尺寸0处理，单独成为一张画布并在识别时报告错误
+
+        只读取图片头获取尺寸，ROI_MODE为auto时每种分辨率只有前几张截图需要解码检测面板位置。
+        数据量按源文件大小乘以裁剪区域的面积比例估计，非PNG图片重新编码为PNG后会变大，
+        按每像素1.5字节(灰度时0.5字节)估计。
+        """
+        from image_processing.stitch_planner import StitchItem
+
+        items = []
+        for file_path in file_paths:
+            try:
+                with Image.open(file_path) as img:
+                    width, height = img.size
+                    is_png = img.format == 'PNG'
+                    crop_box = self.region_detector.get_crop_box(img)
+            except Exception:
+                items.append(StitchItem(file_path, 0, 0))
+                continue
+
+            if crop_box is not None and crop_box == (0, 0, width, height):
+                crop_box = None
+            crop_width, crop_height = width, height
+            if crop_box is not None:
+                crop_width, crop_height = crop_box[2] - crop_box[0], crop_box[3] - crop_box[1]
+
+            if is_png:
+                estimated_bytes = os.path.getsize(file_path) * crop_width * crop_height // (width * height)
+            elif self.stitch_color_mode in ('L', '1'):
+                estimated_bytes = crop_width * crop_height // 2
+            else:
+                estimated_bytes = crop_width * crop_height * 3 // 2
+            items.append(StitchItem(file_path, crop_width, crop_height, crop_box, estimated_bytes))
+        return items
+
+    def plan_canvases(self, file_paths):
+        """把图片规划到拼接画布中
+
+        packed模式按OCR模块的最大宽高和最大数据量尽量多地拼接图片，减少请求次数，
+        OCR模块支持返回文字块位置时识别结果可以按坐标拆回各张截图，截图还会左右并排拼接为多列；
+        vertical模式保持旧的行为，每max_vertical_images张图片纵向拼接为一张。
+
+        参数:
+            file_paths: 按处理顺序排列的图片路径列表
+
+        返回:
+            list: CanvasPlan列表，按处理顺序排列
+        """
+        from image_processing.stitch_planner import StitchPlanner
+
+        if self.stitch_mode == 'vertical':
+            planner = StitchPlanner(0, 0, max_images=self.max_vertical_images)
+        else:
+            ocr_module = OCRModule.get_instance()
+            planner = StitchPlanner(
+                ocr_module.get_max_width(),
+                ocr_module.get_max_height(),
+                int(ocr_module.get_max_payload_bytes() * self.PAYLOAD_SAFETY_MARGIN),
+                max_columns=0 if ocr_module.supports_word_locations() else 1
+            )
+        with PipelineMetrics.timer('plan'):
+            canvases = planner.plan(self.build_stitch_items(file_paths))
+        PipelineMetrics.count('images', len(file_paths))
+        PipelineMetrics.count('canvases', len(canvases))
+        return canvases
+
+    def stitch_canvas(self, plan):
+        """
+        按布局表把图片拼接到一张画布上
+
+        参数:
+            plan: CanvasPlan布局表
+
+        返回:
+            OCRImage: 拼接后在内存中编码的图片，带有布局表，如果拼接失败则返回None
+
+        需要裁剪的图片先裁剪到布局表中记录的区域再粘贴。画布从canvas_pool中取出，
+        由payload_encoder编码后放回池中供后续画布复用；stitch_color_mode为L或1时拼接为灰度图片。
+        拼接结果不写入磁盘，直接交给OCR模块识别。该方法在当前线程中拼接，
+        cpu_workers大于0时画布由canvas_renderer在工作进程中拼接，见render_groups。
         """
         try:
-            # 打开所有图片
-            images = [Image.open(img_path) for img_path in image_paths]
-            
-            # 获取每张图片的宽度和高度
-            widths, heights = zip(*(img.size for img in images))
-            
-            # 计算拼接后图片的总宽度和总高度
-            total_width = max(widths)
-            total_height = sum(heights)
-            
-            # 创建一个新的空白图片
-            new_image = Image.new('RGB', (total_width, total_height), color='white')
-            
-            # 拼接图片
-            y_offset = 0
-            for img in images:
-                new_image.paste(img, (0, y_offset))
-                y_offset += img.size[1]
-            
-            # 保存拼接后的图片
-            stitch_file_name = f"stitched_{os.path.basename(image_paths[0]).split('.')[0]}_{os.path.basename(image_paths[-1]).split('.')[0]}.png"
-            stitch_file_path = os.path.join(self.temp_dir, stitch_file_name)
-            new_image.save(stitch_file_path)
-            
-            return stitch_file_path
+            data, size, encoding = render_canvas(plan, self.payload_encoder, self.canvas_pool)
+            return self.wrap_rendered(plan, data, size, encoding)
         except Exception as e:
-            error_msg = LangManager.get_lang('image_stitch_error').format(str(e))
-            print(error_msg)
+            LogManager.error(LangManager.get_lang('image_stitch_error'), str(e))
             return None
 
+    def prepare_group(self, plan):
+        """准备一张画布的识别输入
+
+        只有一张不需要裁剪的图片并且编码器不需要重新编码时直接使用文件路径，
+        否则按布局表拼接并编码为内存中的OCRImage。
+
+        参数:
+            plan: CanvasPlan布局表
+
+        返回:
+            str or OCRImage: 识别输入，拼接失败时返回None
+        """
+        if not plan.needs_render() and not self.payload_encoder.needs_encoding(plan.placements[0].file_path):
+            return plan.placements[0].file_path
+        return self.stitch_canvas(plan)
+
+    def wrap_rendered(self, plan, data, size, encoding):
+        """把编码后的画布包装为OCRImage，输出选择的编码方式，并把拼接的耗时计入指标
+
+        参数:
+            plan: CanvasPlan布局表
+            data: 编码后的图片数据
+            size: 画布尺寸(宽, 高)
+            encoding: PayloadEncoder.encode返回的编码信息
+
+        返回:
+            OCRImage: 带有布局表的内存图片
+        """
+        LogManager.debug(LangManager.get_lang('payload_encoding_info'), plan.name, PayloadEncoder.describe(encoding))
+        if PipelineMetrics.is_enabled():
+            for stage, seconds in encoding.get('timings', {}).items():
+                PipelineMetrics.add_time(stage, seconds)
+            PipelineMetrics.count('pixels_decoded', encoding.get('pixels_decoded', 0))
+            PipelineMetrics.count('pixels_encoded', size[0] * size[1])
+        return OCRImage(plan.name, data, size, plan.get_layout())
+
+    def render_groups(self, groups):
+        """流水线的拼接阶段，把需要拼接的画布提前提交到工作进程
+
+        工作进程解码、裁剪、拼接和编码画布的同时，识别线程等待之前画布的OCR请求。
+        最多提前提交canvas_renderer.max_pending张画布，识别阶段取走一张后才提交下一张，
+        识别慢于拼接时拼接阶段随之暂停，内存中的画布数量保持有界。
+
+        参数:
+            groups: CanvasPlan列表
+
+        Yields:
+            tuple: (CanvasPlan, 工作进程中的拼接任务)，不需要拼接或不使用工作进程时拼接任务为None，
+                由resolve_group在识别线程中拼接
+        """
+        if self.canvas_renderer is None:
+            for plan in groups:
+                yield plan, None
+            return
+        yield from self.canvas_renderer.submit_ordered(groups)
+
+    def resolve_group(self, plan, rendered=None):
+        """获取一张画布的识别输入，等待工作进程中的拼接任务完成
+
+        参数:
+            plan: CanvasPlan布局表
+            rendered: render_groups产出的拼接任务，None时在当前线程中准备
+
+        返回:
+            str or OCRImage: 识别输入，拼接失败时返回None
+        """
+        if rendered is None:
+            return self.prepare_group(plan)
+        try:
+            # 等待时间较长说明拼接跟不上识别
+            with PipelineMetrics.timer('render_wait'):
+                data, size, encoding = rendered.result()
+        except BrokenProcessPool:
+            # 工作进程异常退出，改为在当前线程中拼接
+            return self.prepare_group(plan)
+        except Exception as e:
+            LogManager.error(LangManager.get_lang('image_stitch_error'), str(e))
+            return None
+        return self.wrap_rendered(plan, data, size, encoding)
+
+    def open_result_writer(self):
+        """创建结果文件，之后处理完成的文本会立即写入"""
+        self.result_writer = StreamingResultWriter(self.output_file)
+        self.result_writer.open()
+        self.output_sequence = 0
+
+    def flush_output(self):
+        """把文本提取器中尚未写入的文本作为一段写入结果文件"""
+        if self.result_writer is None:
+            return
+        with PipelineMetrics.timer('write_output'):
+            self.result_writer.write(self.output_sequence, ''.join(self.text_extractor.output))
+        self.output_sequence += 1
+        self.text_extractor.output.clear()
+
+    def open_journal(self, file_names):
+        """打开运行日志，按resume_mode找出可以直接复用的识别结果
+
+        参数:
+            file_names: 本次要识别的图片文件名列表
+
+        返回:
+            dict: 图片文件名 -> 可以复用的日志记录，resume_mode为off或日志打开失败时返回空字典
+        """
+        reusable = {}
+        try:
+            self.journal = RunJournal(self.journal_file)
+            if self.resume_mode in ('resume', 'retry_failed'):
+                records = self.journal.load()
+                if self.journal.corrupt_lines:
+                    LogManager.warning(LangManager.get_lang('run_journal_corrupt_lines'), self.journal.corrupt_lines)
+                reusable = self.journal.find_reusable(
+                    records, file_names, retry_failed=self.resume_mode == 'retry_failed'
+                )
+                LogManager.info(
+                    LangManager.get_lang('run_journal_resume_info'), len(reusable), len(file_names) - len(reusable)
+                )
+            self.journal.open(truncate=self.resume_mode not in ('resume', 'retry_failed'))
+        except Exception as e:
+            LogManager.warning(LangManager.get_lang('run_journal_open_fail'), str(e))
+            self.journal = None
+            reusable = {}
+        return reusable
+
+    def record_recognition(self, plan, recognition, elapsed):
+        """把一张画布的识别结果追加到运行日志
+
+        参数:
+            plan: CanvasPlan布局表
+            recognition: recognize_image返回的识别结果字典
+            elapsed: 识别耗时(秒)
+        """
+        if self.journal is None or recognition is None:
+            return
+        file_names = [os.path.basename(file_path) for file_path in plan.file_paths]
+        with PipelineMetrics.timer('journal'):
+            self.journal.append(file_names, plan.name, recognition, elapsed)
+
+    def recognize_group(self, plan, rendered=None):
+        """识别一张画布，单张图片直接识别，多张图片或需要裁剪时先按布局表拼接再识别
+
+        该方法不修改处理器和文本提取器的状态，可以在工作线程中并发调用。
+
+        参数:
+            plan: CanvasPlan布局表
+            rendered: render_groups产出的拼接任务，None时在当前线程中拼接
+
+        返回:
+            tuple: (实际识别的图片路径或拼接后的OCRImage, recognize_image返回的识别结果)，拼接失败时为(None, None)
+        """
+        start_time = time.monotonic()
+        file_path = self.resolve_group(plan, rendered)
+        if not file_path:
+            return None, None
+        recognition = self.text_extractor.recognize_image(file_path)
+        self.record_recognition(plan, recognition, time.monotonic() - start_time)
+        return file_path, recognition
+
+    async def recognize_group_async(self, plan, rendered=None):
+        """recognize_group的异步版本，裁剪和拼接在线程池中执行，识别使用OCR模块的异步接口
+
+        参数:
+            plan: CanvasPlan布局表
+            rendered: render_groups产出的拼接任务，None时在线程池中拼接
+
+        返回:
+            tuple: (实际识别的图片路径或OCRImage, 识别结果)，拼接失败时为(None, None)
+        """
+        loop = asyncio.get_event_loop()
+        start_time = time.monotonic()
+        file_path = await loop.run_in_executor(None, self.resolve_group, plan, rendered)
+        if not file_path:
+            return None, None
+        recognition = await self.text_extractor.recognize_image_async(file_path)
+        # 写入日志需要等待磁盘同步，不在事件循环中执行
+        await loop.run_in_executor(None, self.record_recognition, plan, recognition, time.monotonic() - start_time)
+        return file_path, recognition
+
+    def recognize_group_batch(self, groups, rendered=None):
+        """通过OCR模块的批量接口在一次请求中识别多张画布
+
+        每张画布先按recognize_group的规则拼接，再把所有画布一起交给批量接口识别。
+        该方法不修改处理器和文本提取器的状态，可以在工作线程中并发调用。
+
+        参数:
+            groups: CanvasPlan列表，长度不超过OCR模块的最大批量大小
+            rendered: 与groups一一对应的拼接任务列表，None时在当前线程中拼接
+
+        返回:
+            list: 与groups一一对应的(实际识别的图片路径或OCRImage, 识别结果)，拼接失败的画布为(None, None)
+        """
+        start_time = time.monotonic()
+        rendered = rendered or [None] * len(groups)
+        file_paths = [self.resolve_group(plan, task) for plan, task in zip(groups, rendered)]
+
+        valid_paths = [file_path for file_path in file_paths if file_path]
+        recognitions = iter(self.text_extractor.recognize_images(valid_paths) if valid_paths else [])
+        results = [(file_path, next(recognitions)) if file_path else (None, None) for file_path in file_paths]
+
+        elapsed = time.monotonic() - start_time
+        for plan, (_, recognition) in zip(groups, results):
+            self.record_recognition(plan, recognition, elapsed)
+        return results
+
+    async def recognize_group_batch_async(self, groups, rendered=None):
+        """recognize_group_batch的异步版本，批量接口没有异步实现，整体在线程池中执行
+
+        参数:
+            groups: CanvasPlan列表
+            rendered: 与groups一一对应的拼接任务列表
+
+        返回:
+            list: 与groups一一对应的(实际识别的图片路径, 识别结果)
+        """
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(None, self.recognize_group_batch, groups, rendered)
+
+    def dispatch_groups(self, groups):
+        """把画布分发给OCR模块识别，并按原始顺序逐张产出识别结果
+
+        画布先经过render_groups在工作进程中拼接，再交给识别线程或协程，两个阶段同时进行。
+        OCR模块支持批量识别时，每get_max_batch_size张画布合并为一次批量请求；
+        否则每张画布单独请求。在途的请求数不超过max_concurrent_requests。
+
+        参数:
+            groups: CanvasPlan列表
+
+        Yields:
+            tuple: (实际识别的图片路径或OCRImage, 识别结果)，拼接失败的画布为(None, None)
+        """
+        dispatcher = OCRDispatcher(self.max_concurrent_requests)
+        batch_size = OCRModule.get_instance().get_max_batch_size()
+
+        units = self.render_groups(groups)
+
+        if batch_size > 1:
+            # 每个批次为[(CanvasPlan, 拼接任务), ...]
+            batches = iter(lambda: list(itertools.islice(units, batch_size)), [])
+            if self.dispatch_mode == 'async':
+                results = dispatcher.map_ordered_async(
+                    lambda batch: self.recognize_group_batch_async(*map(list, zip(*batch))), batches
+                )
+            else:
+                results = dispatcher.map_ordered(
+                    lambda batch: self.recognize_group_batch(*map(list, zip(*batch))), batches
+                )
+            for _, batch_results in results:
+                yield from batch_results
+            return
+
+        if self.dispatch_mode == 'async':
+            results = dispatcher.map_ordered_async(lambda unit: self.recognize_group_async(*unit), units)
+        else:
+            results = dispatcher.map_ordered(lambda unit: self.recognize_group(*unit), units)
+        for _, group_result in results:
+            yield group_result
+
+    def recognize_files(self, image_files, first_batch=True):
+        """识别一批图片，并按原始顺序把处理后的文本写入结果文件
+
+        参数:
+            image_files: 按处理顺序排列的图片文件名列表
+            first_batch: 是否是本次运行的第一批图片，第一批图片处理前打开运行日志并按resume_mode复用识别结果
+
+        该方法包括：
+        1. 按配置跳过近似重复的截图
+        2. 按resume_mode读取运行日志，跳过已有识别结果的图片
+        3. 按stitch_mode把其余图片规划到拼接画布中
+        4. 并发识别各张画布（单张或拼接多张），在途请求数不超过max_concurrent_requests，
+           并发方式由dispatch_mode决定，OCR模块支持时多张画布合并为一次批量请求，
+           每张画布识别完成后立即追加到运行日志
+        5. 按原始顺序调用TextExtractor处理每张画布的识别结果和日志中复用的识别结果，
+           处理后的文本立即写入结果文件
+        6. 存储处理结果
+        """
+        # 跳过近似重复的截图
+        ocr_files = image_files
+        if self.dedupe_screenshots:
+            ocr_files = self.remove_duplicate_images(image_files)
+
+        # 读取运行日志，已有识别结果的图片不再识别
+        reusable = self.open_journal(ocr_files) if first_batch else {}
+        positions = {file_name: index for index, file_name in enumerate(ocr_files)}
+        replayed = sorted(
+            {id(record): record for record in reusable.values()}.values(),
+            key=lambda record: positions[record['files'][0]]
+        )
+
+        # 把其余图片规划到拼接画布中
+        pending_files = [file_name for file_name in ocr_files if file_name not in reusable]
+        canvases = self.plan_canvases([os.path.join(self.process_dir, file_name) for file_name in pending_files])
+
+        # 并发识别各张画布，与日志中复用的结果一起按原始顺序交给TextExtractor处理
+        recognized = (
+            (positions[os.path.basename(plan.file_paths[0])], len(plan.file_paths), group_result)
+            for plan, group_result in zip(canvases, self.dispatch_groups(canvases))
+        )
+        restored = (
+            (positions[record['files'][0]], len(record['files']), (record['name'], RunJournal.to_recognition(record)))
+            for record in replayed
+        )
+        processed_count = 0
+        for _, image_count, (file_path, recognition) in heapq.merge(restored, recognized, key=lambda unit: unit[0]):
+            processed_count += image_count
+            if file_path is None:
+                # 拼接失败，错误信息已在拼接时输出
+                continue
+            try:
+                with PipelineMetrics.timer('process_text'):
+                    result = self.text_extractor.handle_recognition(file_path, recognition)
+
+                # 存储结果，已拆分到各张源图片的结果按源图片分别存储
+                if 'parts' in result:
+                    for file_name, text in result['parts']:
+                        self.processed_results[file_name] = {
+                            'text': text
+                        }
+                elif 'error' not in result:
+                    self.processed_results[str(file_path)] = {
+                        'text': result['text']
+                    }
+            except Exception as e:
+                error_msg = LangManager.get_lang('image_process_error').format(file_path, str(e))
+                LogManager.error(error_msg)
+                self.text_extractor.output.append(f'{error_msg}\n')
+                self.text_extractor.error_count += 1
+            self.flush_output()
+            LogManager.progress(LangManager.get_lang('processing_progress'), processed_count, len(ocr_files))
+        # 这一批画布都已拼接完成，释放画布池；共用的画布池留给之后的目录，由调用方清空
+        if not self.shared_canvas:
+            self.canvas_pool.clear()
+
     def process_images(self):
         """处理所有图片文件
 
         该方法是图片处理的主流程，包括：
-        1. 查找图片文件
-        2. 按组处理图片（单张或拼接多张）
-        3. 调用TextExtractor处理每张图片
-        4. 存储处理结果
-        5. 写入结果文件和调试信息
+        1. 查找图片文件，创建结果文件
+        2. 调用recognize_files识别所有图片，处理后的文本按顺序立即写入结果文件
+        3. 写入汇总信息和调试信息
 
         返回:
             dict: 处理成功返回包含处理结果的字典，失败返回空字典
@@ -149,84 +695,123 @@ class TextProcessor:
             
             if not image_files:
                 warning_msg = LangManager.get_lang('no_image_files_warning').format(self.process_dir)
-                print(warning_msg)
+                LogManager.warning(warning_msg)
                 self.text_extractor.output.append(f'{warning_msg}\n')
                 return False
             
-            # 按max_vertical_images分组图片
-            for i in range(0, len(image_files), self.max_vertical_images):
-                group_files = image_files[i:i + self.max_vertical_images]
-                group_file_paths = [os.path.join(self.process_dir, file_name) for file_name in group_files]
-                
-                # 如果分组中只有一张图片，直接处理
-                if len(group_files) == 1:
-                    file_path = group_file_paths[0]
-                    
-                    try:
-                        # 使用TextExtractor处理图片
-                        result = self.text_extractor.process_image(file_path)
-                        
-                        # 存储结果
-                        if 'error' not in result:
-                            self.processed_results[file_path] = {
-                                'text': result['text']
-                            }
-                    except Exception as e:
-                        error_msg = LangManager.get_lang_data()()['image_process_error'].format(file_path, str(e))
-                        print(error_msg)
-                        self.text_extractor.output.append(f'{error_msg}\n')
-                        self.text_extractor.error_count += 1
-                else:
-                    # 拼接多张图片
-                    stitch_file_path = self.stitch_images_vertically(group_file_paths)
-                    
-                    if stitch_file_path:
-                        try:
-                            # 使用TextExtractor处理拼接后的图片
-                            result = self.text_extractor.process_image(stitch_file_path)
-                            
-                            # 存储结果
-                            if 'error' not in result:
-                                self.processed_results[stitch_file_path] = {
-                                    'text': result['text']
-                                }
-                        except Exception as e:
-                            error_msg = LangManager.get_lang('image_process_error').format(stitch_file_path, str(e))
-                            print(error_msg)
-                            self.text_extractor.output.append(f'{error_msg}\n')
-                            self.text_extractor.error_count += 1
+            # 创建结果文件，处理完成的文本按顺序立即写入
+            self.open_result_writer()
+
+            # 识别所有图片
+            self.recognize_files(image_files)
             
             # 写入结果文件
             self.write_results()
             # 写入OCR调试信息文件
             if self.output_ocr_debug:
                 self.write_debug_info(image_files)
-            # 清理临时文件
-            self.cleanup()
+            if self.output_metrics:
+                self.write_metrics(image_files)
             return self.processed_results
         except Exception as e:
-            print(LangManager.get_lang('script_execution_error').format(str(e)))
+            LogManager.error(LangManager.get_lang('script_execution_error'), str(e))
             return {}
+        finally:
+            self.close_outputs()
+
+    def watch(self):
+        """监视模式，持续识别处理目录中新出现的截图
+
+        先识别目录中已有的截图，之后每当有新截图写入完成就只识别新截图，
+        处理后的文本追加到同一个结果文件中。OCR模块、限流器和结果缓存在整个监视期间保持加载，
+        新截图从写入完成到文本写入结果文件只需要settle时间加一次识别请求的时间。
+        按Ctrl+C或设置stop_event后结束监视，写入汇总信息和调试信息。
+
+        返回:
+            dict: 包含所有处理结果的字典，失败返回空字典
+        """
+        from folder_watcher import FolderWatcher
+
+        watcher = None
+        try:
+            # 先开始监视再处理已有的截图，处理期间出现的新截图不会遗漏
+            image_files = self.find_image_files()
+            watcher = FolderWatcher(
+                self.process_dir, self.IMAGE_EXTENSIONS,
+                settle_seconds=self.watch_settle_seconds, poll_interval=self.watch_poll_interval
+            )
+            watcher.start(image_files)
+            self.open_result_writer()
+
+            all_files = list(image_files)
+            first_batch = True
+            if image_files:
+                self.recognize_files(image_files)
+                first_batch = False
+
+            LogManager.progress(LangManager.get_lang('watch_mode_started'), self.process_dir, watcher.backend_name)
+            try:
+                while not self.stop_event.is_set():
+                    new_files = watcher.poll()
+                    if not new_files:
+                        continue
+                    new_files = self.sort_image_files(new_files)
+                    LogManager.progress(LangManager.get_lang('watch_new_files'), len(new_files), ', '.join(new_files))
+                    all_files.extend(new_files)
+                    self.recognize_files(new_files, first_batch=first_batch)
+                    first_batch = False
+            except KeyboardInterrupt:
+                pass
+            LogManager.progress(LangManager.get_lang('watch_mode_stopped'))
+
+            # 写入结果文件
+            self.write_results()
+            # 写入OCR调试信息文件
+            if self.output_ocr_debug:
+                self.write_debug_info(all_files)
+            if self.output_metrics:
+                self.write_metrics(all_files)
+            return self.processed_results
+        except Exception as e:
+            LogManager.error(LangManager.get_lang('script_execution_error'), str(e))
+            return {}
+        finally:
+            if watcher is not None:
+                watcher.close()
+            self.close_outputs()
+
+    def close_outputs(self):
+        """关闭运行日志和结果文件，结束拼接画布的工作进程(共用的渲染器由调用方关闭)"""
+        LogManager.flush()
+        if self.journal is not None:
+            self.journal.close()
+        if self.result_writer is not None:
+            self.result_writer.close()
+        if self.canvas_renderer is not None and not self.shared_canvas:
+            self.canvas_renderer.close()
 
     def write_results(self):
         """写入处理结果到文件
 
-        将处理后的文本、统计信息、疑似破折号信息和字体提示信息
-        写入到输出文件中，并在控制台打印相关信息。
+        处理后的文本已在处理过程中写入结果文件，这里写入尚未写出的文本，
+        再把统计信息、疑似破折号信息和字体提示信息作为汇总内容原子地写入结果文件，
+        并在控制台打印相关信息。
         """
-        # 从text_extractor获取输出内容
-        output_content = ''.join(self.text_extractor.output)
+        if self.result_writer is None:
+            self.open_result_writer()
+        self.flush_output()
+
         success_count = self.text_extractor.success_count
         error_count = self.text_extractor.error_count
         suspected_dash_files = self.text_extractor.suspected_dash_files
+        merged_paragraphs = self.text_extractor.merged_paragraphs
 
         # 获取配置
         use_custom_font = ConfigManager.get('USE_CUSTOM_FONT', False)
         font_path = ConfigManager.get('CUSTOM_FONT_PATH', None)
         found_fonts = ConfigManager.get('FIND_FONTS', [])
 
-        with open(self.output_file, 'w', encoding='utf-8') as f:
-            f.write(output_content)
+        with io.StringIO() as f:
             f.write(f"\n{LangManager.get_lang('process_stats').format(success_count, error_count)}\n")
 
             # 写入疑似破折号信息
@@ -236,6 +821,19 @@ class TextProcessor:
                     f.write(f'      - {file}\n')
                 f.write(LangManager.get_lang('manual_screening_prompt') + '\n')
 
+            # 写入跳过的重复截图信息
+            if self.skipped_duplicates:
+                f.write(LangManager.get_lang('duplicate_screenshots_summary').format(len(self.skipped_duplicates)))
+                for duplicate_name, representative_name, _ in self.skipped_duplicates:
+                    f.write(f'      - {duplicate_name} ≈ {representative_name}\n')
+
+            # 写入合并的重复段落信息
+            if merged_paragraphs:
+                f.write(LangManager.get_lang('duplicate_paragraphs_summary').format(len(merged_paragraphs)))
+                for file_name, paragraph_text, kept_file_name, similarity in merged_paragraphs:
+                    preview = self.text_extractor.preview_paragraph(paragraph_text)
+                    f.write(f'      - {file_name} ≈ {kept_file_name} ({similarity:.2f}): {preview}\n')
+
             # 写入字体提示信息
             if use_custom_font:
                 # 检测使用的字体类型并提示
@@ -248,30 +846,63 @@ class TextProcessor:
                 elif len(found_fonts) > 1:
                     # 使用语言文件中的警告
                     f.write('\n' + LangManager.get_lang('multiple_fonts_warning').format(', '.join([font[0]['file_name'] for font in found_fonts])) + '\n')
+            footer = f.getvalue()
+        with PipelineMetrics.timer('write_output'):
+            self.result_writer.finish(footer)
 
-        print(LangManager.get_lang('results_saved').format(self.output_file))
-        print(LangManager.get_lang('process_stats').format(success_count, error_count))
+        LogManager.progress(LangManager.get_lang('results_saved'), self.output_file)
+        LogManager.progress(LangManager.get_lang('process_stats'), success_count, error_count)
+        cache_stats_line = self.get_cache_stats_line()
+        if cache_stats_line:
+            LogManager.info(cache_stats_line)
 
         # 检查是否有疑似破折号情况
         suspected_dash_count = len(suspected_dash_files)
         if suspected_dash_count > 0:
-            print(LangManager.get_lang('suspected_dash_summary').format(suspected_dash_count))
+            LogManager.warning(LangManager.get_lang('suspected_dash_summary'), suspected_dash_count)
             for file in suspected_dash_files:
-                print(f'      - {file}')
-            print(LangManager.get_lang('manual_screening_prompt'))
+                LogManager.warning(f'      - {file}')
+            LogManager.warning(LangManager.get_lang('manual_screening_prompt'))
+
+        # 输出跳过的重复截图信息
+        if self.skipped_duplicates:
+            LogManager.info(LangManager.get_lang('duplicate_screenshots_summary'), len(self.skipped_duplicates))
+            for duplicate_name, representative_name, _ in self.skipped_duplicates:
+                LogManager.info('      - {} ≈ {}', duplicate_name, representative_name)
+
+        # 输出合并的重复段落信息
+        if merged_paragraphs:
+            LogManager.info(LangManager.get_lang('duplicate_paragraphs_summary'), len(merged_paragraphs))
+            for file_name, paragraph_text, kept_file_name, similarity in merged_paragraphs:
+                preview = self.text_extractor.preview_paragraph(paragraph_text)
+                LogManager.info(f'      - {file_name} ≈ {kept_file_name} ({similarity:.2f}): {preview}')
 
         # 输出字体提示信息
         if use_custom_font:
             # 检测使用的字体类型并提示
-            print('\n' + LangManager.get_lang('single_font_detected').format(font_path))
+            LogManager.info('\n' + LangManager.get_lang('single_font_detected'), font_path)
         else:
             # 区分没有字体文件和存在多个字体文件的情况
             if len(found_fonts) == 0:
                 # 使用语言文件中的提示
-                print('\n' + LangManager.get_lang('font_not_detected'))
+                LogManager.info('\n' + LangManager.get_lang('font_not_detected'))
             elif len(found_fonts) > 1:
                 # 使用语言文件中的警告
-                print('\n' + LangManager.get_lang('multiple_fonts_warning').format(', '.join([font[0]['file_name'] for font in found_fonts])))
+                LogManager.warning('\n' + LangManager.get_lang('multiple_fonts_warning'), ', '.join([font[0]['file_name'] for font in found_fonts]))
+
+    def get_cache_stats_line(self):
+        """获取本次运行的OCR缓存统计信息
+
+        返回:
+            str: 格式化的缓存统计信息，未启用缓存时返回None
+        """
+        cache = OCRModule.get_instance().get_cache()
+        if cache is None:
+            return None
+        stats = cache.get_statistics()
+        return LangManager.get_lang('ocr_cache_stats').format(
+            stats['hits'], stats['misses'], stats['writes'], stats['evictions']
+        )
 
     def write_debug_info(self, image_files):
         """写入OCR调试信息到文件
@@ -300,37 +931,39 @@ class TextProcessor:
             ))
             if use_custom_font and font_path:
                 f.write(LangManager.get_lang('debug_font_path').format(font_path))
+            cache_stats_line = self.get_cache_stats_line()
+            if cache_stats_line:
+                f.write(cache_stats_line + '\n')
+            if self.output_metrics:
+                f.write(PipelineMetrics.format_report())
             f.write('\n')
             f.write(''.join(ocr_debug_info))
-        print(LangManager.get_lang('ocr_debug_info_saved').format(self.debug_output_file))
+        LogManager.info(LangManager.get_lang('ocr_debug_info_saved'), self.debug_output_file)
 
-    def cleanup(self):
-        """清理临时文件和目录
+    def write_metrics(self, image_files):
+        """把分阶段耗时和计数器写入metrics_file，供其他程序读取
 
-        删除处理过程中创建的临时目录及其包含的所有文件。
+        参数:
+            image_files: 处理的图片文件列表
         """
         try:
-            if os.path.exists(self.temp_dir):
-                # 遍历临时目录中的所有文件并删除
-                for root, dirs, files in os.walk(self.temp_dir, topdown=False):
-                    for file in files:
-                        file_path = os.path.join(root, file)
-                        os.remove(file_path)
-                    for dir in dirs:
-                        dir_path = os.path.join(root, dir)
-                        os.rmdir(dir_path)
-                # 删除临时目录
-                os.rmdir(self.temp_dir)
-                print(LangManager.get_lang('temp_files_cleaned').format(self.temp_dir))
-        except Exception as e:
-            error_msg = LangManager.get_lang('cleanup_error').format(str(e))
-            print(error_msg)
+            PipelineMetrics.write_json(self.metrics_file, {
+                'directory': self.dir_name,
+                'time': time.strftime('%Y-%m-%d %H:%M:%S'),
+                'image_files': len(image_files),
+                'success_count': self.text_extractor.success_count,
+                'error_count': self.text_extractor.error_count
+            })
+            LogManager.info(LangManager.get_lang('metrics_saved'), self.metrics_file)
+        except OSError as e:
+            LogManager.warning(LangManager.get_lang('metrics_save_fail'), str(e))
+
     def run(self):
         """运行整个处理流程
 
         该方法是整个文本处理系统的入口点，依次执行：
         1. 初始化OCR模块
-        2. 处理图片
+        2. 处理图片，watch_mode为True时进入监视模式
         3. 捕获并处理可能的异常
 
         返回:
@@ -340,10 +973,17 @@ class TextProcessor:
             # 初始化
             if not self.initialize():
                 return {}
-            # 处理图片
+            # 处理图片，监视模式下持续处理新截图
+            if self.watch_mode:
+                return self.watch()
             return self.process_images()
         except Exception as e:
-            print(LangManager.get_lang('script_execution_error').format(str(e)))
+            LogManager.error(LangManager.get_lang('script_execution_error'), str(e))
             return {}
+        finally:
+            # 写入限流器中尚未保存的当天已用额度
+            rate_limiter = OCRModule.get_instance().rate_limiter
+            if rate_limiter is not None:
+                rate_limiter.flush()
 
 __all__ = ['TextProcessor']